@@ -300,6 +300,9 @@ def _build_characters():
                     "hit": "hit",
                     "death": "ko",
                 },
+                "projectiles": {
+                    "special1": {"sheet": "Max Out Projectile.png", "speed": 9},
+                },
                 "animations": {
                     "idle": _move_spec("Idle.png", None),
                     "run": _move_spec("Walking.png", None),
@@ -340,6 +343,9 @@ def _build_characters():
                     "hit": "hit",
                     "death": "ko",
                 },
+                "projectiles": {
+                    "special1": {"sheet": "Yoga Fire (Fire Flickers).png", "speed": 7},
+                },
                 "animations": {
                     "idle": _move_spec("Idle.png", None),
                     "run": _move_spec("Walking.png", None),
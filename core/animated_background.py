@@ -1,55 +1,87 @@
 import pygame
 
+from core.asset_cache import AssetCache
 
-class AnimatedBackground:
-    def __init__(self, path, width, height):
-        self.width = width
-        self.height = height
-        self.frames = []
-        self.durations = []
-        self.current_index = 0
-        self.next_frame_at = 0
 
-        if str(path).lower().endswith(".gif"):
-            self._load_gif_frames(path)
+# Decoded stage frames kept for reuse (least recently used evicted first). A single
+# stage bigger than this (long GIFs run to hundreds of MB) is loaded but not kept.
+BACKGROUND_CACHE_BYTES = 128 * 1024 * 1024
 
-        if not self.frames:
-            self._load_static(path)
 
-    def _load_static(self, path):
-        image = pygame.image.load(path).convert_alpha()
-        self.frames = [pygame.transform.scale(image, (self.width, self.height))]
-        self.durations = [1000]
-        self.current_index = 0
-        self.next_frame_at = pygame.time.get_ticks() + self.durations[0]
+def _frames_nbytes(loaded):
+    return sum(frame.get_height() * frame.get_pitch() for frame in loaded[0])
+
+
+BACKGROUNDS = AssetCache(max_bytes=BACKGROUND_CACHE_BYTES, size=_frames_nbytes)
+
+
+def load_background(path, width, height):
+    """``(frames, durations)`` of a stage scaled to ``width`` x ``height``, shared through BACKGROUNDS."""
+    return BACKGROUNDS.get((str(path), width, height), lambda: _load_frames(path, width, height))
 
-    def _load_gif_frames(self, path):
-        try:
-            from PIL import Image, ImageSequence
-        except Exception:
-            return
 
+def _estimate_nbytes(path, width, height):
+    """Memory ``load_background`` would use, read from the file header."""
+    frames = 1
+    if str(path).lower().endswith(".gif"):
         try:
-            gif = Image.open(path)
-            for frame in ImageSequence.Iterator(gif):
-                rgba = frame.convert("RGBA")
-                raw = rgba.tobytes()
-                surf = pygame.image.fromstring(raw, rgba.size, "RGBA").convert_alpha()
-                surf = pygame.transform.scale(surf, (self.width, self.height))
-                self.frames.append(surf)
-
-                duration = frame.info.get("duration", 100)
-                if not isinstance(duration, int) or duration <= 0:
-                    duration = 100
-                self.durations.append(duration)
+            from PIL import Image
+
+            with Image.open(path) as gif:
+                frames = getattr(gif, "n_frames", 1)
         except Exception:
-            self.frames = []
-            self.durations = []
-            return
+            pass
+    return frames * width * height * 4
 
-        if self.frames:
-            self.current_index = 0
-            self.next_frame_at = pygame.time.get_ticks() + self.durations[0]
+
+def preload_background(path, width, height):
+    """Load a stage into BACKGROUNDS ahead of a match, unless it is too big to be kept."""
+    if BACKGROUNDS.fits(_estimate_nbytes(path, width, height)):
+        load_background(path, width, height)
+
+
+def _load_frames(path, width, height):
+    if str(path).lower().endswith(".gif"):
+        loaded = _load_gif_frames(path, width, height)
+        if loaded[0]:
+            return loaded
+    image = pygame.image.load(path).convert_alpha()
+    return [pygame.transform.scale(image, (width, height))], [1000]
+
+
+def _load_gif_frames(path, width, height):
+    try:
+        from PIL import Image, ImageSequence
+    except Exception:
+        return [], []
+
+    frames = []
+    durations = []
+    try:
+        gif = Image.open(path)
+        for frame in ImageSequence.Iterator(gif):
+            rgba = frame.convert("RGBA")
+            raw = rgba.tobytes()
+            surf = pygame.image.fromstring(raw, rgba.size, "RGBA").convert_alpha()
+            surf = pygame.transform.scale(surf, (width, height))
+            frames.append(surf)
+
+            duration = frame.info.get("duration", 100)
+            if not isinstance(duration, int) or duration <= 0:
+                duration = 100
+            durations.append(duration)
+    except Exception:
+        return [], []
+    return frames, durations
+
+
+class AnimatedBackground:
+    def __init__(self, path, width, height):
+        self.width = width
+        self.height = height
+        self.frames, self.durations = load_background(path, width, height)
+        self.current_index = 0
+        self.next_frame_at = pygame.time.get_ticks() + self.durations[0]
 
     def update(self):
         if len(self.frames) <= 1:
@@ -60,7 +92,31 @@ class AnimatedBackground:
             self.current_index = (self.current_index + 1) % len(self.frames)
             self.next_frame_at = now + self.durations[self.current_index]
 
+    def show_time(self, ms):
+        """Show the frame due ``ms`` into the loop (for offline rendering)."""
+        ms %= sum(self.durations)
+        for index, duration in enumerate(self.durations):
+            if ms < duration:
+                self.current_index = index
+                return
+            ms -= duration
+
+    @property
+    def animated(self):
+        return len(self.frames) > 1
+
+    def draw_area(self, screen, rect):
+        """Repaint only ``rect`` of the background."""
+        if self.frames:
+            screen.blit(self.frames[self.current_index], rect, rect)
+
     def draw(self, screen):
         if not self.frames:
             return
-        screen.blit(self.frames[self.current_index], (0, 0))
+        frame = self.frames[self.current_index]
+        # Through a camera view only the part in view is scaled.
+        blit_visible = getattr(screen, "blit_visible", None)
+        if blit_visible is not None:
+            blit_visible(frame)
+        else:
+            screen.blit(frame, (0, 0))
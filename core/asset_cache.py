@@ -0,0 +1,77 @@
+import threading
+from collections import OrderedDict
+
+
+class AssetCache:
+    """Loaded assets by key, shared between threads (least recently used evicted first).
+
+    ``get`` calls ``load()`` only for keys not already cached. A thread
+    asking for a key another thread is loading waits for that load instead
+    of repeating it, so a frame built on the loading thread picks up what
+    the prefetcher started. At most ``max_entries`` entries and
+    ``max_bytes`` bytes (as measured by ``size``) are kept; an asset larger
+    than ``max_bytes`` on its own is returned but not kept.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, size=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = size or (lambda asset: 0)
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        # Key -> lock held by the thread loading it.
+        self.loading = {}
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.entries
+
+    def _cached(self, key):
+        with self.lock:
+            asset = self.entries.get(key)
+            if asset is not None:
+                self.entries.move_to_end(key)
+            return asset
+
+    def get(self, key, load):
+        asset = self._cached(key)
+        if asset is not None:
+            return asset
+        with self.lock:
+            loading = self.loading.setdefault(key, threading.Lock())
+        with loading:
+            asset = self._cached(key)
+            if asset is not None:
+                return asset
+            try:
+                asset = load()
+                self._store(key, asset)
+            finally:
+                with self.lock:
+                    self.loading.pop(key, None)
+        return asset
+
+    def fits(self, nbytes):
+        return self.max_bytes is None or nbytes <= self.max_bytes
+
+    def _store(self, key, asset):
+        if not self.fits(self.size(asset)):
+            return
+        with self.lock:
+            self.entries[key] = asset
+            while len(self.entries) > 1 and (
+                    (self.max_entries is not None and len(self.entries) > self.max_entries)
+                    or not self.fits(self._nbytes())):
+                self.entries.popitem(last=False)
+
+    def _nbytes(self):
+        return sum(self.size(asset) for asset in self.entries.values())
+
+    @property
+    def nbytes(self):
+        with self.lock:
+            return self._nbytes()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
@@ -1,4 +1,7 @@
-from core.config import AUDIO_DIR, FONTS_DIR, IMAGES_DIR, DEFAULT_FONT_FILE
+import pygame
+
+from core.asset_cache import AssetCache
+from core.config import AI_DIR, AUDIO_DIR, FONTS_DIR, IMAGES_DIR, DEFAULT_FONT_FILE
 
 
 def font_path(filename=DEFAULT_FONT_FILE):
@@ -12,3 +15,21 @@ def image_path(*parts):
 def audio_path(filename):
     return str(AUDIO_DIR / filename)
 
+
+def ai_policy_path(difficulty):
+    return str(AI_DIR / f"{difficulty}.bin")
+
+
+
+# Sounds by (filename, volume), shared by every fighter and frame using them.
+SOUNDS = AssetCache()
+
+
+def load_sound(filename, volume):
+    """Shared Sound for ``filename`` set to ``volume``; callers must not change its volume."""
+    def load():
+        sound = pygame.mixer.Sound(audio_path(filename))
+        sound.set_volume(volume)
+        return sound
+
+    return SOUNDS.get((filename, volume), load)
@@ -0,0 +1,254 @@
+import math
+from collections import OrderedDict
+from fractions import Fraction
+
+import pygame
+
+# Discrete zoom factors the camera snaps between; 1.0 shows the whole stage.
+ZOOM_LEVELS = (1.0, 1.25, 1.5, 1.75)
+# Memory the scaled copies may use (least recently used dropped first); at
+# most half of it goes to stage regions.
+ZOOM_CACHE_BYTES = 64 * 1024 * 1024
+# World pixels of stage scaled beyond each edge of the view, so panning
+# reuses the copy. A multiple of every zoom level's denominator.
+STAGE_PADDING = 96
+# Space kept around the fighters' sprites, in world pixels.
+MARGIN = (80, 30)
+# Ticks after a zoom change before the camera zooms in again, so jumps don't make it pump.
+ZOOM_HOLD_TICKS = 45
+# Fraction of the remaining distance the view pans per tick.
+PAN_EASE = 0.15
+
+
+def _scale(surface, zoom):
+    if surface.get_bitsize() == 8:
+        # Indexed sprites can't be smoothscaled; the colour key becomes alpha.
+        surface = surface.convert_alpha()
+    return pygame.transform.smoothscale_by(surface, zoom)
+
+
+def _nbytes(surface):
+    return surface.get_height() * surface.get_pitch()
+
+
+class ZoomCache:
+    """Scaled copies of images by zoom level, within ``max_bytes``.
+
+    ``prepare`` scales every tracked sprite image for a level up front if
+    the level fits in the budget; anything else is scaled on first draw.
+    Stage images are never scaled whole: ``visible`` scales the part in
+    view plus STAGE_PADDING and reuses it while the view stays inside.
+    Least recently used copies are dropped once the budget is exceeded,
+    stage regions once they pass half of it.
+    """
+
+    def __init__(self, max_bytes=ZOOM_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.images = OrderedDict()
+        # (source, zoom) -> (region of the source, scaled region).
+        self.regions = OrderedDict()
+        self.nbytes = 0
+        self.region_nbytes = 0
+        self.sources = []
+
+    def track(self, surfaces):
+        """Images ``prepare`` scales (sprite frames)."""
+        self.sources.extend(surfaces)
+
+    def prepare(self, zoom):
+        """Scale the tracked images for ``zoom``; False (and nothing scaled) if they don't fit."""
+        needed = sum(round(surface.get_width() * zoom) * round(surface.get_height() * zoom) * 4
+                     for surface in self.sources if (surface, zoom, False) not in self.images)
+        # Leave the stage regions their half of the budget.
+        if self.nbytes + needed > self.max_bytes - self.max_bytes // 2:
+            return False
+        for surface in self.sources:
+            self.image(surface, zoom)
+        return True
+
+    def image(self, surface, zoom, flip=False):
+        if zoom == 1:
+            return pygame.transform.flip(surface, True, False) if flip else surface
+        key = (surface, zoom, flip)
+        image = self.images.get(key)
+        if image is not None:
+            self.images.move_to_end(key)
+            return image
+        if flip:
+            image = pygame.transform.flip(self.image(surface, zoom), True, False)
+        else:
+            image = _scale(surface, zoom)
+        self.images[key] = image
+        self.nbytes += _nbytes(image)
+        self._trim()
+        return image
+
+    def visible(self, surface, zoom, area):
+        """``area`` of ``surface`` scaled by ``zoom``.
+
+        ``area``'s left and top must be multiples of the zoom's denominator,
+        so the cut lands on whole pixels of the scaled region.
+        """
+        key = (surface, zoom)
+        cached = self.regions.get(key)
+        if cached is not None and cached[0].contains(area):
+            self.regions.move_to_end(key)
+            region, image = cached
+        else:
+            if cached is not None:
+                self._drop_region(key)
+            region = area.inflate(STAGE_PADDING * 2, STAGE_PADDING * 2).clip(surface.get_rect())
+            image = _scale(surface.subsurface(region), zoom)
+            self.regions[key] = (region, image)
+            self.region_nbytes += _nbytes(image)
+            self.nbytes += _nbytes(image)
+            self._trim()
+        cut = pygame.Rect(round((area.x - region.x) * zoom), round((area.y - region.y) * zoom),
+                          round(area.width * zoom), round(area.height * zoom))
+        return image.subsurface(cut.clip(image.get_rect()))
+
+    def _drop_region(self, key):
+        image = self.regions.pop(key)[1]
+        self.region_nbytes -= _nbytes(image)
+        self.nbytes -= _nbytes(image)
+
+    def _trim(self):
+        while self.region_nbytes > self.max_bytes // 2 and len(self.regions) > 1:
+            self._drop_region(next(iter(self.regions)))
+        while self.nbytes > self.max_bytes and len(self.images) > 1:
+            self.nbytes -= _nbytes(self.images.popitem(last=False)[1])
+
+
+class Camera:
+    """View onto the stage that zooms and pans to keep the fighters framed.
+
+    ``follow`` runs once per simulation tick. The zoom snaps between
+    ZOOM_LEVELS: out as soon as the fighters would leave the view, in only
+    after ZOOM_HOLD_TICKS. The pan eases toward the fighters and is
+    interpolated between ticks like the fighters themselves. World-space
+    drawing goes through ``view``.
+    """
+
+    def __init__(self, width, height, levels=ZOOM_LEVELS, max_bytes=ZOOM_CACHE_BYTES):
+        self.width = width
+        self.height = height
+        self.levels = levels
+        self.cache = ZoomCache(max_bytes)
+        self.zoom = levels[0]
+        self.x = 0.0
+        self.y = 0.0
+        self.previous = (0.0, 0.0)
+        self.hold = 0
+
+    def prepare(self):
+        """Scale the tracked images for the zoom-in levels that fit the cache (while loading)."""
+        for zoom in self.levels[1:]:
+            if not self.cache.prepare(zoom):
+                break
+
+    @property
+    def zoomed(self):
+        return self.zoom != 1
+
+    def _frame(self, rects):
+        area = rects[0].unionall(rects[1:]).inflate(MARGIN[0] * 2, MARGIN[1] * 2)
+        fit = min(self.width / area.width, self.height / area.height)
+        level = max((zoom for zoom in self.levels if zoom <= fit), default=self.levels[0])
+        return level, area
+
+    def _target(self, area):
+        view_width = self.width / self.zoom
+        view_height = self.height / self.zoom
+        x = min(max(area.centerx - view_width / 2, 0), self.width - view_width)
+        # Keep the floor in view: the fighters' feet stay near the bottom.
+        y = min(max(area.bottom - view_height, 0), self.height - view_height)
+        return x, y
+
+    def snap(self, rects):
+        """Frame ``rects`` at once (round start, replay seek)."""
+        self.zoom, area = self._frame(rects)
+        self.x, self.y = self._target(area)
+        self.previous = (self.x, self.y)
+        self.hold = 0
+
+    def follow(self, rects):
+        self.previous = (self.x, self.y)
+        level, area = self._frame(rects)
+        if self.hold:
+            self.hold -= 1
+        if level < self.zoom or (level > self.zoom and not self.hold):
+            # Zoom in one level at a time; zoom out straight to the level that fits.
+            if level > self.zoom:
+                level = self.levels[self.levels.index(self.zoom) + 1]
+            self.zoom = level
+            self.hold = ZOOM_HOLD_TICKS
+            self.x, self.y = self._target(area)
+            self.previous = (self.x, self.y)
+            return
+        x, y = self._target(area)
+        self.x += (x - self.x) * PAN_EASE
+        self.y += (y - self.y) * PAN_EASE
+
+    def view(self, target, alpha=1.0):
+        return CameraView(self, target, alpha)
+
+
+class CameraView:
+    """Surface-like target that draws world-space images through a Camera.
+
+    Positions are mapped to the screen and images replaced by their cached
+    copies at the camera's zoom level. Supports ``blit``, ``blits`` and
+    ``blit_flipped``, plus ``blit_visible`` for stage images.
+    """
+
+    def __init__(self, camera, target, alpha=1.0):
+        self.camera = camera
+        self.target = target
+        self.zoom = camera.zoom
+        px, py = camera.previous
+        self.x = camera.x + (px - camera.x) * (1 - alpha)
+        self.y = camera.y + (py - camera.y) * (1 - alpha)
+        self.target_blit_flipped = getattr(target, "blit_flipped", None)
+        self.target_blit_scaled = getattr(target, "blit_scaled", None)
+
+    def to_screen(self, position):
+        return round((position[0] - self.x) * self.zoom), round((position[1] - self.y) * self.zoom)
+
+    def blit(self, source, dest):
+        self.target.blit(self.camera.cache.image(source, self.zoom), self.to_screen(dest))
+
+    def blits(self, sequence, doreturn=True):
+        for source, dest in sequence:
+            self.blit(source, dest)
+
+    def blit_flipped(self, source, dest, flip_x):
+        if self.target_blit_flipped is not None:
+            self.target_blit_flipped(self.camera.cache.image(source, self.zoom), self.to_screen(dest), flip_x)
+        else:
+            self.target.blit(self.camera.cache.image(source, self.zoom, flip_x), self.to_screen(dest))
+
+    def blit_visible(self, source, dest=(0, 0)):
+        """Blit the part of ``source`` in view, cut from a padded scaled region.
+
+        Used for stage images: a whole stage scaled per zoom level (and per
+        frame of an animated one) would take hundreds of MB.
+        """
+        if self.zoom == 1:
+            self.target.blit(source, self.to_screen(dest))
+            return
+        # Edges on multiples of the zoom's denominator land on whole screen
+        # pixels, so the crop lines up with the sprites as the view pans.
+        step = Fraction(self.zoom).limit_denominator(100).denominator
+        left = math.floor((self.x - dest[0]) / step) * step
+        top = math.floor((self.y - dest[1]) / step) * step
+        right = math.ceil((self.x + self.camera.width / self.zoom - dest[0]) / step) * step
+        bottom = math.ceil((self.y + self.camera.height / self.zoom - dest[1]) / step) * step
+        area = pygame.Rect(left, top, right - left, bottom - top).clip(source.get_rect())
+        if not area:
+            return
+        position = self.to_screen((dest[0] + area.x, dest[1] + area.y))
+        if self.target_blit_scaled is not None:
+            size = (round(area.width * self.zoom), round(area.height * self.zoom))
+            self.target_blit_scaled(source, pygame.Rect(position, size), area)
+        else:
+            self.target.blit(self.camera.cache.visible(source, self.zoom, area), position)
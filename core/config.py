@@ -3,17 +3,37 @@ from pathlib import Path
 # Project root: .../Street-Fighter-Game
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
-# Display config
+# Display config: the internal resolution everything is drawn at. The window
+# can be resized or made fullscreen (F11); the frame is scaled to fit.
 SCREEN_WIDTH = 1000
 SCREEN_HEIGHT = 600
+FULLSCREEN = False
+# Zoom and pan match frames to keep the fighters framed (see core/camera.py).
+CAMERA_ZOOM = True
+# Simulation ticks per second; game speed does not depend on the render rate.
 FPS = 60
+# Render frames per second cap (0 draws as often as the machine allows).
+RENDER_FPS = 120
 WINDOW_TITLE = "Street Fighter - Online"
+# "software" blits onto a Surface; "texture" draws with the SDL renderer
+# (see core/texture_display.py).
+RENDER_BACKEND = "software"
+# Repaint and present only changed regions of match frames (see core/dirty_rects.py).
+# Software backend only.
+DIRTY_RECT_RENDERING = False
 
 # Asset roots
 MULTIMEDIA_DIR = PROJECT_ROOT / "multimedia"
 FONTS_DIR = MULTIMEDIA_DIR / "fonts"
 IMAGES_DIR = MULTIMEDIA_DIR / "images"
 AUDIO_DIR = MULTIMEDIA_DIR / "audio"
+AI_DIR = MULTIMEDIA_DIR / "ai"
+
+# Recorded matches
+REPLAY_DIR = PROJECT_ROOT / "replays"
+
+# Assets preprocessed at load time (packed sprite atlases); safe to delete.
+ASSET_CACHE_DIR = PROJECT_ROOT / "cache"
 
 # Shared font
 DEFAULT_FONT_FILE = "Turok.ttf"
@@ -0,0 +1,86 @@
+import pygame
+
+
+def merge_rects(rects):
+    """Union overlapping rects so no pixel is repainted twice."""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        i = 0
+        while i < len(merged):
+            if rect.colliderect(merged[i]):
+                rect.union_ip(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
+
+class DirtyRectRenderer:
+    """Repaint only the parts of the canvas that changed.
+
+    Frames that provide ``dirty_regions()`` and ``draw_foreground()`` get
+    the background restored under last frame's and this frame's regions
+    and the foreground drawn on top; ``draw`` returns those regions for
+    presenting. Other frames, the first frame after a switch, animated
+    backgrounds and frames whose ``dirty_regions()`` returns None get a
+    full redraw (``draw`` returns None). ``fraction`` is
+    the share of canvas pixels touched in the last frame.
+    """
+
+    def __init__(self, display):
+        self.display = display
+        self.frame = None
+        self.previous = []
+        self.fraction = 1.0
+        self.total_fraction = 0.0
+        self.frames = 0
+
+    def invalidate(self):
+        """Force a full redraw next frame (something else drew on the screen)."""
+        self.frame = None
+
+    def draw(self, frame, overlay_rects=()):
+        """Draw ``frame``; ``overlay_rects`` are also repainted for the caller to draw over."""
+        screen = self.display.canvas
+        screen_rect = screen.get_rect()
+        regions = getattr(frame, "dirty_regions", None)
+        current = regions() if regions is not None else None
+        background = getattr(frame, "background", None)
+        if (
+            current is None
+            or frame is not self.frame
+            or background is None
+            or background.animated
+        ):
+            frame.draw(screen)
+            # Without regions nothing is known about the next frame either.
+            self.frame = frame if current is not None else None
+            self.previous = (current or []) + list(overlay_rects)
+            self._count(1.0)
+            return None
+
+        current += overlay_rects
+        dirty = [
+            rect.clip(screen_rect)
+            for rect in merge_rects(self.previous + current)
+        ]
+        dirty = [rect for rect in dirty if rect.width and rect.height]
+        for rect in dirty:
+            background.draw_area(screen, rect)
+        frame.draw_foreground(screen)
+
+        self.previous = current
+        area = screen_rect.width * screen_rect.height
+        self._count(sum(rect.width * rect.height for rect in dirty) / area)
+        return dirty
+
+    def _count(self, fraction):
+        self.fraction = fraction
+        self.total_fraction += fraction
+        self.frames += 1
+
+    def report(self):
+        average = self.total_fraction / self.frames if self.frames else 0.0
+        return f"Dirty-rect rendering: {average:.1%} of pixels repainted per frame on average"
@@ -0,0 +1,92 @@
+import math
+
+import pygame
+
+
+class Display:
+    """Window that shows a fixed-resolution canvas, scaled once per frame.
+
+    Everything is drawn onto ``canvas`` at the internal resolution. While
+    the window has that exact size the canvas is the window surface itself
+    and presenting costs nothing extra. Otherwise ``present`` scales the
+    canvas into a centred, letterboxed rect: by the largest whole-number
+    factor that fits (nearest-neighbour, so pixels stay sharp), or, in a
+    window smaller than the canvas, smoothscaled to fit.
+    """
+
+    def __init__(self, width, height, title, fullscreen=False):
+        self.size = (width, height)
+        self.windowed_size = self.size
+        self.fullscreen = False
+        self.window = None
+        self.canvas = None
+        self.offscreen = None
+        self.target = None
+        self.target_rect = None
+        self.smooth = False
+        pygame.display.set_caption(title)
+        self._set_mode(self.size, fullscreen)
+
+    def _set_mode(self, size, fullscreen):
+        self.fullscreen = fullscreen
+        if fullscreen:
+            self.window = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            self.window = pygame.display.set_mode(size, pygame.RESIZABLE)
+        self._layout()
+
+    def _layout(self):
+        window_size = self.window.get_size()
+        if window_size == self.size:
+            self.canvas = self.window
+            self.target = None
+            return
+
+        if self.offscreen is None:
+            self.offscreen = pygame.Surface(self.size).convert()
+        self.canvas = self.offscreen
+        width, height = self.size
+        scale = min(window_size[0] / width, window_size[1] / height)
+        self.smooth = scale < 1
+        if not self.smooth:
+            scale = math.floor(scale)
+        rect = pygame.Rect(0, 0, int(width * scale), int(height * scale))
+        rect.center = self.window.get_rect().center
+        self.window.fill((0, 0, 0))
+        self.target = self.window.subsurface(rect)
+        self.target_rect = rect
+        pygame.display.update()
+
+    def canvas_for(self, frame):
+        """What ``frame`` should draw on; every frame shares the one canvas."""
+        return self.canvas
+
+    def toggle_fullscreen(self):
+        if self.fullscreen:
+            self._set_mode(self.windowed_size, False)
+        else:
+            self.windowed_size = self.window.get_size()
+            self._set_mode(self.size, True)
+
+    def handle_event(self, event):
+        """Pick up window size changes; returns True if the layout changed."""
+        if event.type == pygame.VIDEORESIZE and not self.fullscreen:
+            self.window = pygame.display.get_surface()
+            self._layout()
+            return True
+        return False
+
+    def present(self, rects=None):
+        """Show the canvas; ``rects`` limits the update when it is not scaled."""
+        if self.target is None:
+            if rects is None:
+                pygame.display.update()
+            else:
+                pygame.display.update(rects)
+            return
+
+        if self.smooth:
+            pygame.transform.smoothscale(self.canvas, self.target.get_size(), self.target)
+        else:
+            pygame.transform.scale(self.canvas, self.target.get_size(), self.target)
+        pygame.display.update(self.target_rect)
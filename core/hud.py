@@ -0,0 +1,95 @@
+import pygame
+
+from core.assets import font_path
+
+HUD_HEIGHT = 100
+WHITE = (255, 255, 255)
+RED = (255, 0, 0)
+YELLOW = (255, 255, 0)
+DRAIN = (255, 140, 0)
+LABEL = (40, 20, 0)
+# Colour key for the overlay's transparent pixels; keyed RLE blits beat per-pixel alpha.
+TRANSPARENT = (255, 0, 255)
+
+# Lost health stays visible as a DRAIN bar, then shrinks toward the real value.
+DRAIN_DELAY_TICKS = 30
+DRAIN_PER_TICK = 0.75
+
+
+class HUD:
+    """Health bars, win markers and player labels in one cached overlay.
+
+    ``update`` runs once per simulation tick and re-renders the overlay
+    only when something shown on it changed; ``draw`` is a single blit.
+    ``version`` increases with every re-render. The default layout is the
+    1v1 one; subclasses override ``_render`` for others.
+    """
+
+    def __init__(self, width, labels, label_size=20, height=HUD_HEIGHT):
+        self.width = width
+        # Rendered on a plain canvas and copied: drawing on an RLE surface is slow.
+        self.canvas = pygame.Surface((width, height))
+        self.canvas.fill(TRANSPARENT)
+        self._publish()
+        self.rect = self.canvas.get_rect()
+        font = pygame.font.Font(font_path(), label_size)
+        self.labels = [font.render(label, True, LABEL) for label in labels]
+        self.health = [100] * len(labels)
+        self.trail = [100.0] * len(labels)
+        self.delay = [0] * len(labels)
+        self.score = ()
+        self.shown = None
+        self.version = 0
+
+    def snap(self, healths):
+        """Show ``healths`` without a drain animation (e.g. after a replay seek)."""
+        self.health = [max(0, health) for health in healths]
+        self.trail = [float(health) for health in self.health]
+        self.delay = [0] * len(self.health)
+
+    def update(self, healths, score):
+        for i, health in enumerate(healths):
+            health = max(0, health)
+            if health < self.health[i]:
+                self.delay[i] = DRAIN_DELAY_TICKS
+            self.health[i] = health
+            if self.trail[i] <= health:
+                self.trail[i] = health
+            elif self.delay[i]:
+                self.delay[i] -= 1
+            else:
+                self.trail[i] = max(health, self.trail[i] - DRAIN_PER_TICK)
+
+        shown = (tuple(self.health), tuple(int(trail) for trail in self.trail), tuple(score))
+        if shown != self.shown:
+            self.shown = shown
+            self.score = tuple(score)
+            self.canvas.fill(TRANSPARENT)
+            self._render(self.canvas)
+            self._publish()
+            self.version += 1
+
+    def _publish(self):
+        self.surface = self.canvas.copy()
+        self.surface.set_colorkey(TRANSPARENT, pygame.RLEACCEL)
+
+    def draw(self, screen):
+        screen.blit(self.surface, self.rect)
+
+    def _render(self, surface):
+        self.draw_bar(surface, 0, pygame.Rect(20, 20, 400, 30))
+        self.draw_bar(surface, 1, pygame.Rect(self.width - 420, 20, 400, 30))
+        self.draw_wins(surface, self.score[0], 40, 80, YELLOW, direction=1)
+        self.draw_wins(surface, self.score[1], self.width - 40, 80, YELLOW, direction=-1)
+
+    def draw_bar(self, surface, index, rect, color=YELLOW):
+        pygame.draw.rect(surface, WHITE, rect.inflate(4, 4))
+        pygame.draw.rect(surface, RED, rect)
+        pygame.draw.rect(surface, DRAIN, (rect.x, rect.y, rect.width * self.trail[index] / 100, rect.height))
+        pygame.draw.rect(surface, color, (rect.x, rect.y, rect.width * self.health[index] / 100, rect.height))
+        label = self.labels[index]
+        surface.blit(label, (rect.x + 6, rect.centery - label.get_height() // 2))
+
+    def draw_wins(self, surface, wins, x_start, y, color, radius=12, spacing=40, direction=1):
+        for i in range(wins):
+            pygame.draw.circle(surface, color, (x_start + i * spacing * direction, y), radius)
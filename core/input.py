@@ -0,0 +1,168 @@
+import pygame
+
+from core.config import FPS
+
+# One byte per player per frame. The same values go to fighters, the network
+# (PLAYER_INPUT messages) and replays.
+LEFT = 1 << 0
+RIGHT = 1 << 1
+UP = 1 << 2
+DOWN = 1 << 3
+ATTACK1 = 1 << 4
+ATTACK2 = 1 << 5
+SPECIAL1 = 1 << 6
+SPECIAL2 = 1 << 7
+
+DIRECTIONS = LEFT | RIGHT | UP | DOWN
+BUTTONS = ATTACK1 | ATTACK2 | SPECIAL1 | SPECIAL2
+
+# Facing-relative direction used in motion definitions; resolved to LEFT or
+# RIGHT by InputHistory.motion().
+FORWARD = 1 << 8
+BACK = 1 << 9
+
+QUARTER_CIRCLE_FORWARD = (DOWN, DOWN | FORWARD, FORWARD)
+QUARTER_CIRCLE_BACK = (DOWN, DOWN | BACK, BACK)
+
+INPUT_HISTORY_FRAMES = 64
+MOTION_WINDOW_FRAMES = 15
+COMBO_WINDOW_FRAMES = round(550 * FPS / 1000)
+
+CONTROL_BITS = {
+    "left": LEFT,
+    "right": RIGHT,
+    "jump": UP,
+    "crouch": DOWN,
+    "attack1": ATTACK1,
+    "attack2": ATTACK2,
+    "special1": SPECIAL1,
+    "special2": SPECIAL2,
+}
+
+KEY_BINDINGS = {
+    1: (
+        (pygame.K_a, LEFT),
+        (pygame.K_d, RIGHT),
+        (pygame.K_w, UP),
+        (pygame.K_s, DOWN),
+        (pygame.K_r, ATTACK1),
+        (pygame.K_t, ATTACK2),
+        (pygame.K_y, SPECIAL1),
+        (pygame.K_u, SPECIAL2),
+    ),
+    2: (
+        (pygame.K_LEFT, LEFT),
+        (pygame.K_RIGHT, RIGHT),
+        (pygame.K_UP, UP),
+        (pygame.K_DOWN, DOWN),
+        (pygame.K_KP1, ATTACK1),
+        (pygame.K_KP2, ATTACK2),
+        (pygame.K_KP4, SPECIAL1),
+        (pygame.K_KP5, SPECIAL2),
+    ),
+}
+
+
+def sample_keyboard(key_state, player):
+    bits = 0
+    for key, bit in KEY_BINDINGS.get(player, ()):
+        if key_state[key]:
+            bits |= bit
+    return bits
+
+
+def sample_players(players=(1, 2)):
+    """Read the keyboard once and return one bitmask per player."""
+    key_state = pygame.key.get_pressed()
+    return [sample_keyboard(key_state, player) for player in players]
+
+
+def controls_to_bits(controls):
+    bits = 0
+    for name, bit in CONTROL_BITS.items():
+        if controls.get(name):
+            bits |= bit
+    return bits
+
+
+def bits_to_controls(bits):
+    return {name: bool(bits & bit) for name, bit in CONTROL_BITS.items()}
+
+
+class InputHistory:
+    """Fixed-size ring buffer of per-frame input bitmasks.
+
+    Besides the raw frames it tracks when each button was last pressed and
+    when each direction was last entered, so motion and combo checks cost
+    O(len(motion)) no matter how long the buffer is.
+    """
+
+    def __init__(self, size=INPUT_HISTORY_FRAMES):
+        self.size = size
+        self.buffer = bytearray(size)
+        self.frame = -1
+        self.last_press = [-size] * 8
+        self.last_direction = [-size] * 16
+
+    def reset(self):
+        self.buffer[:] = bytes(self.size)
+        self.frame = -1
+        self.last_press[:] = [-self.size] * 8
+        self.last_direction[:] = [-self.size] * 16
+
+    def push(self, bits):
+        previous = self.current
+        self.frame += 1
+        self.buffer[self.frame % self.size] = bits
+
+        pressed = bits & ~previous & 0xFF
+        bit_index = 0
+        while pressed:
+            if pressed & 1:
+                self.last_press[bit_index] = self.frame
+            pressed >>= 1
+            bit_index += 1
+
+        direction = bits & DIRECTIONS
+        if direction != previous & DIRECTIONS:
+            self.last_direction[direction] = self.frame
+
+    def extend(self, frames):
+        for bits in frames:
+            self.push(bits)
+
+    @property
+    def current(self):
+        if self.frame < 0:
+            return 0
+        return self.buffer[self.frame % self.size]
+
+    def get(self, frames_ago=0):
+        if frames_ago >= self.size or frames_ago > self.frame:
+            return 0
+        return self.buffer[(self.frame - frames_ago) % self.size]
+
+    def pressed(self, mask):
+        """True if any button in ``mask`` went down on the current frame."""
+        return bool(self.current & ~self.get(1) & mask)
+
+    def frames_since_press(self, bit):
+        return self.frame - self.last_press[bit.bit_length() - 1]
+
+    def motion(self, directions, facing_left, window=MOTION_WINDOW_FRAMES):
+        """True if ``directions`` were entered in order within ``window`` frames."""
+        forward, back = (LEFT, RIGHT) if facing_left else (RIGHT, LEFT)
+        earliest = self.frame - window
+        last_seen = earliest - 1
+
+        for direction in directions:
+            if direction & FORWARD:
+                direction = (direction & ~FORWARD) | forward
+            if direction & BACK:
+                direction = (direction & ~BACK) | back
+            entered = self.last_direction[direction]
+            if entered <= last_seen or entered < earliest:
+                return False
+            last_seen = entered
+
+        return True
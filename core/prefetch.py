@@ -0,0 +1,54 @@
+import threading
+import time
+
+# Seconds the wanted assets must stay the same before they are loaded, so
+# scrolling through a menu only loads where the selection settles.
+PREFETCH_DELAY = 0.3
+
+
+class Prefetcher:
+    """Loads assets the player will probably need next on a background thread.
+
+    Frames call ``want(*tasks)`` with their current guess (the highlighted
+    character, the chosen character plus the highlighted stage); each call
+    replaces the tasks not started yet. Tasks are callables that load
+    through the shared asset caches, so they keep within the caches'
+    memory caps, and a frame loading the same asset waits for the running
+    prefetch instead of repeating it. One task runs at a time, after
+    PREFETCH_DELAY; ``cancel`` drops the rest. A running task is not
+    interrupted: what it loads stays cached.
+    """
+
+    def __init__(self, delay=PREFETCH_DELAY):
+        self.delay = delay
+        self.pending = []
+        self.due = 0.0
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def want(self, *tasks):
+        with self.condition:
+            self.pending = list(tasks)
+            self.due = time.monotonic() + self.delay
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+            self.condition.notify()
+
+    def cancel(self):
+        with self.condition:
+            self.pending = []
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending or time.monotonic() < self.due:
+                    self.condition.wait(self.due - time.monotonic() if self.pending else None)
+                task = self.pending.pop(0)
+            try:
+                task()
+            except Exception as e:
+                print(f"Prefetch failed: {e}")
+
+
+PREFETCHER = Prefetcher()
@@ -0,0 +1,144 @@
+import time
+from collections import deque
+
+import pygame
+
+PHASES = ("events", "update", "draw", "present")
+HISTORY = 240
+# Text lines are refreshed this often, one line per frame.
+REFRESH_MS = 250
+GRAPH_MS = 33.3
+BUDGET_MS = 1000 / 60
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class FrameProfiler:
+    """Per-phase frame timings of the main loop, shown as an overlay (F3).
+
+    The loop calls ``start``, ``mark(phase)`` after each phase and
+    ``end_frame(frame)``; timings are kept per frame class. The graph
+    scrolls by one bar per frame and text is re-rendered a line at a time,
+    so no single frame pays for a full redraw of the overlay. Nothing is
+    recorded while disabled.
+    """
+
+    def __init__(self, position=(10, 110)):
+        self.enabled = False
+        self.samples = {}
+        self.current = None
+        self.phase_times = [0.0] * len(PHASES)
+        self.last = 0.0
+        self.frame_start = 0.0
+        self.rect = pygame.Rect(position, (HISTORY + 12, 170))
+        self.panel = None
+        self.graph = None
+        self.font = None
+        self.lines = [None, None, None]
+        self.stale_lines = []
+        self.next_refresh = 0.0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.current = None
+
+    def start(self):
+        self.frame_start = self.last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phase_times[PHASES.index(phase)] = (now - self.last) * 1000
+        self.last = now
+
+    def end_frame(self, frame):
+        name = type(frame).__name__
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=HISTORY)
+        total = (time.perf_counter() - self.frame_start) * 1000
+        sample = (total, *self.phase_times)
+        samples.append(sample)
+
+        if self.graph is None:
+            self._create_surfaces()
+        if name != self.current:
+            self.current = name
+            self._redraw_graph(samples)
+            self.next_refresh = 0.0
+        else:
+            self.graph.scroll(-1, 0)
+            self._draw_bar(self.graph.get_width() - 1, total)
+
+    def _create_surfaces(self):
+        self.font = pygame.font.Font(None, 20)
+        self.panel = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.panel.fill((0, 0, 0, 180))
+        self.graph = pygame.Surface((HISTORY, self.rect.height - 66))
+
+    def _draw_bar(self, x, total):
+        graph = self.graph
+        height = graph.get_height()
+        pygame.draw.line(graph, (0, 0, 0), (x, 0), (x, height))
+        top = height - int(min(total, GRAPH_MS) * height / GRAPH_MS)
+        color = (90, 220, 90) if total <= BUDGET_MS else (240, 80, 60)
+        pygame.draw.line(graph, color, (x, height), (x, top))
+        budget = height - int(BUDGET_MS * height / GRAPH_MS)
+        graph.set_at((x, budget), (255, 255, 0))
+
+    def _redraw_graph(self, samples):
+        self.graph.fill((0, 0, 0))
+        start = HISTORY - len(samples)
+        for x in range(start):
+            self._draw_bar(x, 0)
+        for i, sample in enumerate(samples):
+            self._draw_bar(start + i, sample[0])
+
+    def report(self):
+        """One line per frame class: percentiles and mean phase times."""
+        return "\n".join(
+            f"{name}: {self._percentiles(samples)}  ({self._phases(samples)})"
+            for name, samples in self.samples.items()
+        )
+
+    def _percentiles(self, samples):
+        totals = sorted(sample[0] for sample in samples)
+        return (f"p50 {percentile(totals, 0.5):.2f}  p95 {percentile(totals, 0.95):.2f}  "
+                f"p99 {percentile(totals, 0.99):.2f} ms")
+
+    def _phases(self, samples):
+        count = len(samples)
+        return "  ".join(
+            f"{phase} {sum(sample[i + 1] for sample in samples) / count:.2f}"
+            for i, phase in enumerate(PHASES)
+        )
+
+    def _line_text(self, index):
+        samples = self.samples[self.current]
+        if index == 0:
+            return f"{self.current}  ({len(samples)} frames)"
+        if index == 1:
+            return self._percentiles(samples)
+        return self._phases(samples)
+
+    def draw(self, screen):
+        if self.current is None:
+            return
+        now = time.perf_counter()
+        if not self.stale_lines and now >= self.next_refresh:
+            self.stale_lines = [0, 1, 2]
+            self.next_refresh = now + REFRESH_MS / 1000
+        if self.stale_lines:
+            index = self.stale_lines.pop()
+            self.lines[index] = self.font.render(self._line_text(index), True, (255, 255, 255))
+
+        refresh = getattr(screen, "refresh", None)
+        if refresh is not None:
+            refresh(self.graph)
+        x, y = self.rect.topleft
+        screen.blit(self.panel, self.rect)
+        for row, line in enumerate(self.lines):
+            if line is not None:
+                screen.blit(line, (x + 6, y + 4 + row * 18))
+        screen.blit(self.graph, (x + 6, y + 62))
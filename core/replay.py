@@ -0,0 +1,261 @@
+import bisect
+import json
+import queue
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from core.config import FPS, PROJECT_ROOT, REPLAY_DIR
+
+REPLAY_MAGIC = b"SFRP"
+REPLAY_VERSION = 1
+_HEADER = struct.Struct("<4sBH")
+
+# Runs are buffered and handed to the writer thread this many at a time.
+FLUSH_RUNS = 256
+
+# A full match-state keyframe every two seconds bounds seek fast-forwarding.
+KEYFRAME_INTERVAL = 2 * FPS
+KEYFRAME_MAGIC = b"SFKI"
+# (magic, end of the input runs, offset of the JSON keyframe index)
+_FOOTER = struct.Struct("<4sII")
+
+
+def encode_varint(value, out):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def replay_meta(characters, map_path=None, seed=None, mode="versus", **extra):
+    if map_path:
+        try:
+            map_path = Path(map_path).resolve().relative_to(PROJECT_ROOT).as_posix()
+        except ValueError:
+            pass
+    meta = {
+        "version": REPLAY_VERSION,
+        "characters": list(characters),
+        "map": map_path,
+        "seed": seed,
+        "mode": mode,
+        "fps": FPS,
+        "recorded": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    meta.update(extra)
+    return meta
+
+
+def replay_path(meta):
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    names = "-".join(name.replace(" ", "").replace(".", "") for name in meta["characters"])
+    return REPLAY_DIR / f"{stamp}-{names}.sfr"
+
+
+class ReplayRecorder:
+    """Record per-frame input pairs as a run-length-encoded stream.
+
+    ``record`` only compares against the current run and bumps a counter;
+    finished runs are encoded into a small buffer that a background thread
+    writes to disk, so the game loop never touches the file.
+
+    File layout: header (magic, version, JSON meta length), JSON meta, then
+    runs of ``(player 1 bits, player 2 bits, varint frame count)``. On close
+    the zlib-compressed JSON keyframes passed to ``keyframe`` are appended,
+    followed by a JSON index of ``[frame, offset, length]`` and a footer
+    pointing at both. A file cut short by a crash has runs only.
+    """
+
+    def __init__(self, path, meta):
+        self.path = Path(path)
+        self.meta = meta
+        self.pair = None
+        self.count = 0
+        self.frames = 0
+        self.buffer = bytearray()
+        self.buffered_runs = 0
+        self.chunks = queue.Queue()
+        self.thread = threading.Thread(target=self._write, daemon=True)
+        self.thread.start()
+
+    @classmethod
+    def start(cls, meta, path=None):
+        """Recorder writing to ``path`` (default: a new file in REPLAY_DIR)."""
+        try:
+            REPLAY_DIR.mkdir(parents=True, exist_ok=True)
+            return cls(path or replay_path(meta), meta)
+        except OSError as e:
+            print(f"Replay recording disabled: {e}")
+            return None
+
+    def record(self, bits1, bits2):
+        pair = (bits1, bits2)
+        self.frames += 1
+        if pair == self.pair:
+            self.count += 1
+            return
+        if self.count:
+            self._end_run()
+        self.pair = pair
+        self.count = 1
+
+    def _end_run(self):
+        buffer = self.buffer
+        buffer.append(self.pair[0])
+        buffer.append(self.pair[1])
+        encode_varint(self.count, buffer)
+        self.buffered_runs += 1
+        if self.buffered_runs >= FLUSH_RUNS:
+            self.chunks.put(bytes(buffer))
+            buffer.clear()
+            self.buffered_runs = 0
+
+    def keyframe(self, frame, state):
+        """Store ``state`` (JSON-friendly values) as the state before ``frame``."""
+        # Encoded on the writer thread; the game loop only enqueues.
+        self.chunks.put((frame, state))
+
+    def close(self):
+        if self.thread is None:
+            return
+        if self.count:
+            self._end_run()
+            self.count = 0
+        if self.buffer:
+            self.chunks.put(bytes(self.buffer))
+            self.buffer.clear()
+        self.chunks.put(None)
+        self.thread.join()
+        self.thread = None
+
+    def _write(self):
+        meta = json.dumps(self.meta, separators=(",", ":")).encode()
+        keyframes = []
+        with open(self.path, "wb") as f:
+            f.write(_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, len(meta)))
+            f.write(meta)
+            while True:
+                chunk = self.chunks.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, tuple):
+                    frame, state = chunk
+                    keyframes.append((frame, zlib.compress(
+                        json.dumps(state, separators=(",", ":")).encode())))
+                    continue
+                f.write(chunk)
+                f.flush()
+
+            runs_end = f.tell()
+            index = []
+            for frame, blob in keyframes:
+                index.append([frame, f.tell(), len(blob)])
+                f.write(blob)
+            index_offset = f.tell()
+            f.write(json.dumps(index, separators=(",", ":")).encode())
+            f.write(_FOOTER.pack(KEYFRAME_MAGIC, runs_end, index_offset))
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, meta_size = _HEADER.unpack_from(data)
+    if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+        raise ValueError(f"{path} is not a version {REPLAY_VERSION} replay")
+    pos = _HEADER.size
+    meta = json.loads(data[pos:pos + meta_size])
+    pos += meta_size
+
+    runs_end, index = len(data), []
+    if len(data) >= pos + _FOOTER.size:
+        magic, end, index_offset = _FOOTER.unpack_from(data, len(data) - _FOOTER.size)
+        if magic == KEYFRAME_MAGIC and pos <= end <= index_offset <= len(data) - _FOOTER.size:
+            runs_end = end
+            index = json.loads(data[index_offset:len(data) - _FOOTER.size])
+    return data, meta, pos, runs_end, index
+
+
+def _parse_runs(data, pos, end):
+    runs = []
+    while pos < end:
+        try:
+            bits1, bits2 = data[pos], data[pos + 1]
+            count, pos = decode_varint(data, pos + 2)
+        except IndexError:
+            # Truncated by a crash mid-write; keep the complete runs.
+            break
+        runs.append((bits1, bits2, count))
+    return runs
+
+
+def read_replay(path):
+    """Return ``(meta, runs)`` with runs as ``(bits1, bits2, frames)`` tuples."""
+    data, meta, pos, end, _ = _read(path)
+    return meta, _parse_runs(data, pos, end)
+
+
+def iter_frames(runs):
+    for bits1, bits2, count in runs:
+        for _ in range(count):
+            yield bits1, bits2
+
+
+class Replay:
+    """A loaded replay: per-frame inputs plus keyframes sorted by frame."""
+
+    def __init__(self, meta, inputs1, inputs2, keyframes=()):
+        self.meta = meta
+        self.inputs1 = inputs1
+        self.inputs2 = inputs2
+        self.keyframes = list(keyframes)
+
+    @property
+    def frames(self):
+        return len(self.inputs1)
+
+    def add_keyframe(self, frame, state):
+        index = bisect.bisect_left(self.keyframes, frame, key=lambda keyframe: keyframe[0])
+        self.keyframes.insert(index, (frame, state))
+
+    def keyframe_before(self, frame):
+        """Latest ``(frame, state)`` at or before ``frame``, or None."""
+        index = bisect.bisect_right(self.keyframes, frame, key=lambda keyframe: keyframe[0])
+        return self.keyframes[index - 1] if index else None
+
+
+def load_replay(path):
+    data, meta, pos, end, index = _read(path)
+    inputs1 = bytearray()
+    inputs2 = bytearray()
+    for bits1, bits2, count in _parse_runs(data, pos, end):
+        inputs1 += bytes((bits1,)) * count
+        inputs2 += bytes((bits2,)) * count
+
+    keyframes = []
+    for frame, offset, length in index:
+        state = json.loads(zlib.decompress(data[offset:offset + length]))
+        keyframes.append((frame, state))
+    return Replay(meta, inputs1, inputs2, keyframes)
+
+
+def latest_replay():
+    """Most recently written replay file, or None."""
+    try:
+        return max(REPLAY_DIR.glob("*.sfr"), key=lambda path: path.stat().st_mtime)
+    except (ValueError, OSError):
+        return None
@@ -0,0 +1,138 @@
+import weakref
+
+import pygame
+from pygame._sdl2 import video
+
+BLACK = pygame.Color(0, 0, 0)
+
+
+class TextureCanvas:
+    """Surface-like draw target that draws through an SDL ``Renderer``.
+
+    Supports the subset of the Surface API frames draw with (``blit``,
+    ``blits``, ``fill`` and the size getters) plus ``blit_flipped`` and
+    ``blit_scaled``. A surface is uploaded to a texture the first time it
+    is drawn and the texture is reused for as long as the surface lives,
+    so sprite frames and backgrounds cost one upload. Subsurfaces (atlas
+    frames) draw from their parent's texture, so a packed character is one
+    upload per page. Surfaces redrawn in place must be passed to
+    ``refresh`` after they change.
+    """
+
+    def __init__(self, renderer, size):
+        self.renderer = renderer
+        self.size = size
+        self.textures = weakref.WeakKeyDictionary()
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def get_rect(self):
+        return pygame.Rect((0, 0), self.size)
+
+    def refresh(self, surface):
+        """Re-upload ``surface`` the next time it is drawn."""
+        self.textures.pop(surface.get_abs_parent(), None)
+
+    def _texture(self, surface):
+        texture = self.textures.get(surface)
+        if texture is None:
+            texture = self.textures[surface] = video.Texture.from_surface(self.renderer, surface)
+        return texture
+
+    def blit(self, source, dest, area=None):
+        self.blit_flipped(source, dest, False, area)
+
+    def blit_flipped(self, source, dest, flip_x, area=None):
+        """Blit ``source`` mirrored horizontally when ``flip_x`` is set."""
+        texture = self._texture(source.get_abs_parent())
+        bounds = source.get_rect(topleft=source.get_abs_offset())
+        if area is None:
+            area = bounds
+        else:
+            area = pygame.Rect(area).move(bounds.topleft).clip(bounds)
+        texture.draw(area, pygame.Rect(dest[0], dest[1], area.width, area.height), flip_x=flip_x)
+
+    def blit_scaled(self, source, rect, area=None):
+        """Blit ``area`` of ``source`` (all of it by default) stretched to fill ``rect``."""
+        texture = self._texture(source.get_abs_parent())
+        bounds = source.get_rect(topleft=source.get_abs_offset())
+        area = bounds if area is None else pygame.Rect(area).move(bounds.topleft).clip(bounds)
+        texture.draw(area, rect)
+
+    def blits(self, sequence, doreturn=True):
+        for item in sequence:
+            self.blit(*item)
+
+    def fill(self, color, rect=None):
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.fill_rect(self.get_rect() if rect is None else rect)
+
+
+class TextureDisplay:
+    """Window drawn with the SDL ``Renderer`` instead of software blits.
+
+    Drop-in for ``Display``. Frames with ``draws_textures`` set draw on a
+    ``TextureCanvas``, so images are uploaded once and flipping and
+    scaling happen at draw time. Other frames draw on a software canvas
+    that is uploaded as one streaming texture per frame. The renderer's
+    logical size is the internal resolution; SDL letterboxes and scales
+    it to the window. Falls back to SDL's software renderer when no
+    accelerated one is available (``SDL_RENDER_DRIVER=software`` forces it).
+    """
+
+    def __init__(self, width, height, title, fullscreen=False):
+        self.size = (width, height)
+        # A hidden display surface so Surface.convert() keeps working.
+        pygame.display.set_mode((1, 1), pygame.HIDDEN)
+        self.window = video.Window(title, self.size, resizable=True)
+        try:
+            self.renderer = video.Renderer(self.window)
+        except pygame.error:
+            self.renderer = video.Renderer(self.window, accelerated=0)
+        self.renderer.logical_size = self.size
+        self.texture_canvas = TextureCanvas(self.renderer, self.size)
+        self.canvas = pygame.Surface(self.size).convert()
+        self.stream = video.Texture(self.renderer, self.size, streaming=True)
+        self.streaming = False
+        self.fullscreen = False
+        if fullscreen:
+            self.toggle_fullscreen()
+
+    def canvas_for(self, frame):
+        """Start a frame and return what ``frame`` should draw on."""
+        self.streaming = not getattr(frame, "draws_textures", False)
+        if self.streaming:
+            return self.canvas
+        self.renderer.draw_color = BLACK
+        self.renderer.clear()
+        return self.texture_canvas
+
+    def toggle_fullscreen(self):
+        self.fullscreen = not self.fullscreen
+        if self.fullscreen:
+            self.window.set_fullscreen(desktop=True)
+        else:
+            self.window.set_windowed()
+
+    def handle_event(self, event):
+        """The renderer follows window size changes itself; only closing needs handling."""
+        if event.type == pygame.WINDOWCLOSE and event.window is self.window:
+            # The hidden display window stays open, so SDL sends no QUIT.
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+        return False
+
+    def present(self, rects=None):
+        """Show the frame; ``rects`` is ignored since every frame is redrawn."""
+        if self.streaming:
+            self.renderer.draw_color = BLACK
+            self.renderer.clear()
+            self.stream.update(self.canvas)
+            self.stream.draw()
+        self.renderer.present()
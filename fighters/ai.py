@@ -0,0 +1,116 @@
+import random
+
+AI_DECISION_MIN_MS = 90
+AI_DECISION_MAX_MS = 170
+
+# "easy" and "normal" use policy tables (fighters.ai_policy), falling back
+# to the heuristic below (run inline: it takes microseconds) if a table is
+# missing; "hard" uses the lookahead planner.
+DIFFICULTIES = ("easy", "normal", "hard")
+
+# Snapshot layout sent to the AI each decision (plain tuple so it pickles
+# small and fast):
+# (ai_x, ai_width, ai_attack_range, ai_jump, ai_attack_cd, ai_attacking,
+#  ai_alive, target_x, target_alive)
+
+
+def empty_controls():
+    return {
+        "left": False,
+        "right": False,
+        "jump": False,
+        "attack1": False,
+        "attack2": False,
+    }
+
+
+def snapshot(ai_fighter, target_fighter):
+    return (
+        ai_fighter.rect.centerx,
+        ai_fighter.rect.width,
+        ai_fighter.character_data.get("attack_range", 2.0),
+        ai_fighter.jump,
+        ai_fighter.attack_cd,
+        ai_fighter.attacking,
+        ai_fighter.alive,
+        target_fighter.rect.centerx,
+        target_fighter.alive,
+    )
+
+
+def decide(state, rng=random):
+    """Distance-based heuristic: approach, keep spacing, attack in range."""
+    (ai_x, ai_width, attack_range, ai_jump, ai_attack_cd, ai_attacking,
+     ai_alive, target_x, target_alive) = state
+    controls = empty_controls()
+
+    distance_x = target_x - ai_x
+    abs_distance = abs(distance_x)
+
+    if abs_distance > 170:
+        if distance_x > 0:
+            controls["right"] = True
+        else:
+            controls["left"] = True
+    elif abs_distance < 85:
+        if distance_x > 0:
+            controls["left"] = True
+        else:
+            controls["right"] = True
+        if rng.random() < 0.08 and not ai_jump:
+            controls["jump"] = True
+    else:
+        if rng.random() < 0.25:
+            if distance_x > 0:
+                controls["right"] = True
+            else:
+                controls["left"] = True
+
+    attack_distance = int(ai_width * attack_range * 0.75)
+    can_attack = (
+        abs_distance <= attack_distance
+        and ai_attack_cd == 0
+        and not ai_attacking
+        and ai_alive
+        and target_alive
+    )
+    if can_attack and rng.random() < 0.6:
+        if rng.random() < 0.5:
+            controls["attack1"] = True
+        else:
+            controls["attack2"] = True
+
+    return controls
+
+
+class AIController:
+    """Per-fighter AI state: the current controls and when to decide next.
+
+    Decisions run inline. A ``policy`` table (fighters.ai_policy) or a
+    ``planner`` (fighters.lookahead) replaces the heuristic.
+    """
+
+    def __init__(self, rng=None, planner=None, policy=None):
+        self.planner = planner
+        self.policy = policy
+        self.rng = rng or random.Random()
+        self.reset()
+
+    def reset(self):
+        self.controls = empty_controls()
+        self.next_decision = 0
+
+    def get_controls(self, ai_fighter, target_fighter, now):
+        if now < self.next_decision:
+            return self.controls
+
+        if self.planner is not None:
+            self.controls = self.planner.decide(ai_fighter, target_fighter, self.rng)
+        else:
+            state = snapshot(ai_fighter, target_fighter)
+            if self.policy is not None:
+                self.controls = self.policy.act(state, self.rng)
+            else:
+                self.controls = decide(state, self.rng)
+        self.next_decision = now + self.rng.randint(AI_DECISION_MIN_MS, AI_DECISION_MAX_MS)
+        return self.controls
@@ -0,0 +1,299 @@
+import math
+import random
+import struct
+from collections import deque
+
+from core.assets import ai_policy_path
+from core.input import ATTACK1, ATTACK2, LEFT, RIGHT, SPECIAL1, SPECIAL2, UP, bits_to_controls
+from fighters.simulation import MatchSimulation, SimFighter
+
+POLICY_MAGIC = b"SFAP"
+POLICY_VERSION = 1
+_HEADER = struct.Struct("<4sBHBB")
+
+# Each state owns SLOTS action ids; an action's share of the slots is its
+# probability, so one decision is one index plus one random draw.
+SLOTS = 64
+
+DISTANCE_BUCKETS = (40, 85, 130, 170, 250, 400)
+# (bucket count, feature) in index order; see state_index().
+FEATURES = (
+    (len(DISTANCE_BUCKETS) + 1, "distance"),
+    (2, "in_range"),
+    (2, "ready"),
+    (2, "attacking"),
+    (2, "jump"),
+    (2, "alive"),
+    (2, "target_alive"),
+)
+STATE_COUNT = math.prod(count for count, _ in FEATURES)
+
+# Directions are relative to the target: FORWARD moves toward it.
+_FORWARD, _BACK = 1, 2
+MOVEMENTS = (0, _FORWARD, _BACK, UP, UP | _FORWARD, UP | _BACK)
+BUTTONS = (0, ATTACK1, ATTACK2, SPECIAL1, SPECIAL2)
+ACTIONS = tuple((movement, button) for movement in MOVEMENTS for button in BUTTONS)
+
+
+def _action_bits(action, target_right):
+    movement, button = ACTIONS[action]
+    bits = button | (movement & UP)
+    if movement & _FORWARD:
+        bits |= RIGHT if target_right else LEFT
+    if movement & _BACK:
+        bits |= LEFT if target_right else RIGHT
+    return bits
+
+
+# [target_right][action] -> controls dict
+ACTION_CONTROLS = tuple(
+    tuple(bits_to_controls(_action_bits(action, target_right)) for action in range(len(ACTIONS)))
+    for target_right in (False, True)
+)
+
+
+def state_index(state):
+    """Quantize a fighters.ai snapshot tuple into a table row."""
+    (ai_x, ai_width, attack_range, ai_jump, ai_attack_cd, ai_attacking,
+     ai_alive, target_x, target_alive) = state
+    distance = abs(target_x - ai_x)
+
+    bucket = 0
+    for limit in DISTANCE_BUCKETS:
+        if distance < limit:
+            break
+        bucket += 1
+
+    index = bucket
+    for flag in (
+        distance <= int(ai_width * attack_range * 0.75),
+        ai_attack_cd == 0,
+        ai_attacking,
+        ai_jump,
+        ai_alive,
+        target_alive,
+    ):
+        index = index * 2 + bool(flag)
+    return index
+
+
+def representative_state(index):
+    """A snapshot tuple that quantizes to ``index`` (used when compiling)."""
+    flags = []
+    for _ in range(len(FEATURES) - 1):
+        flags.append(index & 1)
+        index >>= 1
+    target_alive, alive, jump, attacking, ready, in_range = flags
+    bucket = index
+
+    low = DISTANCE_BUCKETS[bucket - 1] if bucket else 0
+    high = DISTANCE_BUCKETS[bucket] if bucket < len(DISTANCE_BUCKETS) else low + 200
+    distance = (low + high) // 2
+    # Pick a reach just above or below the distance: attack_distance = 60 * range.
+    attack_range = (distance + 1) / 60 if in_range else max(0, distance - 1) / 60
+    return (0, 80, attack_range, bool(jump), 0 if ready else 10, bool(attacking),
+            bool(alive), distance, bool(target_alive))
+
+
+def action_of(controls, target_right=True):
+    """Map a controls dict back to the closest action id."""
+    forward, back = ("right", "left") if target_right else ("left", "right")
+    movement = 0
+    if controls.get(forward):
+        movement |= _FORWARD
+    elif controls.get(back):
+        movement |= _BACK
+    if controls.get("jump"):
+        movement |= UP
+    button = 0
+    for name, bit in (("special1", SPECIAL1), ("special2", SPECIAL2),
+                      ("attack1", ATTACK1), ("attack2", ATTACK2)):
+        if controls.get(name):
+            button = bit
+            break
+    return ACTIONS.index((movement, button))
+
+
+def quantize_distribution(weights, slots=SLOTS):
+    """Spread ``slots`` action ids over ``weights`` (largest remainder)."""
+    total = sum(weights)
+    if total <= 0:
+        return bytes(slots)
+    exact = [w * slots / total for w in weights]
+    counts = [int(x) for x in exact]
+    by_remainder = sorted(range(len(weights)), key=lambda i: exact[i] - counts[i], reverse=True)
+    for i in by_remainder[:slots - sum(counts)]:
+        counts[i] += 1
+    row = bytearray()
+    for action, count in enumerate(counts):
+        row.extend([action] * count)
+    return bytes(row)
+
+
+class Policy:
+    """Dense state -> action table, ``STATE_COUNT * SLOTS`` bytes."""
+
+    def __init__(self, table):
+        if len(table) != STATE_COUNT * SLOTS:
+            raise ValueError(f"Policy table has {len(table)} bytes, expected {STATE_COUNT * SLOTS}")
+        self.table = bytes(table)
+
+    def act(self, state, rng=random):
+        action = self.table[state_index(state) * SLOTS + rng.randrange(SLOTS)]
+        return ACTION_CONTROLS[state[7] > state[0]][action]
+
+    def distribution(self, index):
+        row = self.table[index * SLOTS:(index + 1) * SLOTS]
+        weights = [0] * len(ACTIONS)
+        for action in row:
+            weights[action] += 1
+        return [w / SLOTS for w in weights]
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(POLICY_MAGIC, POLICY_VERSION, STATE_COUNT, SLOTS, len(ACTIONS)))
+            f.write(self.table)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, states, slots, actions = _HEADER.unpack_from(data)
+        if magic != POLICY_MAGIC or version != POLICY_VERSION:
+            raise ValueError(f"{path} is not a version {POLICY_VERSION} policy file")
+        if (states, slots, actions) != (STATE_COUNT, SLOTS, len(ACTIONS)):
+            raise ValueError(f"{path} was built for a different state/action layout")
+        return cls(data[_HEADER.size:])
+
+
+def compile_policy(behaviour, samples=2048, hesitation=0.0, seed=0):
+    """Tabulate ``behaviour(state, rng) -> controls`` by sampling each state.
+
+    ``hesitation`` is the share of decisions turned into doing nothing,
+    which makes for an easier opponent.
+    """
+    rng = random.Random(seed)
+    table = bytearray()
+    for index in range(STATE_COUNT):
+        state = representative_state(index)
+        weights = [0.0] * len(ACTIONS)
+        for _ in range(samples):
+            weights[action_of(behaviour(state, rng))] += 1
+        weights = [w / samples * (1 - hesitation) for w in weights]
+        weights[0] += hesitation
+        table.extend(quantize_distribution(weights))
+    return Policy(table)
+
+
+def sim_snapshot(me, them):
+    return (me.x, 80, me.profile.attack_range, me.jump, me.attack_cd, me.attacking,
+            me.alive, them.x, them.alive)
+
+
+class SelfPlayStats:
+    """Average reward of each (state, action), gathered from self-play."""
+
+    def __init__(self):
+        self.reward = [[0.0] * len(ACTIONS) for _ in range(STATE_COUNT)]
+        self.count = [[0] * len(ACTIONS) for _ in range(STATE_COUNT)]
+
+    def add(self, index, action, reward):
+        self.reward[index][action] += reward
+        self.count[index][action] += 1
+
+    def improve(self, policy, temperature=4.0, min_count=8, prior=0.5):
+        """New policy: softmax over mean rewards, blended with ``policy``."""
+        table = bytearray()
+        for index in range(STATE_COUNT):
+            base = policy.distribution(index)
+            counts = self.count[index]
+            seen = [a for a in range(len(ACTIONS)) if counts[a] >= min_count]
+            if not seen:
+                table.extend(policy.table[index * SLOTS:(index + 1) * SLOTS])
+                continue
+            means = {a: self.reward[index][a] / counts[a] for a in seen}
+            top = max(means.values())
+            exp = {a: math.exp((m - top) / temperature) for a, m in means.items()}
+            total = sum(exp.values())
+            weights = [
+                base[a] * prior + (1 - prior) * exp.get(a, 0.0) / total
+                for a in range(len(ACTIONS))
+            ]
+            table.extend(quantize_distribution(weights))
+        return Policy(table)
+
+
+def play_match(policies, profiles, width, height, seed=0, max_ticks=3600,
+               epsilon=0.0, stats=None, horizon=30):
+    """Play one headless match between two policies.
+
+    Returns ``(winner, ticks, healths)`` with ``winner`` 0 or 1, or None on
+    a draw. If ``stats`` is given, the reward of every decision (damage
+    dealt minus damage taken over the next ``horizon`` ticks) is recorded;
+    with probability ``epsilon`` a random action is explored instead.
+    """
+    rng = random.Random(seed)
+    ground = height - 110
+    fighters = []
+    for side, profile in enumerate(profiles):
+        fighter = SimFighter(profile, team=side + 1)
+        fighter.reset(200 if side == 0 else width - 300, ground, side == 1)
+        fighters.append(fighter)
+    sim = MatchSimulation(fighters, width, height)
+
+    pending = deque()
+    inputs = [0, 0]
+    next_decision = [0, 0]
+    while sim.tick < max_ticks and all(f.alive for f in fighters):
+        for side in (0, 1):
+            if sim.tick < next_decision[side]:
+                continue
+            me, them = fighters[side], fighters[1 - side]
+            index = state_index(sim_snapshot(me, them))
+            if epsilon and rng.random() < epsilon:
+                action = rng.randrange(len(ACTIONS))
+            else:
+                action = policies[side].table[index * SLOTS + rng.randrange(SLOTS)]
+            inputs[side] = _action_bits(action, them.x > me.x)
+            if stats is not None:
+                pending.append((sim.tick + horizon, side, index, action, me.health, them.health))
+            # Same cadence as AIController (90-170 ms).
+            next_decision[side] = sim.tick + rng.randint(5, 10)
+
+        sim.step(inputs)
+
+        while pending and pending[0][0] <= sim.tick:
+            _, side, index, action, my_health, their_health = pending.popleft()
+            me, them = fighters[side], fighters[1 - side]
+            stats.add(index, action, (their_health - them.health) - (my_health - me.health))
+
+    healths = (fighters[0].health, fighters[1].health)
+    winner = None if healths[0] == healths[1] else int(healths[1] > healths[0])
+    return winner, sim.tick, healths
+
+
+def self_play(policy, profiles, width, height, matches=100, epsilon=0.2, seed=0, stats=None):
+    """Record decision rewards from ``policy`` playing against itself."""
+    rng = random.Random(seed)
+    stats = stats or SelfPlayStats()
+    for _ in range(matches):
+        play_match((policy, policy), profiles, width, height, seed=rng.random(),
+                   epsilon=epsilon, stats=stats)
+    return stats
+
+
+_loaded_policies = {}
+
+
+def load_policy(difficulty):
+    """Policy table shipped for ``difficulty``, or None if there is none."""
+    if difficulty not in _loaded_policies:
+        path = ai_policy_path(difficulty)
+        try:
+            _loaded_policies[difficulty] = Policy.load(path)
+        except FileNotFoundError:
+            _loaded_policies[difficulty] = None
+        except Exception as e:
+            print(f"Error loading AI policy {path}: {e}")
+            _loaded_policies[difficulty] = None
+    return _loaded_policies[difficulty]
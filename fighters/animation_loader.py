@@ -1,3 +1,5 @@
+import colorsys
+
 import pygame
 from core.assets import image_path
 
@@ -286,3 +288,262 @@ def _trim_and_key_frame(surface):
         pass
 
     return trimmed
+
+
+# Index 0 of indexed frames is the transparent colour key.
+TRANSPARENT_INDEX = 0
+KEY_COLOR = (255, 0, 255)
+PALETTE_SHEET = "Alternate Palattes.png"
+# Colour groups the reference pose of a PALETTE_SHEET is reduced to, and how
+# far (sum of channel differences) a palette entry may be from a group to follow it.
+SWAP_GROUPS = 24
+SWAP_DISTANCE = 60
+# Alternates whose pixels differ from the frames' colours by less than this on
+# average (sum of channel differences) look the same in a mirror match and are dropped.
+MIN_SWAP_DIFFERENCE = 40
+# Characters without a usable alternate get one generated: colours outside
+# SKIN_HUES are turned FALLBACK_HUE_SHIFT round the colour wheel and dark
+# greys (below FALLBACK_MIN_SATURATION and FALLBACK_MAX_TINT_VALUE) take
+# FALLBACK_TINT's hue and saturation. If that leaves the sprite too close to
+# the original, skin-coloured hues turn as well.
+FALLBACK_HUE_SHIFT = 0.5
+FALLBACK_MIN_SATURATION = 0.25
+FALLBACK_TINT = (0.6, 0.5)
+FALLBACK_MAX_TINT_VALUE = 0.6
+SKIN_HUES = (0.0, 0.14)
+
+
+def _pil_rgba(surface):
+    from PIL import Image
+
+    return Image.frombytes("RGBA", surface.get_size(), pygame.image.tobytes(surface, "RGBA"))
+
+
+def index_animations(animations, directory):
+    """Convert an animation list to 8-bit frames sharing one palette.
+
+    Opaque pixels of every frame are quantized together to 255 colours;
+    pixels with alpha <= 127 (what masks treat as empty) become the colour
+    key. Returns ``(animations, palettes)`` where ``palettes[0]`` is the
+    frames' palette and the rest are alternates read from the character's
+    PALETTE_SHEET, most different first, leaving out those that barely
+    change the frames; a generated one stands in when none are left.
+    Without Pillow the frames come back unchanged, with
+    ``[None]`` as palettes.
+    """
+    try:
+        from PIL import Image
+    except Exception:
+        return animations, [None]
+
+    frames = [frame for frames in animations for frame in frames]
+    images = [_pil_rgba(frame) for frame in frames]
+    sheet = Image.new("RGB", (sum(image.width for image in images), max(image.height for image in images)))
+    x = 0
+    for image in images:
+        sheet.paste(image.convert("RGB"), (x, 0), image)
+        x += image.width
+    reference = sheet.quantize(255, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+    colors = reference.getpalette()[:255 * 3]
+    colors += colors[:3] * (256 - len(colors) // 3)
+    reference.putpalette(colors)
+    palette = [KEY_COLOR] + [tuple(colors[i:i + 3]) for i in range(0, 255 * 3, 3)]
+
+    shift = [min(i, 254) + 1 for i in range(256)]
+    empty = [0] * 128 + [255] * 128
+    indexed = []
+    counts = [0] * 256
+    for frame, image in zip(frames, images):
+        indices = image.convert("RGB").quantize(palette=reference, dither=Image.Dither.NONE)
+        indices = Image.frombytes("L", image.size, indices.tobytes()).point(shift)
+        opaque = image.getchannel("A").point(empty)
+        indices = Image.composite(indices, Image.new("L", image.size, TRANSPARENT_INDEX), opaque)
+        counts = [total + count for total, count in zip(counts, indices.histogram())]
+        surface = pygame.image.frombytes(indices.tobytes(), image.size, "P")
+        surface.set_palette(palette)
+        surface.set_colorkey(TRANSPARENT_INDEX, pygame.RLEACCEL)
+        indexed.append(surface)
+
+    it = iter(indexed)
+    animations = [[next(it) for _ in frames] for frames in animations]
+    counts[TRANSPARENT_INDEX] = 0
+    return animations, [palette] + _alternate_palettes(directory, palette, counts)
+
+
+def _alternate_palettes(directory, palette, counts):
+    """PALETTE_SHEET swaps that visibly change the frames, or a generated one."""
+
+    def difference(swap):
+        return _palette_difference(palette, swap, counts)
+
+    swaps = sorted(_palette_swaps(directory, palette), key=difference, reverse=True)
+    swaps = [swap for swap in swaps if difference(swap) >= MIN_SWAP_DIFFERENCE]
+    if swaps:
+        return swaps
+    swap = _recoloured(palette, skin=False)
+    if difference(swap) < MIN_SWAP_DIFFERENCE:
+        swap = _recoloured(palette, skin=True)
+    return [swap]
+
+
+def _palette_difference(a, b, counts):
+    """Mean distance between the colours of two palettes per pixel using them."""
+    return sum(count * _distance(x, y) for x, y, count in zip(a, b, counts)) / max(1, sum(counts))
+
+
+def _recoloured(palette, skin):
+    """``palette`` with costume hues turned and greys tinted; skin hues too if ``skin``."""
+    recoloured = [palette[0]]
+    for color in palette[1:]:
+        h, s, v = colorsys.rgb_to_hsv(*(c / 255 for c in color))
+        if s < FALLBACK_MIN_SATURATION:
+            if v <= FALLBACK_MAX_TINT_VALUE:
+                h, s = FALLBACK_TINT
+        elif skin or not SKIN_HUES[0] <= h <= SKIN_HUES[1]:
+            h = (h + FALLBACK_HUE_SHIFT) % 1
+        recoloured.append(tuple(round(c * 255) for c in colorsys.hsv_to_rgb(h, s, v)))
+    return recoloured
+
+
+def _palette_swaps(directory, palette):
+    """Alternate palettes from a sheet showing one pose in several colourings.
+
+    The pose whose colours are closest to ``palette`` is the reference; it
+    is reduced to a few colour groups and each other pose, aligned on it,
+    gives the average colour of the same pixels. Every entry of
+    ``palette`` within SWAP_DISTANCE of a group moves by that group's
+    change, so all shades of a costume part follow; the rest are kept.
+    """
+    try:
+        sheet = pygame.image.load(image_path(directory, PALETTE_SHEET)).convert_alpha()
+    except (pygame.error, FileNotFoundError):
+        return []
+    poses = _split_by_detected_columns(sheet, 1) or []
+    if len(poses) < 2:
+        return []
+
+    def palette_error(pose):
+        return sum(count * min(_distance(color, entry) for entry in palette[1:])
+                   for color, count in _pose_groups(pose)[2].values())
+
+    base = min(poses, key=palette_error)
+    base_mask, groups, base_colors = _pose_groups(base)
+    opaque = [(x, y) for y in range(base.get_height()) for x in range(base.get_width())
+              if base_mask.get_at((x, y))]
+
+    swaps = []
+    for pose in poses:
+        if pose is base:
+            continue
+        mask = pygame.mask.from_surface(pose)
+        # The poses are trimmed separately; line them up where their silhouettes overlap most.
+        dx, dy = max(
+            ((dx, dy) for dx in range(-3, 4) for dy in range(-3, 4)),
+            key=lambda offset: base_mask.overlap_area(mask, offset),
+        )
+        bounds = pose.get_rect()
+        totals = {}
+        for x, y in opaque:
+            if bounds.collidepoint(x - dx, y - dy) and mask.get_at((x - dx, y - dy)):
+                totals.setdefault(groups[y * base.get_width() + x], []).append(pose.get_at((x - dx, y - dy)))
+        shifts = [
+            (color, tuple(sum(c[k] for c in totals[group]) // len(totals[group]) - color[k] for k in range(3)))
+            for group, (color, _) in base_colors.items()
+            if group in totals
+        ]
+        swap = [palette[0]]
+        for color in palette[1:]:
+            distance, shift = min((_distance(color, center), shift) for center, shift in shifts)
+            if distance <= SWAP_DISTANCE:
+                color = tuple(max(0, min(255, c + d)) for c, d in zip(color, shift))
+            swap.append(color)
+        swaps.append(swap)
+    return swaps
+
+
+def _distance(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1]) + abs(a[2] - b[2])
+
+
+def _pose_groups(pose):
+    """``(mask, group per pixel, {group: (average colour, pixel count)})`` of a pose."""
+    from PIL import Image
+
+    mask = pygame.mask.from_surface(pose)
+    width, height = pose.get_size()
+    groups = _pil_rgba(pose).convert("RGB").quantize(
+        SWAP_GROUPS, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE).tobytes()
+    totals = {}
+    for y in range(height):
+        for x in range(width):
+            if mask.get_at((x, y)):
+                totals.setdefault(groups[y * width + x], []).append(pose.get_at((x, y)))
+    colors = {
+        group: (tuple(sum(c[k] for c in pixels) // len(pixels) for k in range(3)), len(pixels))
+        for group, pixels in totals.items()
+    }
+    return mask, groups, colors
+
+
+class FrameCollision:
+    """Precomputed collision data for one animation frame in one facing."""
+
+    __slots__ = ("hurt_mask", "hurt_box", "hit_mask", "hit_box")
+
+    def __init__(self, hurt_mask, hurt_box, hit_mask=None, hit_box=None):
+        self.hurt_mask = hurt_mask
+        self.hurt_box = hurt_box
+        self.hit_mask = hit_mask
+        self.hit_box = hit_box
+
+    @property
+    def hit_area(self):
+        return self.hit_mask.count() if self.hit_mask is not None else 0
+
+
+def _mask_bounds(mask):
+    rects = mask.get_bounding_rects()
+    if not rects:
+        return None
+    return rects[0].unionall(rects[1:])
+
+
+def _facing_collision(mask, reach_start, facing_left):
+    width, height = mask.get_size()
+    hurt_box = _mask_bounds(mask) or pygame.Rect(0, 0, 0, 0)
+    if reach_start is None:
+        return FrameCollision(mask, hurt_box)
+
+    # The hit region is whatever sticks out past the neutral body silhouette
+    # on the facing side of the (center-aligned) frame.
+    cut_width = max(0, min(width, width // 2 + reach_start))
+    hit_mask = mask.copy()
+    if cut_width > 0:
+        cut = pygame.mask.Mask((cut_width, height), fill=True)
+        hit_mask.erase(cut, (width - cut_width, 0) if facing_left else (0, 0))
+
+    hit_box = _mask_bounds(hit_mask)
+    if hit_box is None:
+        return FrameCollision(mask, hurt_box)
+    return FrameCollision(mask, hurt_box, hit_mask, hit_box)
+
+
+def build_frame_collision(frame, reach_start=None):
+    """Return ``(facing_right, facing_left)`` collision data for ``frame``.
+
+    ``reach_start`` is the distance from the frame center where attacks start
+    to count as hitting; ``None`` means the frame has no hit region.
+    """
+    mask = pygame.mask.from_surface(frame)
+    flipped = pygame.mask.from_surface(pygame.transform.flip(frame, True, False))
+    return (
+        _facing_collision(mask, reach_start, False),
+        _facing_collision(flipped, reach_start, True),
+    )
+
+
+def frame_half_width(frame):
+    bounds = _mask_bounds(pygame.mask.from_surface(frame))
+    if bounds is None:
+        return frame.get_width() // 2
+    return max(frame.get_width() // 2 - bounds.left, bounds.right - frame.get_width() // 2)
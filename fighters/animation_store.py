@@ -0,0 +1,50 @@
+from core.asset_cache import AssetCache
+
+# Memory the loaded characters may hold, atlas pages of every palette made
+# included (least recently used go first once it is exceeded).
+ANIMATION_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class CharacterSprites:
+    """A character's animation frames, collision data and projectiles, loaded once and shared.
+
+    Frames live in an ``Atlas`` whose pages index ``palettes[0]``;
+    ``animations(n)`` gives the same frames recoloured with palette ``n``
+    (a copy of the atlas pages, made once per palette). Collision data
+    and projectiles do not depend on the palette and are always shared.
+    """
+
+    def __init__(self, atlas, collision, palettes, projectiles):
+        self.collision = collision
+        self.projectiles = projectiles
+        self.palettes = palettes
+        self.atlases = {0: atlas}
+
+    def animations(self, palette=0):
+        palette %= len(self.palettes)
+        atlas = self.atlases.get(palette)
+        if atlas is None:
+            atlas = self.atlases[palette] = self.atlases[0].recoloured(self.palettes[palette])
+        return atlas.animations
+
+    @property
+    def nbytes(self):
+        return sum(atlas.nbytes for atlas in self.atlases.values())
+
+
+class AnimationStore(AssetCache):
+    """Loaded CharacterSprites by character name.
+
+    ``get`` calls ``load()`` only for characters not already loaded, so
+    both fighters of a mirror match (and the next match) share one copy,
+    and a character the prefetcher is loading is waited for, not reloaded.
+    Characters are kept while their ``nbytes`` fit in ``max_bytes``; sizes
+    are measured each time a character is stored, so recoloured atlases
+    made since count too.
+    """
+
+    def __init__(self, max_bytes=ANIMATION_CACHE_BYTES):
+        super().__init__(max_bytes=max_bytes, size=lambda sprites: sprites.nbytes)
+
+
+ANIMATIONS = AnimationStore()
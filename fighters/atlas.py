@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+
+import pygame
+
+from core.config import ASSET_CACHE_DIR
+from fighters.animation_loader import TRANSPARENT_INDEX
+
+# Largest page side in pixels; pages are cropped to the area they use.
+ATLAS_PAGE_SIZE = 2048
+# Empty pixels between packed frames, so scaled draws don't bleed into neighbours.
+ATLAS_PADDING = 1
+# Bump when frame loading or the atlas format changes, so stale cache entries are rebuilt.
+ATLAS_VERSION = 2
+ATLAS_CACHE_DIR = ASSET_CACHE_DIR / "atlases"
+
+
+class Atlas:
+    """A character's animation frames packed into a few large pages.
+
+    ``animations`` holds the frames, grouped per action like the list they
+    were packed from, as ``subsurface`` views into the pages: a character
+    is a handful of allocations (and, on the texture backend, a handful of
+    texture uploads) instead of one per frame. Pages are 8-bit when the
+    frames are, so recolouring copies only the pages.
+    """
+
+    def __init__(self, pages, rects, counts):
+        self.pages = pages
+        self.rects = rects
+        self.counts = counts
+        frames = iter([pages[page].subsurface(rect) for page, rect in rects])
+        self.animations = [[next(frames) for _ in range(count)] for count in counts]
+
+    @classmethod
+    def pack(cls, animations, page_size=ATLAS_PAGE_SIZE, padding=ATLAS_PADDING):
+        """Shelf-pack the frames of ``animations``, tallest first, onto as few pages as fit."""
+        frames = [frame for frames in animations for frame in frames]
+        rects = [None] * len(frames)
+        page = x = y = shelf = 0
+        for index in sorted(range(len(frames)), key=lambda i: frames[i].get_height(), reverse=True):
+            width, height = frames[index].get_size()
+            if x and x + width > page_size:
+                x, y, shelf = 0, y + shelf + padding, 0
+            if y and y + height > page_size:
+                page, x, y, shelf = page + 1, 0, 0, 0
+            rects[index] = (page, pygame.Rect(x, y, width, height))
+            x += width + padding
+            shelf = max(shelf, height)
+
+        pages = []
+        for number in range(page + 1):
+            used = [rect for index, rect in rects if index == number]
+            pages.append(_page(frames[0], (max(r.right for r in used), max(r.bottom for r in used))))
+        for frame, (page, rect) in zip(frames, rects):
+            if frame.get_bitsize() == 8:
+                pages[page].blit(frame, rect)
+            else:
+                # Copies alpha as is instead of blending onto the empty page.
+                pages[page].blit(frame, rect, special_flags=pygame.BLEND_RGBA_MAX)
+        for page in pages:
+            _set_key(page)
+        return cls(pages, rects, [len(frames) for frames in animations])
+
+    def recoloured(self, palette):
+        """A copy of this atlas with 8-bit pages using ``palette``."""
+        pages = []
+        for page in self.pages:
+            page = page.copy()
+            page.set_palette(palette)
+            _set_key(page)
+            pages.append(page)
+        return Atlas(pages, self.rects, self.counts)
+
+    @property
+    def nbytes(self):
+        return sum(page.get_height() * page.get_pitch() for page in self.pages)
+
+    def save(self, path, key, **info):
+        """Write the pages next to ``path`` as PNGs and the layout plus ``info`` as JSON.
+
+        Failures are ignored: the cache is only an optimisation.
+        """
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            for index, page in enumerate(self.pages):
+                pygame.image.save(page, f"{path}-{index}.png")
+            # Written last, so a partly written entry is never read back.
+            with open(f"{path}.json", "w", encoding="utf-8") as file:
+                json.dump({
+                    "key": key,
+                    "pages": len(self.pages),
+                    "rects": [[page, *rect] for page, rect in self.rects],
+                    "counts": self.counts,
+                    "info": info,
+                }, file)
+        except (OSError, pygame.error) as e:
+            print(f"Could not cache atlas {path.name}: {e}")
+
+    @classmethod
+    def load(cls, path, key):
+        """``(atlas, info)`` saved at ``path`` under ``key``, or None if missing or stale."""
+        try:
+            with open(f"{path}.json", encoding="utf-8") as file:
+                data = json.load(file)
+            if data["key"] != key:
+                return None
+            pages = []
+            for index in range(data["pages"]):
+                page = pygame.image.load(f"{path}-{index}.png")
+                if page.get_bitsize() != 8:
+                    page = page.convert_alpha()
+                _set_key(page)
+                pages.append(page)
+            rects = [(page, pygame.Rect(rect)) for page, *rect in data["rects"]]
+            return cls(pages, rects, data["counts"]), data["info"]
+        except (OSError, ValueError, KeyError, pygame.error):
+            return None
+
+
+def _page(frame, size):
+    if frame.get_bitsize() != 8:
+        return pygame.Surface(size, pygame.SRCALPHA)
+    page = pygame.Surface(size, depth=8)
+    page.set_palette(frame.get_palette())
+    page.fill(TRANSPARENT_INDEX)
+    return page
+
+
+def _set_key(page):
+    if page.get_bitsize() == 8:
+        page.set_colorkey(TRANSPARENT_INDEX, pygame.RLEACCEL)
+
+
+def atlas_key(directory, *details):
+    """Cache key for frames loaded from ``directory`` with ``details`` (specs, scale).
+
+    Changes when any file in the directory is modified.
+    """
+    digest = hashlib.sha1(repr((ATLAS_VERSION, details)).encode())
+    try:
+        entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+    except OSError:
+        entries = []
+    for entry in entries:
+        if entry.is_file():
+            stat = entry.stat()
+            digest.update(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
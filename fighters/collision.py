@@ -0,0 +1,62 @@
+from operator import itemgetter
+
+# Item layout: (left, right, top, bottom, is_hitbox, team, owner, payload)
+_LEFT = itemgetter(0)
+
+
+class SweepAndPrune:
+    """Sort-and-sweep broadphase on the x axis.
+
+    Every frame the caller adds hurtboxes (fighters) and hitboxes (active
+    attack frames, projectiles), then asks for candidate pairs. Only
+    hitbox/hurtbox pairs from different teams are reported, with the boxes
+    already overlapping on both axes; the caller runs the mask test.
+    """
+
+    def __init__(self):
+        self.items = []
+
+    def clear(self):
+        del self.items[:]
+
+    def add_hurtbox(self, rect, owner, team):
+        self.items.append(
+            (rect.left, rect.right, rect.top, rect.bottom, False, team, owner, None))
+
+    def add_hitbox(self, rect, owner, team, payload=None):
+        self.items.append(
+            (rect.left, rect.right, rect.top, rect.bottom, True, team, owner, payload))
+
+    def pairs(self):
+        """Yield ``(hitbox_item, hurtbox_item)`` candidate pairs."""
+        items = self.items
+        # Order barely changes between frames, so this is close to linear.
+        items.sort(key=_LEFT)
+
+        active = []
+        for item in items:
+            left = item[0]
+            if active:
+                active = [other for other in active if other[1] >= left]
+
+            for other in active:
+                if item[4] == other[4] or item[5] == other[5]:
+                    continue
+                if item[2] > other[3] or other[2] > item[3]:
+                    continue
+                yield (item, other) if item[4] else (other, item)
+
+            active.append(item)
+
+
+def brute_force_pairs(items):
+    """Reference O(n^2) pairing with the same filtering as SweepAndPrune."""
+    for i, item in enumerate(items):
+        for other in items[i + 1:]:
+            if item[4] == other[4] or item[5] == other[5]:
+                continue
+            if item[0] > other[1] or other[0] > item[1]:
+                continue
+            if item[2] > other[3] or other[2] > item[3]:
+                continue
+            yield (item, other) if item[4] else (other, item)
@@ -0,0 +1,324 @@
+import pygame
+
+from fighters.animation_loader import load_animation
+from fighters.collision import SweepAndPrune
+from fighters.frame_data import TICKS_PER_ANIMATION_FRAME
+
+PROJECTILE_CAPACITY = 32
+EFFECT_CAPACITY = 128
+
+
+class ProjectileSpec:
+    """Frames and tuning for one projectile type, loaded once per character."""
+
+    def __init__(self, frames, speed=10, lifetime=120):
+        flipped = [pygame.transform.flip(f, True, False) for f in frames]
+        # Indexed [flip][frame]; the whole sprite is the hit region.
+        self.frames = (frames, flipped)
+        self.hit_masks = (
+            [pygame.mask.from_surface(f) for f in frames],
+            [pygame.mask.from_surface(f) for f in flipped],
+        )
+        self.speed = speed
+        self.lifetime = lifetime
+
+
+def load_projectile_spec(path, spec, scale):
+    frames = load_animation(path, spec["sheet"], scale, spec.get("frames"))
+    return ProjectileSpec(
+        frames,
+        speed=spec.get("speed", 10),
+        lifetime=spec.get("lifetime", 120),
+    )
+
+
+class Entity:
+    __slots__ = (
+        "owner",
+        "frames",
+        "masks",
+        "x",
+        "y",
+        "vx",
+        "damage",
+        "frame_index",
+        "ticks",
+        "ticks_left",
+        "loop",
+        "hits",
+    )
+
+    def __init__(self):
+        self.owner = None
+        self.frames = None
+        self.masks = None
+        self.x = 0
+        self.y = 0
+        self.vx = 0
+        self.damage = 0
+        self.frame_index = 0
+        self.ticks = 0
+        self.ticks_left = 0
+        self.loop = False
+        self.hits = True
+
+
+class EntityPool:
+    """Fixed-capacity pool; live entities are always ``entities[:count]``."""
+
+    def __init__(self, capacity):
+        self.entities = [Entity() for _ in range(capacity)]
+        self.count = 0
+
+    def acquire(self):
+        if self.count == len(self.entities):
+            return None
+        entity = self.entities[self.count]
+        self.count += 1
+        return entity
+
+    def release(self, index):
+        # Swap-remove so the live range stays contiguous.
+        last = self.count - 1
+        entities = self.entities
+        entities[index], entities[last] = entities[last], entities[index]
+        entity = entities[last]
+        entity.owner = None
+        entity.frames = None
+        entity.masks = None
+        self.count = last
+
+    def clear(self):
+        while self.count:
+            self.release(self.count - 1)
+
+    def advance(self):
+        # Iterate backwards so releasing does not skip entities.
+        for i in range(self.count - 1, -1, -1):
+            entity = self.entities[i]
+            entity.x += entity.vx
+            entity.ticks_left -= 1
+            entity.ticks += 1
+            if entity.ticks >= TICKS_PER_ANIMATION_FRAME:
+                entity.ticks = 0
+                entity.frame_index += 1
+                if entity.frame_index >= len(entity.frames):
+                    if not entity.loop:
+                        self.release(i)
+                        continue
+                    entity.frame_index = 0
+            if entity.ticks_left <= 0:
+                self.release(i)
+
+    def blit_sequence(self, alpha=1.0):
+        # alpha < 1 draws moving entities back toward their previous tick.
+        lag = 1 - alpha
+        for i in range(self.count):
+            entity = self.entities[i]
+            image = entity.frames[entity.frame_index]
+            x = entity.x - round(entity.vx * lag)
+            yield image, (x - image.get_width() // 2, entity.y - image.get_height() // 2)
+
+
+def _build_spark_frames(radius=18, count=4):
+    frames = []
+    for i in range(count):
+        size = radius * 2
+        frame = pygame.Surface((size, size), pygame.SRCALPHA)
+        r = max(2, int(radius * (i + 1) / count))
+        alpha = 255 - i * (200 // count)
+        pygame.draw.circle(frame, (255, 240, 120, alpha), (radius, radius), r)
+        pygame.draw.circle(frame, (255, 255, 255, alpha), (radius, radius), max(1, r // 2))
+        frames.append(frame)
+    return frames
+
+
+class EntitySystem:
+    """Projectiles and hit effects, updated and drawn in batches.
+
+    Both pools are allocated up front; spawning past capacity is dropped.
+    ``on_hit(projectile_owner, target, damage)`` replaces the default damage
+    handling (the online frame reports hits to the server instead), and
+    ``on_spawn(owner, spec, x, y)`` is called for every projectile spawned.
+    Projectiles spawned with ``hits=False`` are only drawn.
+    """
+
+    def __init__(self, width, height, projectile_capacity=PROJECTILE_CAPACITY,
+                 effect_capacity=EFFECT_CAPACITY, on_hit=None, on_spawn=None):
+        self.width = width
+        self.height = height
+        self.projectiles = EntityPool(projectile_capacity)
+        self.effects = EntityPool(effect_capacity)
+        self.spark_frames = _build_spark_frames()
+        self.on_hit = on_hit
+        self.on_spawn = on_spawn
+        self.world = SweepAndPrune()
+
+    def clear(self):
+        self.projectiles.clear()
+        self.effects.clear()
+
+    def spawn_projectile(self, owner, spec, x, y, damage, flip=None, hits=True):
+        entity = self.projectiles.acquire()
+        if entity is None:
+            return None
+        if flip is None:
+            flip = owner.flip
+        facing = 1 if flip else 0
+        entity.owner = owner
+        entity.frames = spec.frames[facing]
+        entity.masks = spec.hit_masks[facing]
+        entity.x = x
+        entity.y = y
+        entity.vx = -spec.speed if flip else spec.speed
+        entity.damage = damage
+        entity.frame_index = 0
+        entity.ticks = 0
+        entity.ticks_left = spec.lifetime
+        entity.loop = True
+        entity.hits = hits
+        if self.on_spawn is not None:
+            self.on_spawn(owner, spec, x, y)
+        return entity
+
+    def spawn_effect(self, frames, x, y):
+        entity = self.effects.acquire()
+        if entity is None:
+            return None
+        entity.owner = None
+        entity.frames = frames
+        entity.masks = None
+        entity.x = x
+        entity.y = y
+        entity.vx = 0
+        entity.damage = 0
+        entity.frame_index = 0
+        entity.ticks = 0
+        entity.ticks_left = len(frames) * TICKS_PER_ANIMATION_FRAME
+        entity.loop = False
+        entity.hits = False
+        return entity
+
+    def spawn_hit_spark(self, x, y):
+        return self.spawn_effect(self.spark_frames, x, y)
+
+    def update(self, fighters):
+        self.advance()
+        self.collide(fighters)
+
+    def advance(self):
+        self.projectiles.advance()
+        self.effects.advance()
+        self._release_offscreen()
+
+    def _release_offscreen(self):
+        pool = self.projectiles
+        for i in range(pool.count - 1, -1, -1):
+            entity = pool.entities[i]
+            if entity.owner is None or entity.x < -200 or entity.x > self.width + 200:
+                pool.release(i)
+
+    def add_to_broadphase(self, world):
+        pool = self.projectiles
+        for i in range(pool.count):
+            entity = pool.entities[i]
+            if entity.owner is None or not entity.hits:
+                continue
+            image = entity.frames[entity.frame_index]
+            w, h = image.get_size()
+            rect = pygame.Rect(entity.x - w // 2, entity.y - h // 2, w, h)
+            world.add_hitbox(rect, entity.owner, entity.owner.team, entity)
+
+    def collide(self, fighters):
+        if not self.projectiles.count:
+            return
+
+        world = self.world
+        world.clear()
+        for fighter in fighters:
+            if fighter.alive:
+                world.add_hurtbox(fighter.hurt_box_world(), fighter, fighter.team)
+        self.add_to_broadphase(world)
+
+        for hit, hurt in world.pairs():
+            self.land_projectile(hit[7], hurt[6])
+
+    def land_projectile(self, entity, target):
+        """Narrowphase test of one projectile against ``target``; applies the hit."""
+        if entity.owner is None:
+            return False
+
+        image = entity.frames[entity.frame_index]
+        left = entity.x - image.get_width() // 2
+        top = entity.y - image.get_height() // 2
+        ox, oy = target._draw_origin(target.image)
+        hurt_mask = target.collision[target.flip].hurt_mask
+        point = hurt_mask.overlap(entity.masks[entity.frame_index], (left - ox, top - oy))
+        if point is None:
+            return False
+
+        self._apply_hit(entity, target, ox + point[0], oy + point[1])
+        # Spent: skipped by later pairs, released on the next advance().
+        entity.owner = None
+        return True
+
+    def _apply_hit(self, entity, target, x, y):
+        self.spawn_hit_spark(x, y)
+        if self.on_hit is not None:
+            self.on_hit(entity.owner, target, entity.damage)
+            return
+        if target.defending:
+            return
+        target.health -= entity.damage
+        target.hit = True
+        target.play_hit_sound()
+
+    def save_state(self, fighters):
+        """Live entities as plain values; owners are indices into ``fighters``."""
+        projectiles = []
+        pool = self.projectiles
+        for entity in pool.entities[:pool.count]:
+            spec_ref = None
+            for index, fighter in enumerate(fighters):
+                for move_key, spec in fighter.projectiles.items():
+                    for facing in (0, 1):
+                        if spec.frames[facing] is entity.frames:
+                            spec_ref = (index, move_key, facing)
+            owner = fighters.index(entity.owner) if entity.owner is not None else -1
+            projectiles.append((spec_ref, owner, entity.x, entity.y, entity.vx, entity.damage,
+                                entity.frame_index, entity.ticks, entity.ticks_left))
+        pool = self.effects
+        effects = [
+            (entity.x, entity.y, entity.frame_index, entity.ticks, entity.ticks_left)
+            for entity in pool.entities[:pool.count]
+        ]
+        return projectiles, effects
+
+    def load_state(self, state, fighters):
+        self.clear()
+        projectiles, effects = state
+        for spec_ref, owner, x, y, vx, damage, frame_index, ticks, ticks_left in projectiles:
+            index, move_key, facing = spec_ref
+            spec = fighters[index].projectiles[move_key]
+            entity = self.projectiles.acquire()
+            entity.owner = fighters[owner] if owner >= 0 else None
+            entity.frames = spec.frames[facing]
+            entity.masks = spec.hit_masks[facing]
+            entity.x, entity.y, entity.vx, entity.damage = x, y, vx, damage
+            entity.frame_index, entity.ticks, entity.ticks_left = frame_index, ticks, ticks_left
+            entity.loop = True
+            entity.hits = True
+        for x, y, frame_index, ticks, ticks_left in effects:
+            entity = self.spawn_hit_spark(x, y)
+            entity.frame_index, entity.ticks, entity.ticks_left = frame_index, ticks, ticks_left
+
+    def draw_rects(self, alpha=1.0):
+        return [
+            pygame.Rect(position, image.get_size())
+            for pool in (self.projectiles, self.effects)
+            for image, position in pool.blit_sequence(alpha)
+        ]
+
+    def draw(self, surface, alpha=1.0):
+        surface.blits(self.projectiles.blit_sequence(alpha), doreturn=False)
+        surface.blits(self.effects.blit_sequence(alpha), doreturn=False)
@@ -1,18 +1,94 @@
 import pygame
 
 from characters.characters import CHARACTERS
-from core.assets import audio_path
-from fighters.animation_loader import load_animation, load_animation_region
+from core.assets import image_path, load_sound
+from core.input import (
+    ATTACK1,
+    ATTACK2,
+    COMBO_WINDOW_FRAMES,
+    DOWN,
+    LEFT,
+    QUARTER_CIRCLE_BACK,
+    QUARTER_CIRCLE_FORWARD,
+    RIGHT,
+    SPECIAL1,
+    SPECIAL2,
+    UP,
+    InputHistory,
+)
+from fighters.animation_loader import (
+    build_frame_collision,
+    frame_half_width,
+    index_animations,
+    load_animation,
+    load_animation_region,
+)
+from fighters.animation_store import ANIMATIONS, CharacterSprites
+from fighters.atlas import ATLAS_CACHE_DIR, Atlas, atlas_key
+from fighters.entities import load_projectile_spec
+from fighters.frame_data import (
+    ANIMATION_FRAME_MS,
+    HIT_RECOVERY_COOLDOWN,
+    compile_frame_data,
+)
+
+# Checked in order; the first match wins.
+BUTTON_ATTACKS = (
+    (SPECIAL1, "special1"),
+    (SPECIAL2, "special2"),
+    (ATTACK1, "attack1"),
+    (ATTACK2, "attack2"),
+)
+MOTION_ATTACKS = (
+    (QUARTER_CIRCLE_FORWARD, ATTACK1 | ATTACK2, "special1"),
+    (QUARTER_CIRCLE_BACK, ATTACK1 | ATTACK2, "special2"),
+)
+
+
+# Volume of the character's attack sound (chosen by the game frame) and of punch/hit sounds.
+ATTACK_SOUND_VOLUME = 0.2
+HIT_SOUND_VOLUME = 0.3
 
 
 class Fighter:
-    def __init__(self, player, x, y, flip, character_name, sound):
+    def __init__(self, player, x, y, flip, character_name, sound, clock=None, palette=0):
         self.player = player
-        self.flip = flip
+        # Milliseconds for animation timing; game frames pass a frame-based clock.
+        self.clock = clock or pygame.time.get_ticks
+        # Fighters on the same team never hit each other.
+        self.team = player
         self.attack_sound = sound
         self.punch_sound = self._load_sound("Punch.wav", fallback=sound)
         self.hit_sound = self._load_sound("Hit.wav")
 
+        self._set_character(character_name)
+
+        # Frames, collision data and projectiles are shared by every fighter of this character;
+        # ``palette`` picks an alternate colouring (e.g. player 2 in a mirror match).
+        sprites = ANIMATIONS.get(character_name, self._load_sprites)
+        self.palette = palette % len(sprites.palettes)
+        self.animation_list = sprites.animations(self.palette)
+        self.collision_list = sprites.collision
+        self.frame_data, self.action_frame_data = compile_frame_data(
+            self.animation_list,
+            self.collision_list,
+            self.character_data.get("frame_data"),
+        )
+        self.projectiles = sprites.projectiles
+        # Set by the game frame to spawn projectiles and hit effects.
+        self.entities = None
+
+        self.foot_offset = self.character_data.get("foot_offset", 0)
+        self.offset = self.character_data.get("offset", [0, 0])
+
+        self.rect = pygame.Rect(0, 0, 80, 180)
+        self.combo_window_frames = COMBO_WINDOW_FRAMES
+        self.combo_bonus_damage = 6
+        self.input_history = InputHistory()
+
+        self.reset(x, y, flip)
+
+    def _set_character(self, character_name):
         if character_name not in CHARACTERS:
             raise ValueError(f"Character '{character_name}' not found")
 
@@ -23,19 +99,31 @@ class Fighter:
         self.moves = self.character_data.get("moves", {})
         self.action_moves = self.character_data.get("action_moves", {})
 
-        self.animation_list = self.load_character_animations()
+    @classmethod
+    def preload(cls, character_name):
+        """Load a character's shared sprites and sounds ahead of a match (prefetching)."""
+        # Only the loading methods are used, so no fighter state is set up.
+        loader = cls.__new__(cls)
+        loader._set_character(character_name)
+        ANIMATIONS.get(character_name, loader._load_sprites)
+        for filename in ("Punch.wav", "Hit.wav"):
+            loader._load_sound(filename)
+        load_sound(loader.character_data.get("attack_sound", "sword.wav"), ATTACK_SOUND_VOLUME)
+
+    def reset(self, x, y, flip):
+        """Restore round-start gameplay state, keeping loaded assets."""
+        self.flip = flip
 
         # 0 idle, 1 run, 2 jump, 3 atk1, 4 atk2, 5 hit, 6 death, 7 crouch, 8 sp1, 9 sp2
         self.action = 0
         self.frame_index = 0
         self.image = self.animation_list[self.action][self.frame_index]
-        self.update_time = pygame.time.get_ticks()
-
-        self.foot_offset = self.character_data.get("foot_offset", 0)
-        self.offset = self.character_data.get("offset", [0, 0])
+        self.collision = self.collision_list[self.action][self.frame_index]
+        self.update_time = self.clock()
 
-        self.rect = pygame.Rect(0, 0, 80, 180)
+        self.rect.size = (80, 180)
         self.rect.midbottom = (x, y)
+        self.remember_position()
 
         self.vel_y = 0
         self.running = False
@@ -51,10 +139,14 @@ class Fighter:
         self.alive = True
 
         self.attack_move_key = None
+        self.attack_move = None
+        self.attack_target = None
+        self.attack_damage = 0
+        self.attack_apply_damage = True
+        self.attack_landed = False
         self.combo_step = 0
-        self.last_attack_time_ms = 0
-        self.combo_window_ms = 550
-        self.combo_bonus_damage = 6
+        self.last_attack_frame = -COMBO_WINDOW_FRAMES - 1
+        self.input_history.reset()
 
     def load_character_animations(self):
         animations = self.character_data["animations"]
@@ -84,11 +176,60 @@ class Fighter:
 
         return animation_list
 
+    def _load_sprites(self):
+        # Cutting and indexing the sheets is the slow part; the packed result is cached on disk.
+        path = ATLAS_CACHE_DIR / self.character_name
+        key = atlas_key(image_path(self.character_data["path"]), self.character_data["animations"],
+                        self.moves, self.action_moves, self.scale)
+        cached = Atlas.load(path, key)
+        if cached is not None:
+            atlas, info = cached
+            palettes = [palette and [tuple(color) for color in palette]
+                        for palette in info["palettes"]]
+        else:
+            animation_list, palettes = index_animations(
+                self.load_character_animations(), self.character_data["path"])
+            atlas = Atlas.pack(animation_list)
+            atlas.save(path, key, palettes=palettes)
+        return CharacterSprites(atlas, self.load_collision_data(atlas.animations), palettes,
+                                self.load_projectiles())
+
+    def load_collision_data(self, animation_list):
+        # Attacks only hit with the part of the sprite reaching past the idle body.
+        reach_start = max(frame_half_width(frame)
+                          for frame in animation_list[0])
+        attack_actions = {3, 4, 8, 9}
+        collision_list = []
+
+        for action_index, frames in enumerate(animation_list):
+            if action_index not in attack_actions:
+                collision_list.append(
+                    [build_frame_collision(frame) for frame in frames])
+                continue
+
+            collisions = [build_frame_collision(frame, reach_start)
+                          for frame in frames]
+            if not any(c[0].hit_mask is not None for c in collisions):
+                # Move never leaves the idle silhouette: use its forward half.
+                collisions = [build_frame_collision(frame, 0)
+                              for frame in frames]
+            collision_list.append(collisions)
+
+        return collision_list
+
+    def load_projectiles(self):
+        projectiles = {}
+        for move_key, spec in self.character_data.get("projectiles", {}).items():
+            try:
+                projectiles[move_key] = load_projectile_spec(
+                    self.character_data["path"], spec, self.scale)
+            except Exception as e:
+                print(f"Error loading projectile {spec.get('sheet')}: {e}")
+        return projectiles
+
     def _load_sound(self, filename, fallback=None):
         try:
-            snd = pygame.mixer.Sound(audio_path(filename))
-            snd.set_volume(0.3)
-            return snd
+            return load_sound(filename, HIT_SOUND_VOLUME)
         except Exception:
             return fallback
 
@@ -139,7 +280,7 @@ class Fighter:
             fallback.fill((255, 0, 255))
             return [fallback]
 
-    def move(self, screen_width, screen_height, surface, target, round_over, apply_damage=True, controls=None):
+    def move(self, screen_width, screen_height, surface, target, round_over, apply_damage=True, inputs=0):
         speed = 10
         gravity = 2
         dx = 0
@@ -151,102 +292,30 @@ class Fighter:
         self.defending = False
         self.attack_type = 0
 
-        key = pygame.key.get_pressed()
+        self.input_history.push(inputs)
 
         if not self.attacking and self.alive and not round_over:
-            if controls is not None:
-                crouch_pressed = bool(controls.get("crouch", False))
-                if controls.get("left"):
-                    moving_left_input = True
-                    dx = -speed
-                    self.running = True
-                if controls.get("right"):
-                    moving_right_input = True
-                    dx = speed
-                    self.running = True
-                if controls.get("jump") and not self.jump and not crouch_pressed:
-                    self.vel_y = -30
-                    self.jump = True
-
-                if crouch_pressed and not self.jump:
-                    self.crouching = True
-                    self.running = False
-                    dx = 0
-
-                if controls.get("special1"):
-                    self._perform_attack(target, "special1", 14, apply_damage)
-                elif controls.get("special2"):
-                    self._perform_attack(target, "special2", 16, apply_damage)
-                elif controls.get("attack1"):
-                    self._perform_attack(target, "attack1", 10, apply_damage)
-                elif controls.get("attack2"):
-                    self._perform_attack(target, "attack2", 12, apply_damage)
-            else:
-                if self.player == 1:
-                    crouch_pressed = key[pygame.K_s]
-
-                    if key[pygame.K_a]:
-                        moving_left_input = True
-                        dx = -speed
-                        self.running = True
-                    if key[pygame.K_d]:
-                        moving_right_input = True
-                        dx = speed
-                        self.running = True
-                    if key[pygame.K_w] and not self.jump and not crouch_pressed:
-                        self.vel_y = -30
-                        self.jump = True
-
-                    if crouch_pressed and not self.jump:
-                        self.crouching = True
-                        self.running = False
-                        dx = 0
-
-                    if key[pygame.K_y]:
-                        self._perform_attack(
-                            target, "special1", 14, apply_damage)
-                    elif key[pygame.K_u]:
-                        self._perform_attack(
-                            target, "special2", 16, apply_damage)
-                    elif key[pygame.K_r]:
-                        self._perform_attack(
-                            target, "attack1", 10, apply_damage)
-                    elif key[pygame.K_t]:
-                        self._perform_attack(
-                            target, "attack2", 12, apply_damage)
-
-                if self.player == 2:
-                    crouch_pressed = key[pygame.K_DOWN]
-
-                    if key[pygame.K_LEFT]:
-                        moving_left_input = True
-                        dx = -speed
-                        self.running = True
-                    if key[pygame.K_RIGHT]:
-                        moving_right_input = True
-                        dx = speed
-                        self.running = True
-                    if key[pygame.K_UP] and not self.jump and not crouch_pressed:
-                        self.vel_y = -30
-                        self.jump = True
-
-                    if crouch_pressed and not self.jump:
-                        self.crouching = True
-                        self.running = False
-                        dx = 0
-
-                    if key[pygame.K_KP4]:
-                        self._perform_attack(
-                            target, "special1", 14, apply_damage)
-                    elif key[pygame.K_KP5]:
-                        self._perform_attack(
-                            target, "special2", 16, apply_damage)
-                    elif key[pygame.K_KP1]:
-                        self._perform_attack(
-                            target, "attack1", 10, apply_damage)
-                    elif key[pygame.K_KP2]:
-                        self._perform_attack(
-                            target, "attack2", 12, apply_damage)
+            crouch_pressed = bool(inputs & DOWN)
+            if inputs & LEFT:
+                moving_left_input = True
+                dx = -speed
+                self.running = True
+            if inputs & RIGHT:
+                moving_right_input = True
+                dx = speed
+                self.running = True
+            if inputs & UP and not self.jump and not crouch_pressed:
+                self.vel_y = -30
+                self.jump = True
+
+            if crouch_pressed and not self.jump:
+                self.crouching = True
+                self.running = False
+                dx = 0
+
+            move_key = self._attack_from_inputs(inputs)
+            if move_key:
+                self._perform_attack(target, move_key, apply_damage)
 
         self.vel_y += gravity
         dy += self.vel_y
@@ -271,52 +340,78 @@ class Fighter:
         self.rect.x += dx
         self.rect.y += dy
 
-    def _perform_attack(self, target, move_key, base_damage, apply_damage=True):
+    def _attack_from_inputs(self, inputs):
+        history = self.input_history
+        for motion, buttons, move_key in MOTION_ATTACKS:
+            if history.pressed(buttons) and history.motion(motion, self.flip):
+                return move_key
+        for button, move_key in BUTTON_ATTACKS:
+            if inputs & button:
+                return move_key
+        return None
+
+    def _perform_attack(self, target, move_key, apply_damage=True):
         if self.attack_cd != 0:
             return
 
+        move = self.frame_data[move_key]
         self.attacking = True
         self.attack_move_key = move_key
+        self.attack_move = move
+        self.attack_type = move.attack_type
+        self.attack_target = target
+        self.attack_apply_damage = apply_damage
+        self.attack_landed = False
         if self.punch_sound:
             self.punch_sound.play()
         elif self.attack_sound:
             self.attack_sound.play()
 
-        if move_key == "attack1":
-            self.attack_type = 1
-        elif move_key == "attack2":
-            self.attack_type = 2
-        elif move_key == "special1":
-            self.attack_type = 3
-        elif move_key == "special2":
-            self.attack_type = 4
-        else:
-            self.attack_type = 1
-
-        now = pygame.time.get_ticks()
-        if move_key in ("attack1", "attack2") and (now - self.last_attack_time_ms) <= self.combo_window_ms:
+        frame = self.input_history.frame
+        if move_key in ("attack1", "attack2") and (frame - self.last_attack_frame) <= self.combo_window_frames:
             self.combo_step += 1
         else:
             self.combo_step = 1
-        self.last_attack_time_ms = now
+        self.last_attack_frame = frame
 
-        damage = base_damage
+        damage = move.damage
         if self.combo_step >= 2 and move_key in ("attack1", "attack2"):
             damage += self.combo_bonus_damage
-
-        attack_range = self.character_data.get("attack_range", 2.0)
-        attacking_rect = pygame.Rect(
-            self.rect.centerx - (attack_range * self.rect.width * self.flip),
-            self.rect.y,
-            attack_range * self.rect.width,
-            self.rect.height,
+        self.attack_damage = damage
+
+    def attack_active(self):
+        move = self.attack_move
+        return (
+            self.attacking
+            and move is not None
+            and self.action == move.action
+            and self.frame_index < move.total
+            and move.active_frames[self.frame_index]
         )
-        if apply_damage and attacking_rect.colliderect(target.rect):
-            if target.defending:
-                return
-            target.health -= damage
-            target.hit = True
-            target.play_hit_sound()
+
+    def _resolve_attack(self):
+        projectile = self.projectiles.get(self.attack_move_key)
+        if projectile is not None and self.entities is not None:
+            self.attack_landed = True
+            self._spawn_projectile(projectile)
+            return
+
+        target = self.attack_target
+        if target is None or not self.attack_apply_damage:
+            return
+        point = self.attack_hit_point(target)
+        if point is not None:
+            self.land_hit(target, point)
+
+    def land_hit(self, target, point):
+        self.attack_landed = True
+        if self.entities is not None:
+            self.entities.spawn_hit_spark(*point)
+        if target.defending:
+            return
+        target.health -= self.attack_damage
+        target.hit = True
+        target.play_hit_sound()
 
     def update(self):
         if self.health <= 0:
@@ -326,14 +421,8 @@ class Fighter:
         elif self.hit:
             self.update_action(5)
         elif self.attacking:
-            if self.attack_type == 1:
-                self.update_action(3)
-            elif self.attack_type == 2:
-                self.update_action(4)
-            elif self.attack_type == 3:
-                self.update_action(8)
-            elif self.attack_type == 4:
-                self.update_action(9)
+            if self.attack_move is not None:
+                self.update_action(self.attack_move.action)
         elif self.jump:
             self.update_action(2)
         elif self.crouching:
@@ -343,43 +432,173 @@ class Fighter:
         else:
             self.update_action(0)
 
-        animation_cd = 50
+        animation_cd = ANIMATION_FRAME_MS
         self.image = self.animation_list[self.action][self.frame_index]
-        if pygame.time.get_ticks() - self.update_time > animation_cd:
+        self.collision = self.collision_list[self.action][self.frame_index]
+        if not self.attack_landed and self.attack_active():
+            self._resolve_attack()
+
+        if self.clock() - self.update_time > animation_cd:
             self.frame_index += 1
-            self.update_time = pygame.time.get_ticks()
+            self.update_time = self.clock()
 
         if self.frame_index >= len(self.animation_list[self.action]):
             if not self.alive:
                 self.frame_index = len(self.animation_list[self.action]) - 1
             else:
                 self.frame_index = 0
-                if self.action in (3, 4, 8, 9):
+                move = self.action_frame_data[self.action]
+                if move is not None:
                     self.attacking = False
-                    self.attack_cd = 28 if self.action in (8, 9) else 20
+                    self.attack_move = None
+                    self.attack_cd = move.cooldown
                 if self.action == 5:
                     self.hit = False
                     self.attacking = False
-                    self.attack_cd = 20
+                    self.attack_move = None
+                    self.attack_cd = HIT_RECOVERY_COOLDOWN
+
+    def save_state(self):
+        """Gameplay state as plain values (for replay keyframes)."""
+        history = self.input_history
+        return (
+            self.flip, self.action, self.frame_index, self.update_time,
+            tuple(self.rect), self.vel_y, self.running, self.jump,
+            self.crouching, self.defending, self.attack_type, self.attacking,
+            self.attack_cd, self.hit, self.health, self.alive,
+            self.attack_move_key, self.attack_move is not None,
+            self.attack_target is not None, self.attack_damage,
+            self.attack_apply_damage, self.attack_landed, self.combo_step,
+            self.last_attack_frame,
+            (list(history.buffer), history.frame,
+             tuple(history.last_press), tuple(history.last_direction)),
+            self._image_key(),
+        )
+
+    def _image_key(self):
+        # The shown frame lags frame_index by one update, so it is stored too.
+        for action, frames in enumerate(self.animation_list):
+            for frame_index, image in enumerate(frames):
+                if image is self.image:
+                    return action, frame_index
+        return self.action, min(self.frame_index, len(self.animation_list[self.action]) - 1)
+
+    def load_state(self, state, target):
+        (
+            self.flip, self.action, self.frame_index, self.update_time,
+            rect, self.vel_y, self.running, self.jump,
+            self.crouching, self.defending, self.attack_type, self.attacking,
+            self.attack_cd, self.hit, self.health, self.alive,
+            self.attack_move_key, has_move,
+            has_target, self.attack_damage,
+            self.attack_apply_damage, self.attack_landed, self.combo_step,
+            self.last_attack_frame,
+            history,
+            (image_action, image_index),
+        ) = state
+        self.rect.update(rect)
+        self.remember_position()
+        self.attack_move = self.frame_data[self.attack_move_key] if has_move else None
+        self.attack_target = target if has_target else None
+
+        buffer, frame, last_press, last_direction = history
+        self.input_history.buffer[:] = buffer
+        self.input_history.frame = frame
+        self.input_history.last_press[:] = last_press
+        self.input_history.last_direction[:] = last_direction
+
+        self.image = self.animation_list[image_action][image_index]
+        self.collision = self.collision_list[image_action][image_index]
 
     def attack(self, target, apply_damage=True):
         # Backward compatibility path if other callers still invoke attack().
-        self._perform_attack(target, "attack1", 10, apply_damage)
+        self._perform_attack(target, "attack1", apply_damage)
 
     def update_action(self, new_action):
         if new_action != self.action:
             self.action = new_action
             self.frame_index = 0
-            self.update_time = pygame.time.get_ticks()
+            self.update_time = self.clock()
 
-    def draw_fighter(self, surface):
-        img = pygame.transform.flip(self.image, self.flip, False)
+    def _spawn_projectile(self, projectile):
+        hitbox = self.attack_move.hitbox
+        if hitbox is None:
+            x, y = self.rect.centerx, self.rect.centery
+        else:
+            reach = hitbox.right
+            x = self.rect.centerx - reach if self.flip else self.rect.centerx + reach
+            y = self.rect.bottom + hitbox.centery
+        self.entities.spawn_projectile(self, projectile, x, y, self.attack_damage)
+
+    def attack_hits(self, target, action=None, frame_index=None):
+        return self.attack_hit_point(target, action, frame_index) is not None
+
+    def attack_hit_point(self, target, action=None, frame_index=None):
+        """World position where the current attack frame overlaps ``target``."""
+        if action is None:
+            action, frame_index = self.action, self.frame_index
+        frames = self.animation_list[action]
+        frame_index = min(frame_index, len(frames) - 1)
+
+        attack = self.collision_list[action][frame_index][self.flip]
+        if attack.hit_mask is None:
+            return None
+
+        ax, ay = self._draw_origin(frames[frame_index])
+        tx, ty = target._draw_origin(target.image)
+        hurt = target.collision[target.flip]
+        if not attack.hit_box.move(ax, ay).colliderect(hurt.hurt_box.move(tx, ty)):
+            return None
+        point = hurt.hurt_mask.overlap(attack.hit_mask, (ax - tx, ay - ty))
+        if point is None:
+            return None
+        return tx + point[0], ty + point[1]
+
+    def hurt_box_world(self):
+        ox, oy = self._draw_origin(self.image)
+        return self.collision[self.flip].hurt_box.move(ox, oy)
+
+    def hit_box_world(self):
+        """World hit box of the current frame, or None outside active frames."""
+        if not self.attack_active() or self.attack_move_key in self.projectiles:
+            return None
+        hit_box = self.collision_list[self.action][self.frame_index][self.flip].hit_box
+        if hit_box is None:
+            return None
+        ox, oy = self._draw_origin(self.animation_list[self.action][self.frame_index])
+        return hit_box.move(ox, oy)
+
+    def _draw_origin(self, image):
         foot_offset_scaled = self.foot_offset * self.scale
-        draw_y = self.rect.bottom - img.get_height() + foot_offset_scaled
-        draw_x = self.rect.centerx - (img.get_width() // 2)
-        draw_x += self.offset[0]
-        draw_y += self.offset[1]
-        surface.blit(img, (draw_x, draw_y))
+        draw_y = self.rect.bottom - image.get_height() + foot_offset_scaled
+        draw_x = self.rect.centerx - (image.get_width() // 2)
+        return draw_x + self.offset[0], draw_y + self.offset[1]
+
+    def remember_position(self):
+        """Mark the start of a simulation tick for render interpolation."""
+        self.previous_position = self.rect.topleft
+
+    def _render_origin(self, image, alpha):
+        # Draw between the last two ticks: alpha 0 is the previous position.
+        x, y = self._draw_origin(image)
+        if alpha < 1:
+            px, py = self.previous_position
+            x += round((px - self.rect.x) * (1 - alpha))
+            y += round((py - self.rect.y) * (1 - alpha))
+        return x, y
+
+    def draw_rect(self, alpha=1.0):
+        """Screen area draw_fighter() covers."""
+        return pygame.Rect(self._render_origin(self.image, alpha), self.image.get_size())
+
+    def draw_fighter(self, surface, alpha=1.0):
+        blit_flipped = getattr(surface, "blit_flipped", None)
+        if blit_flipped is not None:
+            # Texture canvases flip at draw time.
+            blit_flipped(self.image, self._render_origin(self.image, alpha), self.flip)
+            return
+        img = pygame.transform.flip(self.image, self.flip, False)
+        surface.blit(img, self._render_origin(img, alpha))
 
     def play_hit_sound(self):
         if self.hit_sound:
@@ -0,0 +1,160 @@
+import pygame
+
+from core.config import FPS
+
+# Each animation frame is shown for this long (see Fighter.update).
+ANIMATION_FRAME_MS = 50
+TICKS_PER_ANIMATION_FRAME = max(1, round(ANIMATION_FRAME_MS * FPS / 1000))
+
+# Cooldown (in game ticks) after getting hit, before the fighter can attack.
+HIT_RECOVERY_COOLDOWN = 20
+
+# Defaults shared by every character; "frame_data" in CHARACTERS overrides them.
+MOVE_DEFAULTS = {
+    "attack1": {"action": 3, "attack_type": 1, "damage": 10, "cooldown": 20},
+    "attack2": {"action": 4, "attack_type": 2, "damage": 12, "cooldown": 20},
+    "special1": {"action": 8, "attack_type": 3, "damage": 14, "cooldown": 28},
+    "special2": {"action": 9, "attack_type": 4, "damage": 16, "cooldown": 28},
+}
+
+
+class MoveFrameData:
+    """Startup/active/recovery frames of one move, in animation frames."""
+
+    __slots__ = (
+        "move_key",
+        "action",
+        "attack_type",
+        "startup",
+        "active",
+        "recovery",
+        "damage",
+        "cooldown",
+        "hitbox",
+        "active_frames",
+    )
+
+    def __init__(self, move_key, action, attack_type, startup, active, recovery, damage, cooldown, hitbox):
+        self.move_key = move_key
+        self.action = action
+        self.attack_type = attack_type
+        self.startup = startup
+        self.active = active
+        self.recovery = recovery
+        self.damage = damage
+        self.cooldown = cooldown
+        self.hitbox = hitbox
+        # Per-frame flags so the combat loop can check a frame with one index.
+        self.active_frames = tuple(
+            startup <= i < startup + active for i in range(self.total))
+
+    @property
+    def total(self):
+        return self.startup + self.active + self.recovery
+
+    def to_dict(self):
+        return {
+            "move": self.move_key,
+            "startup": self.startup,
+            "active": self.active,
+            "recovery": self.recovery,
+            "damage": self.damage,
+            "cooldown": self.cooldown,
+            "hitbox": tuple(self.hitbox) if self.hitbox else None,
+        }
+
+
+def _hitbox_from_frames(frames, collisions, indices):
+    # Hitbox relative to the fighter's midbottom, facing right.
+    boxes = []
+    for i in indices:
+        hit_box = collisions[i][0].hit_box
+        if hit_box is None:
+            continue
+        width, height = frames[i].get_size()
+        boxes.append(hit_box.move(-(width // 2), -height))
+    if not boxes:
+        return None
+    return boxes[0].unionall(boxes[1:])
+
+
+def compile_move(move_key, frames, collisions, override=None):
+    defaults = MOVE_DEFAULTS[move_key]
+    override = override or {}
+    frame_total = len(frames)
+
+    hit_frames = [i for i, c in enumerate(collisions) if c[0].hit_mask is not None]
+    if hit_frames:
+        startup = hit_frames[0]
+        active = hit_frames[-1] - hit_frames[0] + 1
+    else:
+        startup = frame_total // 2
+        active = 1
+
+    startup = max(0, min(int(override.get("startup", startup)), frame_total - 1))
+    active = max(1, min(int(override.get("active", active)), frame_total - startup))
+    recovery = frame_total - startup - active
+
+    hitbox = override.get("hitbox")
+    if hitbox is not None:
+        hitbox = pygame.Rect(hitbox)
+    else:
+        hitbox = _hitbox_from_frames(
+            frames, collisions, range(startup, startup + active))
+
+    return MoveFrameData(
+        move_key,
+        defaults["action"],
+        defaults["attack_type"],
+        startup,
+        active,
+        recovery,
+        int(override.get("damage", defaults["damage"])),
+        int(override.get("cooldown", defaults["cooldown"])),
+        hitbox,
+    )
+
+
+def compile_frame_data(animation_list, collision_list, overrides=None):
+    """Build the frame-data table for a character from its loaded animations.
+
+    Returns ``(by_move, by_action)``: a dict keyed by move key and a list
+    indexed by action id (``None`` for non-attack actions).
+    """
+    overrides = overrides or {}
+    by_move = {}
+    by_action = [None] * len(animation_list)
+
+    for move_key, defaults in MOVE_DEFAULTS.items():
+        action = defaults["action"]
+        move = compile_move(
+            move_key,
+            animation_list[action],
+            collision_list[action],
+            overrides.get(move_key),
+        )
+        by_move[move_key] = move
+        by_action[action] = move
+
+    return by_move, by_action
+
+
+def advantage_table(frame_data, hitstun_frames):
+    """Frame advantage in game ticks of each move, on hit and on block.
+
+    ``hitstun_frames`` is the length of the defender's hit animation. A move
+    is measured from its first active frame until both sides can attack again.
+    """
+    table = {}
+    hitstun = hitstun_frames * TICKS_PER_ANIMATION_FRAME + HIT_RECOVERY_COOLDOWN
+
+    for move_key, move in frame_data.items():
+        attacker_busy = (
+            (move.active + move.recovery) * TICKS_PER_ANIMATION_FRAME + move.cooldown
+        )
+        table[move_key] = {
+            "on_hit": hitstun - attacker_busy,
+            "on_block": -attacker_busy,
+        }
+
+    return table
@@ -0,0 +1,114 @@
+import time
+
+from core.input import ATTACK1, ATTACK2, DOWN, LEFT, RIGHT, SPECIAL1, SPECIAL2, UP, bits_to_controls
+from fighters.simulation import MatchSimulation, SimProfile
+
+# Inputs the planner considers; each is held for HOLD_FRAMES, then released.
+CANDIDATES = (0, LEFT, RIGHT, UP, DOWN, ATTACK1, ATTACK2, SPECIAL1, SPECIAL2,
+              UP | LEFT, UP | RIGHT)
+HOLD_FRAMES = 8
+HORIZON_FRAMES = 36
+BUDGET_MS = 3.0
+CACHE_SIZE = 8192
+
+
+class LookaheadPlanner:
+    """Pick AI inputs by simulating the match a few dozen frames ahead.
+
+    Each candidate input is rolled out on a cloned MatchSimulation with the
+    opponent assumed to keep its current input. Plans of two inputs are
+    tried for the best candidates while time is left. The search stops at
+    ``budget_ms`` and returns the best plan found so far; rollout scores are
+    cached on the quantized start state so repeated positions are free.
+    """
+
+    def __init__(self, width, height, horizon=HORIZON_FRAMES, budget_ms=BUDGET_MS,
+                 cache_size=CACHE_SIZE, refine=3):
+        self.width = width
+        self.height = height
+        self.horizon = horizon
+        self.budget = budget_ms / 1000
+        self.cache_size = cache_size
+        self.refine = refine
+        self.profiles = {}
+        self.cache = {}
+        self.last_best = 0
+        self.rollouts = 0
+        # Running estimate of one rollout's cost, to stop before the deadline.
+        self.rollout_time = 0.0
+
+    def _profile(self, fighter):
+        profile = self.profiles.get(fighter.character_name)
+        if profile is None:
+            profile = self.profiles[fighter.character_name] = SimProfile(fighter)
+        return profile
+
+    def decide(self, ai_fighter, target_fighter, rng):
+        deadline = time.perf_counter() + self.budget
+        base = MatchSimulation.from_fighters(
+            ai_fighter,
+            target_fighter,
+            (self._profile(ai_fighter), self._profile(target_fighter)),
+            self.width,
+            self.height,
+        )
+        opponent = target_fighter.input_history.current
+        base_key = (base.key(), opponent)
+
+        # Previous best first, so a short budget still gets a sensible answer.
+        order = sorted(CANDIDATES, key=lambda bits: bits != self.last_best)
+        scored = []
+        for bits in order:
+            if scored and time.perf_counter() + self.rollout_time > deadline:
+                break
+            # Random jitter breaks ties between equally scored inputs.
+            score = self._score(base, base_key, (bits,), opponent) + rng.random() * 0.01
+            scored.append((score, bits))
+        scored.sort(reverse=True)
+        best_score, best = scored[0]
+
+        for _, first in scored[:self.refine]:
+            for second in CANDIDATES:
+                if time.perf_counter() + self.rollout_time > deadline:
+                    break
+                score = self._score(base, base_key, (first, second), opponent)
+                if score > best_score:
+                    best_score, best = score, first
+
+        self.last_best = best
+        return bits_to_controls(best)
+
+    def _score(self, base, base_key, plan, opponent):
+        key = (base_key, plan)
+        score = self.cache.get(key)
+        if score is not None:
+            return score
+
+        start = time.perf_counter()
+        sim = base.clone()
+        last = len(plan) - 1
+        for i in range(self.horizon):
+            step = i // HOLD_FRAMES
+            sim.step((plan[step] if step <= last else 0, opponent))
+        self.rollouts += 1
+        self.rollout_time = self.rollout_time * 0.9 + (time.perf_counter() - start) * 0.1
+
+        score = _evaluate(base, sim)
+        if len(self.cache) >= self.cache_size:
+            self.cache.clear()
+        self.cache[key] = score
+        return score
+
+
+def _evaluate(start, end):
+    me, them = end.fighters
+    me_start, them_start = start.fighters
+    score = (me.health - me_start.health) - (them.health - them_start.health) * 1.2
+    if not them.alive:
+        score += 100
+    if not me.alive:
+        score -= 100
+    # Prefer ending near the edge of our own reach, facing the opponent.
+    reach = max((move.hitbox[2] for move in me.profile.moves.values() if move.hitbox), default=80)
+    score -= abs(abs(them.x - me.x) - reach) / 200
+    return score
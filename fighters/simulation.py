@@ -0,0 +1,379 @@
+from core.input import ATTACK1, ATTACK2, COMBO_WINDOW_FRAMES, DOWN, LEFT, RIGHT, SPECIAL1, SPECIAL2, UP
+from fighters.frame_data import HIT_RECOVERY_COOLDOWN, TICKS_PER_ANIMATION_FRAME
+
+SPEED = 10
+GRAVITY = 2
+JUMP_VELOCITY = -30
+HALF_WIDTH = 40
+
+# Actions whose animation frame decides what happens next.
+TIMED_ACTIONS = frozenset((3, 4, 5, 8, 9))
+
+BUTTON_MOVES = (
+    (SPECIAL1, "special1"),
+    (SPECIAL2, "special2"),
+    (ATTACK1, "attack1"),
+    (ATTACK2, "attack2"),
+)
+
+
+class SimMove:
+    __slots__ = ("action", "startup", "active", "damage", "cooldown", "hitbox",
+                 "projectile_speed", "projectile_size")
+
+    def __init__(self, move, projectile=None):
+        self.action = move.action
+        self.startup = move.startup
+        self.active = move.active
+        self.damage = move.damage
+        self.cooldown = move.cooldown
+        # (left, top, right, bottom) relative to midbottom, facing right.
+        self.hitbox = tuple(move.hitbox) if move.hitbox is not None else None
+        if self.hitbox is not None:
+            x, y, w, h = self.hitbox
+            self.hitbox = (x, y, x + w, y + h)
+        self.projectile_speed = projectile.speed if projectile else 0
+        self.projectile_size = projectile.frames[0][0].get_size() if projectile else (0, 0)
+
+
+class SimProfile:
+    """Static per-character data the simulation needs, taken from a Fighter."""
+
+    def __init__(self, fighter):
+        self.frame_counts = tuple(len(frames) for frames in fighter.animation_list)
+        self.moves = {
+            key: SimMove(move, fighter.projectiles.get(key))
+            for key, move in fighter.frame_data.items()
+        }
+        self.move_by_action = {move.action: move for move in self.moves.values()}
+        hurt_box = fighter.collision_list[0][0][0].hurt_box
+        self.hurt_half_width = max(1, hurt_box.width // 2)
+        self.hurt_height = hurt_box.height
+        self.attack_range = fighter.character_data.get("attack_range", 2.0)
+        self.combo_bonus_damage = fighter.combo_bonus_damage
+
+    def scale_reach(self, factor):
+        """Stretch every move's hitbox horizontally by ``factor``.
+
+        ``attack_range`` (when the AI thinks it is in range) is left alone,
+        so only what connects changes.
+        """
+        for move in self.moves.values():
+            if move.hitbox is not None:
+                left, top, right, bottom = move.hitbox
+                move.hitbox = (round(left * factor), top, round(right * factor), bottom)
+
+
+class SimFighter:
+    __slots__ = ("profile", "team", "x", "bottom", "vel_y", "jump", "flip",
+                 "action", "frame_index", "ticks", "attack_cd", "health",
+                 "alive", "hit", "attacking", "move", "landed", "defending",
+                 "running", "crouching", "damage", "combo_step",
+                 "last_attack_tick")
+
+    def __init__(self, profile, team=1):
+        self.profile = profile
+        self.team = team
+
+    def reset(self, x, bottom, flip):
+        """Round-start state, as Fighter.reset."""
+        self.x = x
+        self.bottom = bottom
+        self.vel_y = 0
+        self.jump = False
+        self.flip = flip
+        self.action = 0
+        self.frame_index = 0
+        self.ticks = 0
+        self.attack_cd = 0
+        self.health = 100
+        self.alive = True
+        self.hit = False
+        self.attacking = False
+        self.move = None
+        self.landed = False
+        self.defending = False
+        self.running = False
+        self.crouching = False
+        self.damage = 0
+        self.combo_step = 0
+        self.last_attack_tick = -COMBO_WINDOW_FRAMES - 1
+
+    @classmethod
+    def from_fighter(cls, fighter, profile):
+        sim = cls(profile, fighter.team)
+        sim.x = fighter.rect.centerx
+        sim.bottom = fighter.rect.bottom
+        sim.vel_y = fighter.vel_y
+        sim.jump = fighter.jump
+        sim.flip = fighter.flip
+        sim.action = fighter.action
+        sim.frame_index = fighter.frame_index
+        sim.ticks = 0
+        sim.attack_cd = fighter.attack_cd
+        sim.health = fighter.health
+        sim.alive = fighter.alive
+        sim.hit = fighter.hit
+        sim.attacking = fighter.attacking
+        sim.move = profile.moves.get(fighter.attack_move_key) if fighter.attacking else None
+        sim.landed = fighter.attack_landed
+        sim.defending = fighter.defending
+        sim.running = fighter.running
+        sim.crouching = fighter.crouching
+        sim.damage = fighter.attack_damage
+        sim.combo_step = fighter.combo_step
+        sim.last_attack_tick = fighter.last_attack_frame - fighter.input_history.frame
+        return sim
+
+    def copy(self):
+        other = SimFighter.__new__(SimFighter)
+        for name in SimFighter.__slots__:
+            setattr(other, name, getattr(self, name))
+        return other
+
+    def hurt_rect(self):
+        half = self.profile.hurt_half_width
+        return (self.x - half, self.bottom - self.profile.hurt_height, self.x + half, self.bottom)
+
+    def hit_rect(self):
+        move = self.move
+        if (
+            not self.attacking
+            or move is None
+            or self.landed
+            or move.hitbox is None
+            or self.action != move.action
+            or not move.startup <= self.frame_index < move.startup + move.active
+        ):
+            return None
+        left, top, right, bottom = move.hitbox
+        if self.flip:
+            left, right = -right, -left
+        return (self.x + left, self.bottom + top, self.x + right, self.bottom + bottom)
+
+
+class MatchSimulation:
+    """Headless, tick-based model of a two-fighter match.
+
+    It mirrors Fighter.move/update closely enough for the AI to look ahead:
+    the same movement, frame data, cooldowns and hit/block rules, but with
+    boxes instead of masks and a tick counter instead of the wall clock.
+    """
+
+    def __init__(self, fighters, width, height, tick=0):
+        self.fighters = fighters
+        self.width = width
+        self.ground = height - 110
+        self.tick = tick
+        # (x, y, vx, half_w, half_h, damage, team, ticks_left)
+        self.projectiles = []
+
+    @classmethod
+    def from_fighters(cls, fighter1, fighter2, profiles, width, height):
+        return cls(
+            [SimFighter.from_fighter(fighter1, profiles[0]),
+             SimFighter.from_fighter(fighter2, profiles[1])],
+            width,
+            height,
+        )
+
+    def clone(self):
+        other = MatchSimulation.__new__(MatchSimulation)
+        other.fighters = [fighter.copy() for fighter in self.fighters]
+        other.width = self.width
+        other.ground = self.ground
+        other.tick = self.tick
+        other.projectiles = list(self.projectiles)
+        return other
+
+    def key(self, quantum=16):
+        """Quantized state, used as a transposition-cache key.
+
+        Positions are kept as the gap between fighters plus how close each
+        one is to a wall, health only in coarse buckets, and the animation
+        frame only where it matters (attacks, hit stun), so nearby
+        situations share an entry.
+        """
+        first, second = self.fighters
+        parts = [len(self.projectiles), (second.x - first.x) // quantum]
+        for f in self.fighters:
+            parts.extend((
+                min(f.x, self.width - f.x) // (quantum * 8),
+                f.bottom // quantum, f.action,
+                f.frame_index if f.action in TIMED_ACTIONS else 0,
+                f.attack_cd // 8, f.attacking, f.hit, f.health // 20,
+            ))
+        return tuple(parts)
+
+    def step(self, inputs):
+        self.tick += 1
+        fighters = self.fighters
+        for fighter, bits, target in zip(fighters, inputs, reversed(fighters)):
+            self._move(fighter, bits, target)
+        for fighter in fighters:
+            self._update(fighter)
+        self._resolve_hits()
+
+    def _move(self, f, inputs, target):
+        dx = 0
+        left = right = False
+        f.running = False
+        f.crouching = False
+
+        if not f.attacking and f.alive:
+            crouch = bool(inputs & DOWN)
+            if inputs & LEFT:
+                left = True
+                dx = -SPEED
+                f.running = True
+            if inputs & RIGHT:
+                right = True
+                dx = SPEED
+                f.running = True
+            if inputs & UP and not f.jump and not crouch:
+                f.vel_y = JUMP_VELOCITY
+                f.jump = True
+            if crouch and not f.jump:
+                f.crouching = True
+                f.running = False
+                dx = 0
+            if f.attack_cd == 0:
+                for bit, move_key in BUTTON_MOVES:
+                    if inputs & bit:
+                        self._start_attack(f, move_key)
+                        break
+
+        f.vel_y += GRAVITY
+        dy = f.vel_y
+        if f.x - HALF_WIDTH + dx < 0:
+            dx = HALF_WIDTH - f.x
+        if f.x + HALF_WIDTH + dx > self.width:
+            dx = self.width - HALF_WIDTH - f.x
+        if f.bottom + dy > self.ground:
+            f.vel_y = 0
+            dy = self.ground - f.bottom
+            f.jump = False
+
+        f.flip = target.x <= f.x
+        f.defending = f.alive and ((f.flip and right) or (not f.flip and left))
+        if f.attack_cd > 0:
+            f.attack_cd -= 1
+        f.x += dx
+        f.bottom += dy
+
+    def _start_attack(self, f, move_key):
+        move = f.profile.moves[move_key]
+        f.attacking = True
+        f.move = move
+        f.landed = False
+        if move_key in ("attack1", "attack2") and self.tick - f.last_attack_tick <= COMBO_WINDOW_FRAMES:
+            f.combo_step += 1
+        else:
+            f.combo_step = 1
+        f.last_attack_tick = self.tick
+        f.damage = move.damage
+        if f.combo_step >= 2 and move_key in ("attack1", "attack2"):
+            f.damage += f.profile.combo_bonus_damage
+
+    def _set_action(self, f, action):
+        if action != f.action:
+            f.action = action
+            f.frame_index = 0
+            f.ticks = 0
+
+    def _update(self, f):
+        if f.health <= 0:
+            f.health = 0
+            f.alive = False
+            self._set_action(f, 6)
+        elif f.hit:
+            self._set_action(f, 5)
+        elif f.attacking:
+            if f.move is not None:
+                self._set_action(f, f.move.action)
+        elif f.jump:
+            self._set_action(f, 2)
+        elif f.crouching:
+            self._set_action(f, 7)
+        elif f.running:
+            self._set_action(f, 1)
+        else:
+            self._set_action(f, 0)
+
+        move = f.move
+        if (
+            f.attacking and move is not None and not f.landed
+            and move.projectile_speed and f.action == move.action
+            and f.frame_index == move.startup
+        ):
+            f.landed = True
+            self._spawn_projectile(f, move)
+
+        f.ticks += 1
+        if f.ticks >= TICKS_PER_ANIMATION_FRAME:
+            f.ticks = 0
+            f.frame_index += 1
+
+        count = f.profile.frame_counts[f.action]
+        if f.frame_index >= count:
+            if not f.alive:
+                f.frame_index = count - 1
+                return
+            f.frame_index = 0
+            action_move = f.profile.move_by_action.get(f.action)
+            if action_move is not None:
+                f.attacking = False
+                f.move = None
+                f.attack_cd = action_move.cooldown
+            if f.action == 5:
+                f.hit = False
+                f.attacking = False
+                f.move = None
+                f.attack_cd = HIT_RECOVERY_COOLDOWN
+
+    def _spawn_projectile(self, f, move):
+        reach = move.hitbox[2] if move.hitbox else 0
+        y = f.bottom + ((move.hitbox[1] + move.hitbox[3]) // 2 if move.hitbox else -90)
+        x = f.x - reach if f.flip else f.x + reach
+        w, h = move.projectile_size
+        vx = -move.projectile_speed if f.flip else move.projectile_speed
+        self.projectiles.append((x, y, vx, w // 2, h // 2, f.damage, f.team, 120))
+
+    def _resolve_hits(self):
+        fighters = self.fighters
+        for attacker, target in ((fighters[0], fighters[1]), (fighters[1], fighters[0])):
+            if not target.alive:
+                continue
+            box = attacker.hit_rect()
+            if box is not None and _overlap(box, target.hurt_rect()):
+                attacker.landed = True
+                _apply_damage(target, attacker.damage)
+
+        if not self.projectiles:
+            return
+        alive = []
+        for x, y, vx, hw, hh, damage, team, ticks_left in self.projectiles:
+            x += vx
+            ticks_left -= 1
+            spent = ticks_left <= 0 or x < -200 or x > self.width + 200
+            if not spent:
+                box = (x - hw, y - hh, x + hw, y + hh)
+                for target in fighters:
+                    if target.team != team and target.alive and _overlap(box, target.hurt_rect()):
+                        _apply_damage(target, damage)
+                        spent = True
+                        break
+            if not spent:
+                alive.append((x, y, vx, hw, hh, damage, team, ticks_left))
+        self.projectiles = alive
+
+
+def _overlap(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _apply_damage(target, damage):
+    if target.defending:
+        return
+    target.health -= damage
+    target.hit = True
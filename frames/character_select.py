@@ -1,13 +1,19 @@
+from functools import partial
+
 from characters.characters import CHARACTERS
 import pygame
 from core.assets import audio_path, font_path, image_path
+from core.prefetch import PREFETCHER
 from fighters.animation_loader import load_animation_region
+from fighters.fighter import Fighter
 
 
 class CharacterSelectFrame:
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, mode="versus", difficulty="normal"):
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.mode = mode
+        self.difficulty = difficulty
         self.anim_index = 0
         self.anim_timer = pygame.time.get_ticks()
         self.anim_speed = 100
@@ -27,6 +33,7 @@ class CharacterSelectFrame:
         self.option_font = pygame.font.Font(font_path(), 40)
         self.instructions_font = pygame.font.Font(font_path(), 25)
         self.move_sound, self.confirm_sound = self._load_ui_sounds()
+        self._prefetch()
 
     def _load_characters(self):
         characters = []
@@ -98,6 +105,23 @@ class CharacterSelectFrame:
 
         return characters
 
+    def reset(self, request):
+        """Reopen the screen as if new (the frame router keeps it between visits)."""
+        self.mode = request.get("mode", "versus")
+        self.difficulty = request.get("difficulty", "normal")
+        self.selected_option = 0
+        self.anim_index = 0
+        self.anim_timer = pygame.time.get_ticks()
+        self._prefetch()
+
+    @property
+    def nbytes(self):
+        return sum(
+            frame.get_height() * frame.get_pitch()
+            for character in self.characters
+            for frame in character["icon_frames"]
+        )
+
     def handle_events(self, events):
         for event in events:
             if event.type == pygame.KEYDOWN:
@@ -126,6 +150,8 @@ class CharacterSelectFrame:
                     return {
                         "next": "map_select",
                         "character": self.characters[self.selected_option]["name"],
+                        "mode": self.mode,
+                        "difficulty": self.difficulty,
                     }
                 if event.key == pygame.K_ESCAPE:
                     return {"next": "menu"}
@@ -180,13 +206,17 @@ class CharacterSelectFrame:
 
         if dx != 0:
             self.selected_option = (self.selected_option + dx) % total
-            return
-
-        if dy != 0:
+        elif dy != 0:
             target_row = row + dy
             target_index = target_row * cols + col
             if 0 <= target_index < total:
                 self.selected_option = target_index
+        self._prefetch()
+
+    def _prefetch(self):
+        # The highlighted fighter is the likely pick; load it while the player decides.
+        if self.characters:
+            PREFETCHER.want(partial(Fighter.preload, self.characters[self.selected_option]["name"]))
 
     def _draw_character_cards(self, screen):
         cols = self._grid_cols()
@@ -1,25 +1,46 @@
 import random
 import pygame
 from characters.characters import CHARACTERS
-from fighters.fighter import Fighter
-from core.assets import audio_path, font_path, image_path
+from fighters.ai import AIController
+from fighters.ai_policy import load_policy
+from fighters.entities import EntitySystem
+from fighters.lookahead import LookaheadPlanner
+from fighters.fighter import ATTACK_SOUND_VOLUME, Fighter
+from core.assets import audio_path, font_path, image_path, load_sound
 from core.animated_background import AnimatedBackground
+from core.camera import Camera
+from core.hud import HUD
+from core.input import controls_to_bits, sample_players
+from core.config import CAMERA_ZOOM, FPS
+from core.replay import KEYFRAME_INTERVAL, ReplayRecorder, replay_meta
+
+
+def default_characters():
+    """Player 1 and player 2 characters of a match started without them."""
+    available_characters = list(CHARACTERS.keys())
+    fallback_player1 = available_characters[0] if available_characters else "Balrog"
+    fallback_player2 = (
+        available_characters[1]
+        if len(available_characters) > 1
+        else fallback_player1
+    )
+    return fallback_player1, fallback_player2
 
 
 class GameFrame:
-    def __init__(self, width, height, player1_character=None, player2_character=None, map_path=None):
+    # Only blits images, so it can draw on a TextureCanvas.
+    draws_textures = True
+
+    def __init__(self, width, height, player1_character=None, player2_character=None, map_path=None, difficulty="normal",
+                 seed=None, record_replay=False):
         self.width = width
         self.height = height
-        available_characters = list(CHARACTERS.keys())
-        fallback_player1 = available_characters[0] if available_characters else "Balrog"
-        fallback_player2 = (
-            available_characters[1]
-            if len(available_characters) > 1
-            else fallback_player1
-        )
+        fallback_player1, fallback_player2 = default_characters()
         self.player1_character = player1_character or fallback_player1
         self.player2_character = player2_character or fallback_player2
         self.map_path = map_path
+        self.difficulty = difficulty
+        self.seed = seed if seed is not None else random.randrange(1 << 32)
         self.ground_y = self.height - 110
 
         self.WHITE = (255, 255, 255)
@@ -27,18 +48,35 @@ class GameFrame:
         self.YELLOW = (255, 255, 0)
 
         self.clock = pygame.time.Clock()
+        self.drawn_hud_version = None
+        # Fraction of a tick between the last simulated state and the render time.
+        self.render_alpha = 1.0
 
+        # Match time advances one frame per step(), so replays reproduce it.
+        self.frame_count = 0
         self.intro_count = 3
-        self.last_count_update = pygame.time.get_ticks()
+        self.last_count_update = 0
         self.score = [0, 0]
         self.round_over = False
         self.round_over_time = 0
         self.ai_enabled = True
-        self.ai_next_decision = 0
-        self.ai_controls = self._empty_ai_controls()
+        self.ai = self._create_ai(random.Random(self.seed))
 
         self._load_assets()
-
+        self._create_fighters()
+        self._create_hud()
+        self.camera = self._create_camera() if CAMERA_ZOOM else None
+
+        self.replay = None
+        if record_replay:
+            self.replay = ReplayRecorder.start(replay_meta(
+                (self.player1_character, self.player2_character),
+                map_path=self.map_path,
+                seed=self.seed,
+                difficulty=self.difficulty,
+            ))
+
+    def _create_fighters(self):
         self.fighter1 = Fighter(
             player=1,
             x=200,
@@ -46,6 +84,7 @@ class GameFrame:
             flip=False,
             character_name=self.player1_character,
             sound=self._get_character_sound(self.player1_character),
+            clock=self.game_time,
         )
 
         self.fighter2 = Fighter(
@@ -55,31 +94,50 @@ class GameFrame:
             flip=True,
             character_name=self.player2_character,
             sound=self._get_character_sound(self.player2_character),
+            clock=self.game_time,
+            palette=int(self.player2_character == self.player1_character),
         )
 
+        self.entities = EntitySystem(self.width, self.height)
+        self.fighter1.entities = self.entities
+        self.fighter2.entities = self.entities
+
+    def _create_hud(self):
+        self.hud = HUD(self.width, (self.player1_character, self.player2_character))
+        self.hud.update(*self._hud_values())
+
+    def _create_camera(self):
+        camera = Camera(self.width, self.height)
+        for fighter in self._all_fighters():
+            camera.cache.track(image for animation in fighter.animation_list for image in animation)
+        camera.prepare()
+        camera.snap([fighter.draw_rect() for fighter in self._drawn_fighters()])
+        return camera
+
+    def _follow_camera(self, snap=False):
+        if self.camera is None:
+            return
+        rects = [fighter.draw_rect() for fighter in self._drawn_fighters()]
+        if snap:
+            self.camera.snap(rects)
+        else:
+            self.camera.follow(rects)
+
     def _get_character_sound(self, character_name):
         if character_name not in CHARACTERS:
             return self.default_sound
 
         sound_file = CHARACTERS[character_name].get(
             "attack_sound", "sword.wav")
-        sound_path = audio_path(sound_file)
 
         try:
-            sound = pygame.mixer.Sound(sound_path)
-            sound.set_volume(0.2)
-            return sound
+            return load_sound(sound_file, ATTACK_SOUND_VOLUME)
         except Exception:
             return self.default_sound
 
     def _load_assets(self):
-        pygame.mixer.music.load(audio_path("music.mp3"))
-        pygame.mixer.music.set_volume(0.1)
-        pygame.mixer.music.play(-1, 0.0, 5000)
-
         try:
-            self.default_sound = pygame.mixer.Sound(audio_path("sword.wav"))
-            self.default_sound.set_volume(0.2)
+            self.default_sound = load_sound("sword.wav", ATTACK_SOUND_VOLUME)
         except Exception:
             self.default_sound = pygame.mixer.Sound(buffer=bytes(100))
 
@@ -91,64 +149,89 @@ class GameFrame:
         self.count_font = pygame.font.Font(font_path(), 80)
         self.score_font = pygame.font.Font(font_path(), 30)
 
+    def activate(self):
+        """Start the music once the frame is shown (it may be built on another thread)."""
+        pygame.mixer.music.load(audio_path("music.mp3"))
+        pygame.mixer.music.set_volume(0.1)
+        pygame.mixer.music.play(-1, 0.0, 5000)
+
     def handle_events(self, events):
         for event in events:
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 return {"next": "menu"}
         return None
 
+    def game_time(self):
+        """Milliseconds of match time."""
+        return self.frame_count * 1000 // FPS
+
     def update(self):
         self.background.update()
 
+        player1_inputs = player2_inputs = 0
+        if self.intro_count <= 0:
+            player1_inputs, player2_inputs = sample_players()
+        self.step(player1_inputs, player2_inputs)
+
+    def step(self, player1_inputs, player2_inputs):
+        """Advance the match one frame; player 2's inputs come from the AI if enabled."""
+        if self.replay is not None and self.frame_count % KEYFRAME_INTERVAL == 0:
+            self.replay.keyframe(self.frame_count, self.save_state())
+        self.frame_count += 1
+        self.fighter1.remember_position()
+        self.fighter2.remember_position()
+
         if self.intro_count <= 0:
             self.fighter1.move(self.width, self.height, None,
-                               self.fighter2, self.round_over)
+                               self.fighter2, self.round_over,
+                               inputs=player1_inputs)
             if self.ai_enabled:
                 controls = self._get_ai_controls(self.fighter2, self.fighter1)
-                self.fighter2.move(
-                    self.width,
-                    self.height,
-                    None,
-                    self.fighter1,
-                    self.round_over,
-                    controls=controls,
-                )
-            else:
-                self.fighter2.move(self.width, self.height,
-                                   None, self.fighter1, self.round_over)
+                player2_inputs = controls_to_bits(controls)
+            self.fighter2.move(self.width, self.height, None,
+                               self.fighter1, self.round_over,
+                               inputs=player2_inputs)
         else:
-            if pygame.time.get_ticks() - self.last_count_update >= 1000:
+            player1_inputs = player2_inputs = 0
+            if self.game_time() - self.last_count_update >= 1000:
                 self.intro_count -= 1
-                self.last_count_update = pygame.time.get_ticks()
+                self.last_count_update = self.game_time()
+
+        if self.replay is not None:
+            self.replay.record(player1_inputs, player2_inputs)
 
         self.fighter1.update()
         self.fighter2.update()
+        self.entities.update((self.fighter1, self.fighter2))
 
         if not self.round_over:
             if not self.fighter1.alive:
                 self.score[1] += 1
                 self.round_over = True
-                self.round_over_time = pygame.time.get_ticks()
+                self.round_over_time = self.game_time()
             elif not self.fighter2.alive:
                 self.score[0] += 1
                 self.round_over = True
-                self.round_over_time = pygame.time.get_ticks()
+                self.round_over_time = self.game_time()
         else:
-            if pygame.time.get_ticks() - self.round_over_time > 2000:
+            if self.game_time() - self.round_over_time > 2000:
                 self._reset_round()
 
+        self._follow_camera()
+        self.hud.update(*self._hud_values())
+
     def draw(self, screen):
         self._draw_bg(screen)
+        self.draw_foreground(screen)
 
-        self.draw_hp(screen, self.fighter1.health, 20, 20)
-        self.draw_hp(screen, self.fighter2.health, 580, 20)
-
-        self.draw_game_wins(screen, self.score[0], 40, 80, direction=1)
-        self.draw_game_wins(
-            screen, self.score[1], self.width - 40, 80, direction=-1)
+    def draw_foreground(self, screen):
+        """Everything drawn over the background."""
+        self.hud.draw(screen)
 
-        self.fighter1.draw_fighter(screen)
-        self.fighter2.draw_fighter(screen)
+        world = self._world(screen)
+        for fighter in self._drawn_fighters():
+            fighter.draw_fighter(world, self.render_alpha)
+        self.entities.draw(world, self.render_alpha)
 
         if self.intro_count > 0:
             txt = self.count_font.render(
@@ -158,100 +241,100 @@ class GameFrame:
         if self.round_over:
             screen.blit(self.victory_image, (360, 150))
 
+    def dirty_regions(self):
+        """Screen areas draw_foreground() covers this frame (for dirty-rect rendering)."""
+        if self.camera is not None and self.camera.zoomed:
+            # The whole stage moves with the camera.
+            return None
+        regions = [fighter.draw_rect(self.render_alpha) for fighter in self._drawn_fighters()]
+        regions += self.entities.draw_rects(self.render_alpha)
+        if self.intro_count > 0:
+            regions.append(pygame.Rect((self.width // 2, self.height // 3),
+                                       self.count_font.size(str(self.intro_count))))
+        if self.round_over:
+            regions.append(self.victory_image.get_rect(topleft=(360, 150)))
+
+        # The HUD is blitted every frame but only needs presenting when it changes.
+        if self.hud.version != self.drawn_hud_version:
+            self.drawn_hud_version = self.hud.version
+            regions.append(self.hud.rect)
+        return regions
+
+    def set_render_alpha(self, alpha):
+        self.render_alpha = alpha
+
+    def _drawn_fighters(self):
+        return self.fighter1, self.fighter2
+
+    def _all_fighters(self):
+        return self.fighter1, self.fighter2
+
+    def _hud_values(self):
+        return (self.fighter1.health, self.fighter2.health), self.score
+
     def _draw_bg(self, screen):
-        self.background.draw(screen)
-
-    def draw_hp(self, screen, hp, x, y):
-        ratio = hp / 100
-        pygame.draw.rect(screen, self.WHITE, (x - 2, y - 2, 404, 34))
-        pygame.draw.rect(screen, self.RED, (x, y, 400, 30))
-        pygame.draw.rect(screen, self.YELLOW, (x, y, 400 * ratio, 30))
-
-    def draw_game_wins(self, screen, wins, x_start, y, radius=12, spacing=40, direction=1):
-        for i in range(wins):
-            x = x_start + (i * spacing * direction)
-            if i < wins:
-                pygame.draw.circle(screen, self.YELLOW, (x, y), radius)
-            else:
-                pygame.draw.circle(screen, self.WHITE, (x, y), radius, 2)
+        self.background.draw(self._world(screen))
+
+    def _world(self, screen):
+        """Where stage-space images are drawn: the screen, or a view through the camera."""
+        if self.camera is None:
+            return screen
+        return self.camera.view(screen, self.render_alpha)
 
     def _reset_round(self):
         self.round_over = False
         self.intro_count = 3
-        self.ai_controls = self._empty_ai_controls()
-        self.ai_next_decision = 0
+        self.ai.reset()
 
-        self.fighter1 = Fighter(
-            player=1,
-            x=200,
-            y=self.ground_y,
-            flip=False,
-            character_name=self.player1_character,
-            sound=self._get_character_sound(self.player1_character),
-        )
+        self.fighter1.reset(200, self.ground_y, False)
+        self.fighter2.reset(700, self.ground_y, True)
+        self.entities.clear()
+        self._follow_camera(snap=True)
 
-        self.fighter2 = Fighter(
-            player=2,
-            x=700,
-            y=self.ground_y,
-            flip=True,
-            character_name=self.player2_character,
-            sound=self._get_character_sound(self.player2_character),
-        )
-
-    def _empty_ai_controls(self):
+    def save_state(self):
+        """Everything step() depends on, as JSON-friendly values (replay keyframes)."""
+        fighters = (self.fighter1, self.fighter2)
         return {
-            "left": False,
-            "right": False,
-            "jump": False,
-            "attack1": False,
-            "attack2": False,
+            "frame": self.frame_count,
+            "intro_count": self.intro_count,
+            "last_count_update": self.last_count_update,
+            "score": list(self.score),
+            "round_over": self.round_over,
+            "round_over_time": self.round_over_time,
+            "fighters": [fighter.save_state() for fighter in fighters],
+            "entities": self.entities.save_state(fighters),
         }
 
+    def load_state(self, state):
+        self.frame_count = state["frame"]
+        self.intro_count = state["intro_count"]
+        self.last_count_update = state["last_count_update"]
+        self.score = list(state["score"])
+        self.round_over = state["round_over"]
+        self.round_over_time = state["round_over_time"]
+        fighter_states = state["fighters"]
+        self.fighter1.load_state(fighter_states[0], self.fighter2)
+        self.fighter2.load_state(fighter_states[1], self.fighter1)
+        self.entities.load_state(state["entities"], (self.fighter1, self.fighter2))
+        healths, score = self._hud_values()
+        self.hud.snap(healths)
+        self.hud.update(healths, score)
+        self.ai.reset()
+        self._follow_camera(snap=True)
+
+    def close(self):
+        """Called when leaving the frame; finishes the replay file."""
+        if self.replay is not None:
+            self.replay.close()
+            self.replay = None
+
+    def _create_ai(self, rng=None):
+        if self.difficulty == "hard":
+            return AIController(rng=rng, planner=LookaheadPlanner(self.width, self.height))
+        policy = load_policy(self.difficulty)
+        if policy is not None:
+            return AIController(rng=rng, policy=policy)
+        return AIController(rng)
+
     def _get_ai_controls(self, ai_fighter, target_fighter):
-        now = pygame.time.get_ticks()
-        if now < self.ai_next_decision:
-            return self.ai_controls
-
-        controls = self._empty_ai_controls()
-
-        distance_x = target_fighter.rect.centerx - ai_fighter.rect.centerx
-        abs_distance = abs(distance_x)
-
-        if abs_distance > 170:
-            if distance_x > 0:
-                controls["right"] = True
-            else:
-                controls["left"] = True
-        elif abs_distance < 85:
-            if distance_x > 0:
-                controls["left"] = True
-            else:
-                controls["right"] = True
-            if random.random() < 0.08 and not ai_fighter.jump:
-                controls["jump"] = True
-        else:
-            if random.random() < 0.25:
-                if distance_x > 0:
-                    controls["right"] = True
-                else:
-                    controls["left"] = True
-
-        attack_range = ai_fighter.character_data.get("attack_range", 2.0)
-        attack_distance = int(ai_fighter.rect.width * attack_range * 0.75)
-        can_attack = (
-            abs_distance <= attack_distance
-            and ai_fighter.attack_cd == 0
-            and not ai_fighter.attacking
-            and ai_fighter.alive
-            and target_fighter.alive
-        )
-        if can_attack and random.random() < 0.6:
-            if random.random() < 0.5:
-                controls["attack1"] = True
-            else:
-                controls["attack2"] = True
-
-        self.ai_controls = controls
-        self.ai_next_decision = now + random.randint(90, 170)
-        return self.ai_controls
+        return self.ai.get_controls(ai_fighter, target_fighter, self.game_time())
@@ -0,0 +1,74 @@
+import threading
+
+import pygame
+from core.assets import font_path
+
+# Frames built within this many seconds replace the previous one without showing the loading screen.
+LOADING_SCREEN_DELAY = 0.1
+# Width of the block sweeping along the progress bar, and its speed in pixels per tick.
+SWEEP_WIDTH = 80
+SWEEP_SPEED = 6
+
+
+class LoadingFrame:
+    """Loading screen shown while ``build()`` constructs the next frame on a worker thread.
+
+    Once the frame is built, ``handle_events`` returns it as
+    ``{"next": "loaded", "frame": frame}`` and main switches to it, calling
+    its ``activate`` (if any) on the main thread. An exception raised by
+    ``build`` is re-raised there instead.
+    """
+
+    # Only blits and fills, so it can draw on a TextureCanvas.
+    draws_textures = True
+
+    def __init__(self, screen_width, screen_height, build):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.build = build
+        self.frame = None
+        self.error = None
+        self.ticks = 0
+
+        # Rendered before the worker starts: it may be using the font renderer.
+        font = pygame.font.Font(font_path(), 44)
+        self.label = font.render("LOADING", True, (255, 255, 255))
+        self.bar = pygame.Rect(0, 0, screen_width // 3, 12)
+        self.bar.center = (screen_width // 2, screen_height // 2 + 40)
+
+        self.thread = threading.Thread(target=self._load, daemon=True)
+        self.thread.start()
+        self.thread.join(LOADING_SCREEN_DELAY)
+
+    def _load(self):
+        try:
+            self.frame = self.build()
+        except BaseException as e:
+            self.error = e
+
+    def handle_events(self, events):
+        if self.thread.is_alive():
+            return None
+        if self.error is not None:
+            raise self.error
+        return {"next": "loaded", "frame": self.frame}
+
+    def update(self):
+        self.ticks += 1
+
+    def draw(self, screen):
+        screen.fill((0, 0, 0))
+        screen.blit(self.label, self.label.get_rect(
+            midbottom=(self.screen_width // 2, self.bar.top - 20)))
+        screen.fill((60, 60, 60), self.bar)
+        # Indeterminate progress: a block sweeping across the bar.
+        offset = self.ticks * SWEEP_SPEED % (self.bar.width + SWEEP_WIDTH) - SWEEP_WIDTH
+        sweep = pygame.Rect(self.bar.left + offset, self.bar.top, SWEEP_WIDTH, self.bar.height)
+        screen.fill((255, 255, 0), sweep.clip(self.bar))
+
+    def close(self):
+        """Quitting while loading: wait for the frame and close it too."""
+        self.thread.join()
+        close = getattr(self.frame, "close", None)
+        if close:
+            close()
@@ -1,13 +1,23 @@
+from functools import partial
+
 import pygame
+from core.animated_background import preload_background
 from core.assets import font_path
 from core.maps import discover_maps
+from core.prefetch import PREFETCHER
+from fighters.fighter import Fighter
+from frames.game import default_characters
+from frames.team_game import MODES as TEAM_MODES
 
 
 class MapSelectFrame:
-    def __init__(self, screen_width, screen_height, character):
+    def __init__(self, screen_width, screen_height, character, mode="versus", difficulty="normal", opponent=None):
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.character = character
+        self.mode = mode
+        self.opponent = self._versus_opponent(opponent)
+        self.difficulty = difficulty
         self.maps = self._load_maps()
         self.selected_option = 0
 
@@ -19,6 +29,7 @@ class MapSelectFrame:
         self.thumb_gap_y = 20
         self.grid_margin_x = 24
         self.grid_top = 120
+        self._prefetch()
 
     def _load_maps(self):
         maps = []
@@ -37,6 +48,25 @@ class MapSelectFrame:
             })
         return maps
 
+    def reset(self, request):
+        """Reopen the screen as if new (the frame router keeps it between visits)."""
+        self.character = request["character"]
+        self.mode = request.get("mode", "versus")
+        self.opponent = self._versus_opponent(request.get("opponent"))
+        self.difficulty = request.get("difficulty", "normal")
+        self.selected_option = 0
+        self._prefetch()
+
+    def _versus_opponent(self, opponent):
+        """The player 2 character of a versus match; team modes pick their own fighters."""
+        if self.mode in TEAM_MODES:
+            return None
+        return opponent or default_characters()[1]
+
+    @property
+    def nbytes(self):
+        return sum(map_data["image"].get_height() * map_data["image"].get_pitch() for map_data in self.maps)
+
     def handle_events(self, events):
         for event in events:
             if event.type == pygame.KEYDOWN:
@@ -53,10 +83,17 @@ class MapSelectFrame:
                     return {
                         "next": "game",
                         "character": self.character,
+                        "opponent": self.opponent,
                         "map_path": selected_map["path"],
+                        "mode": self.mode,
+                        "difficulty": self.difficulty,
                     }
                 elif event.key == pygame.K_ESCAPE:
-                    return {"next": "character_select"}
+                    return {
+                        "next": "character_select",
+                        "mode": self.mode,
+                        "difficulty": self.difficulty,
+                    }
         return None
 
     def update(self):
@@ -77,13 +114,22 @@ class MapSelectFrame:
 
         if dx != 0:
             self.selected_option = (self.selected_option + dx) % total
-            return
-
-        if dy != 0:
+        elif dy != 0:
             target_row = row + dy
             target_index = target_row * cols + col
             if 0 <= target_index < total:
                 self.selected_option = target_index
+        self._prefetch()
+
+    def _prefetch(self):
+        # The match needs the chosen fighter, the versus opponent and probably the highlighted stage.
+        tasks = [partial(Fighter.preload, self.character)]
+        if self.opponent:
+            tasks.append(partial(Fighter.preload, self.opponent))
+        if self.maps:
+            tasks.append(partial(preload_background, self.maps[self.selected_option]["path"],
+                                 self.screen_width, self.screen_height))
+        PREFETCHER.want(*tasks)
 
     def _draw_map_cards(self, screen):
         total = len(self.maps)
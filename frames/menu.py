@@ -1,5 +1,7 @@
 import pygame
 from core.assets import font_path, image_path
+from core.replay import latest_replay
+from fighters.ai import DIFFICULTIES
 
 
 class MenuFrame:
@@ -7,18 +9,28 @@ class MenuFrame:
         self.screen_width = screen_width
         self.screen_height = screen_height
 
-        self.options = ["Single Player", "Online Multiplayer",
-                        "Exit"]  # ← ADICIONADA OPÇÃO
+        self.options = ["Single Player", "Tag Team 2v2", "Free For All",
+                        "Difficulty", "Watch Replay", "Online Multiplayer", "Exit"]
         self.selected_option = 0
+        self.difficulty = "normal"
 
         # FONTS
         self.title_font = pygame.font.Font(font_path(), 74)
-        self.option_font = pygame.font.Font(font_path(), 50)
+        self.option_font = pygame.font.Font(font_path(), 44)
 
         # Load background image
         self.bg_image = pygame.image.load(
             image_path("background", "menu_background.jpg")).convert_alpha()
 
+    def reset(self, request):
+        """Reopen the menu as if new (the frame router keeps it between visits)."""
+        self.selected_option = 0
+        self.difficulty = "normal"
+
+    @property
+    def nbytes(self):
+        return self.bg_image.get_height() * self.bg_image.get_pitch()
+
     def handle_events(self, events):
         for event in events:
             if event.type == pygame.KEYDOWN:
@@ -28,19 +40,37 @@ class MenuFrame:
                 if event.key == pygame.K_DOWN:
                     self.selected_option = (
                         self.selected_option + 1) % len(self.options)
+                if event.key in (pygame.K_LEFT, pygame.K_RIGHT) and self.selected_option == 3:
+                    self._cycle_difficulty(1 if event.key == pygame.K_RIGHT else -1)
                 if event.key == pygame.K_RETURN:
                     if self.selected_option == 0:
                         # Single Player
-                        return {"next": "character_select"}
+                        return {"next": "character_select", "difficulty": self.difficulty}
                     elif self.selected_option == 1:
+                        return {"next": "character_select", "mode": "tag",
+                                "difficulty": self.difficulty}
+                    elif self.selected_option == 2:
+                        return {"next": "character_select", "mode": "ffa",
+                                "difficulty": self.difficulty}
+                    elif self.selected_option == 3:
+                        self._cycle_difficulty(1)
+                    elif self.selected_option == 4:
+                        path = latest_replay()
+                        if path is not None:
+                            return {"next": "replay", "path": path}
+                    elif self.selected_option == 5:
                         # Online Multiplayer ← NOVO
                         return {"next": "online_menu"}
-                    elif self.selected_option == 2:
+                    elif self.selected_option == 6:
                         # Exit
                         pygame.quit()
                         exit()
         return None
 
+    def _cycle_difficulty(self, step):
+        index = DIFFICULTIES.index(self.difficulty)
+        self.difficulty = DIFFICULTIES[(index + step) % len(DIFFICULTIES)]
+
     def update(self):
         pass
 
@@ -62,7 +92,9 @@ class MenuFrame:
         for i, option in enumerate(self.options):
             color = (255, 255, 0) if i == self.selected_option else (
                 255, 255, 255)
+            if option == "Difficulty":
+                option = f"Difficulty: {self.difficulty.title()}"
             option_surface = self.option_font.render(option, True, color)
             option_rect = option_surface.get_rect(
-                center=(self.screen_width // 2, 300 + i * 60))
+                center=(self.screen_width // 2, 250 + i * 50))
             screen.blit(option_surface, option_rect)
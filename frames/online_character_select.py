@@ -1,8 +1,12 @@
+from functools import partial
+
 from network.protocol import MessageType
 from characters.characters import CHARACTERS
 import pygame
 from core.assets import audio_path, font_path, image_path
+from core.prefetch import PREFETCHER
 from fighters.animation_loader import load_animation_region
+from fighters.fighter import Fighter
 
 
 class OnlineCharacterSelectFrame:
@@ -38,6 +42,7 @@ class OnlineCharacterSelectFrame:
         self.option_font = pygame.font.Font(font_path(), 40)
         self.message_font = pygame.font.Font(font_path(), 25)
         self.move_sound, self.confirm_sound = self._load_ui_sounds()
+        self._prefetch()
 
     def _load_characters(self):
         characters = []
@@ -241,13 +246,17 @@ class OnlineCharacterSelectFrame:
 
         if dx != 0:
             self.selected_option = (self.selected_option + dx) % total
-            return
-
-        if dy != 0:
+        elif dy != 0:
             target_row = row + dy
             target_index = target_row * cols + col
             if 0 <= target_index < total:
                 self.selected_option = target_index
+        self._prefetch()
+
+    def _prefetch(self):
+        # The highlighted fighter is the likely pick; load it while the player decides.
+        if self.characters:
+            PREFETCHER.want(partial(Fighter.preload, self.characters[self.selected_option]["name"]))
 
     def _draw_character_cards(self, screen):
         cols = self._grid_cols()
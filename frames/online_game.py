@@ -1,13 +1,24 @@
 import pygame
 from characters.characters import CHARACTERS
-from fighters.fighter import Fighter
+from fighters.entities import EntitySystem
+from fighters.fighter import ATTACK_SOUND_VOLUME, Fighter
 from network.protocol import MessageType, create_player_state_update_message
-from core.assets import audio_path, font_path, image_path
+from core.assets import audio_path, font_path, image_path, load_sound
 from core.animated_background import AnimatedBackground
+from core.camera import Camera
+from core.config import CAMERA_ZOOM
+from core.hud import HUD
+from core.input import sample_players
 
 
 class OnlineGameFrame:
-    """Game frame para multiplayer online"""
+    """Game frame para multiplayer online
+
+    Not recorded as a replay: the opponent follows state sync and damage
+    comes from the server, so the inputs alone would not reproduce the match.
+    """
+
+    draws_textures = True
 
     def __init__(self, width, height, client, player_id, player1_character, player2_character, is_host, map_path=None):
         self.width = width
@@ -19,10 +30,6 @@ class OnlineGameFrame:
 
         self.ground_y = self.height - 110
 
-        self.WHITE = (255, 255, 255)
-        self.RED = (255, 0, 0)
-        self.YELLOW = (255, 255, 0)
-
         self.intro_count = 3
         self.last_count_update = pygame.time.get_ticks()
         self.score = [0, 0]
@@ -46,8 +53,12 @@ class OnlineGameFrame:
             flip=True,
             character_name=player2_character,
             sound=self._get_character_sound(player2_character),
+            palette=int(player2_character == player1_character),
         )
 
+        self.hud = HUD(self.width, (player1_character, player2_character))
+        self.hud.update((self.fighter1.health, self.fighter2.health), self.score)
+
         if self.player_id == 1:
             self.my_fighter = self.fighter1
             self.opponent_fighter = self.fighter2
@@ -55,12 +66,40 @@ class OnlineGameFrame:
             self.my_fighter = self.fighter2
             self.opponent_fighter = self.fighter1
 
+        # Damage is decided by the server; projectiles only report hits.
+        # The opponent's projectiles arrive as spawn events and are only drawn.
+        self.entities = EntitySystem(
+            self.width, self.height, on_hit=self._on_projectile_hit,
+            on_spawn=self._on_projectile_spawn)
+        self.fighter1.entities = self.entities
+        self.fighter2.entities = self.entities
+        self.camera = self._create_camera() if CAMERA_ZOOM else None
+
         self.last_state_send = pygame.time.get_ticks()
         self.state_send_interval = 50
         self.last_hit_sent = 0
         self.hit_cooldown = 500
         self.hit_sent_this_attack = False
         self.disconnected = False
+        self.pending_inputs = []
+        self.pending_projectiles = []
+
+    def _create_camera(self):
+        camera = Camera(self.width, self.height)
+        for fighter in (self.fighter1, self.fighter2):
+            camera.cache.track(image for animation in fighter.animation_list for image in animation)
+        camera.prepare()
+        camera.snap([self.fighter1.draw_rect(), self.fighter2.draw_rect()])
+        return camera
+
+    def _follow_camera(self, snap=False):
+        if self.camera is None:
+            return
+        rects = [self.fighter1.draw_rect(), self.fighter2.draw_rect()]
+        if snap:
+            self.camera.snap(rects)
+        else:
+            self.camera.follow(rects)
 
     def _get_character_sound(self, character_name):
         if character_name not in CHARACTERS:
@@ -68,23 +107,15 @@ class OnlineGameFrame:
 
         sound_file = CHARACTERS[character_name].get(
             "attack_sound", "sword.wav")
-        sound_path = audio_path(sound_file)
 
         try:
-            sound = pygame.mixer.Sound(sound_path)
-            sound.set_volume(0.2)
-            return sound
+            return load_sound(sound_file, ATTACK_SOUND_VOLUME)
         except Exception:
             return self.default_sound
 
     def _load_assets(self):
-        pygame.mixer.music.load(audio_path("music.mp3"))
-        pygame.mixer.music.set_volume(0.1)
-        pygame.mixer.music.play(-1, 0.0, 5000)
-
         try:
-            self.default_sound = pygame.mixer.Sound(audio_path("sword.wav"))
-            self.default_sound.set_volume(0.2)
+            self.default_sound = load_sound("sword.wav", ATTACK_SOUND_VOLUME)
         except Exception:
             self.default_sound = pygame.mixer.Sound(buffer=bytes(100))
 
@@ -97,6 +128,13 @@ class OnlineGameFrame:
         self.score_font = pygame.font.Font(font_path(), 30)
         self.info_font = pygame.font.Font(font_path(), 20)
 
+    def activate(self):
+        """Start the music and the intro countdown once the frame is shown."""
+        pygame.mixer.music.load(audio_path("music.mp3"))
+        pygame.mixer.music.set_volume(0.1)
+        pygame.mixer.music.play(-1, 0.0, 5000)
+        self.last_count_update = self.last_state_send = pygame.time.get_ticks()
+
     def handle_events(self, events):
         if self.disconnected:
             return {"next": "menu"}
@@ -119,6 +157,11 @@ class OnlineGameFrame:
                 if opponent_id != self.player_id:
                     self._apply_opponent_state(msg.data.get("state"))
 
+            elif msg.msg_type == MessageType.PLAYER_INPUT:
+                if msg.data.get("player_id") != self.player_id:
+                    self.opponent_fighter.input_history.extend(
+                        msg.data.get("inputs", []))
+
             elif msg.msg_type == MessageType.GAME_STATE_UPDATE:
                 self._apply_game_state(msg.data)
 
@@ -133,6 +176,8 @@ class OnlineGameFrame:
                 self.last_count_update = pygame.time.get_ticks()
 
         if self.intro_count <= 0:
+            inputs = sample_players((self.my_fighter.player,))[0]
+            self.pending_inputs.append(inputs)
             self.my_fighter.move(
                 self.width,
                 self.height,
@@ -140,6 +185,7 @@ class OnlineGameFrame:
                 self.opponent_fighter,
                 self.round_over,
                 apply_damage=False,
+                inputs=inputs,
             )
 
             if self.my_fighter.attacking:
@@ -158,6 +204,9 @@ class OnlineGameFrame:
 
         self.fighter1.update()
         self.fighter2.update()
+        self.entities.update((self.fighter1, self.fighter2))
+        self._follow_camera()
+        self.hud.update((self.fighter1.health, self.fighter2.health), self.score)
 
         now = pygame.time.get_ticks()
         if now - self.last_state_send >= self.state_send_interval:
@@ -176,29 +225,42 @@ class OnlineGameFrame:
             "jump": self.my_fighter.jump,
             "running": self.my_fighter.running,
             "defending": self.my_fighter.defending,
+            "projectiles": self.pending_projectiles,
         }
+        self.pending_projectiles = []
 
         msg = create_player_state_update_message(self.player_id, state)
         self.client.send_message(msg)
 
+        if self.pending_inputs:
+            self.client.send_player_input(
+                self.pending_inputs, self.my_fighter.input_history.frame)
+            self.pending_inputs = []
+
     def _check_attack_hit(self):
-        attack_range = self.my_fighter.character_data.get("attack_range", 2.0)
-
-        attacking_rect = pygame.Rect(
-            self.my_fighter.rect.centerx
-            - (attack_range * self.my_fighter.rect.width * self.my_fighter.flip),
-            self.my_fighter.rect.y,
-            attack_range * self.my_fighter.rect.width,
-            self.my_fighter.rect.height,
+        return (
+            self.my_fighter.attack_active()
+            and self.my_fighter.attack_move_key not in self.my_fighter.projectiles
+            and self.my_fighter.attack_hits(self.opponent_fighter)
         )
 
-        return attacking_rect.colliderect(self.opponent_fighter.rect)
+    def _on_projectile_spawn(self, owner, spec, x, y):
+        if owner is not self.my_fighter:
+            return
+        for move_key, projectile in owner.projectiles.items():
+            if projectile is spec:
+                self.pending_projectiles.append((move_key, x, y, owner.flip))
 
-    def _send_hit_message(self):
+    def _on_projectile_hit(self, owner, target, damage):
+        if owner is self.my_fighter and target is self.opponent_fighter:
+            self._send_hit_message(damage)
+
+    def _send_hit_message(self, damage=None):
         from network.protocol import create_hit_message
 
         opponent_id = 2 if self.player_id == 1 else 1
-        damage = 10
+        if damage is None:
+            damage = self.my_fighter.attack_damage
         msg = create_hit_message(self.player_id, opponent_id, damage)
         self.client.send_message(msg)
 
@@ -254,55 +316,39 @@ class OnlineGameFrame:
             "defending", self.opponent_fighter.defending
         )
 
+        for move_key, x, y, flip in state.get("projectiles", ()):
+            spec = self.opponent_fighter.projectiles.get(move_key)
+            if spec is not None:
+                self.entities.spawn_projectile(
+                    self.opponent_fighter, spec, x, y, 0, flip=flip, hits=False)
+
         if self.opponent_fighter.action < len(self.opponent_fighter.animation_list):
             anim = self.opponent_fighter.animation_list[self.opponent_fighter.action]
             if self.opponent_fighter.frame_index < len(anim):
                 self.opponent_fighter.image = anim[self.opponent_fighter.frame_index]
+                self.opponent_fighter.collision = self.opponent_fighter.collision_list[
+                    self.opponent_fighter.action][self.opponent_fighter.frame_index]
 
     def _reset_round(self):
         self.round_over = False
         self.intro_count = 3
+        self.hit_sent_this_attack = False
+        self.pending_projectiles = []
 
-        char1 = self.fighter1.character_name
-        char2 = self.fighter2.character_name
-
-        self.fighter1 = Fighter(
-            player=1,
-            x=200,
-            y=self.ground_y,
-            flip=False,
-            character_name=char1,
-            sound=self._get_character_sound(char1),
-        )
-
-        self.fighter2 = Fighter(
-            player=2,
-            x=700,
-            y=self.ground_y,
-            flip=True,
-            character_name=char2,
-            sound=self._get_character_sound(char2),
-        )
-
-        if self.player_id == 1:
-            self.my_fighter = self.fighter1
-            self.opponent_fighter = self.fighter2
-        else:
-            self.my_fighter = self.fighter2
-            self.opponent_fighter = self.fighter1
+        self.fighter1.reset(200, self.ground_y, False)
+        self.fighter2.reset(700, self.ground_y, True)
+        self.entities.clear()
+        self._follow_camera(snap=True)
 
     def draw(self, screen):
-        self.background.draw(screen)
-
-        self.draw_hp(screen, self.fighter1.health, 20, 20)
-        self.draw_hp(screen, self.fighter2.health, 580, 20)
+        world = screen if self.camera is None else self.camera.view(screen)
+        self.background.draw(world)
 
-        self.draw_game_wins(screen, self.score[0], 40, 80, direction=1)
-        self.draw_game_wins(
-            screen, self.score[1], self.width - 40, 80, direction=-1)
+        self.hud.draw(screen)
 
-        self.fighter1.draw_fighter(screen)
-        self.fighter2.draw_fighter(screen)
+        self.fighter1.draw_fighter(world)
+        self.fighter2.draw_fighter(world)
+        self.entities.draw(world)
 
         if self.intro_count > 0:
             txt = self.count_font.render(
@@ -322,14 +368,3 @@ class OnlineGameFrame:
         esc_surface = self.info_font.render(esc_text, True, (150, 150, 150))
         screen.blit(esc_surface, (self.width -
                     esc_surface.get_width() - 10, self.height - 30))
-
-    def draw_hp(self, screen, hp, x, y):
-        ratio = hp / 100
-        pygame.draw.rect(screen, self.WHITE, (x - 2, y - 2, 404, 34))
-        pygame.draw.rect(screen, self.RED, (x, y, 400, 30))
-        pygame.draw.rect(screen, self.YELLOW, (x, y, 400 * ratio, 30))
-
-    def draw_game_wins(self, screen, wins, x_start, y, radius=12, spacing=40, direction=1):
-        for i in range(wins):
-            x = x_start + (i * spacing * direction)
-            pygame.draw.circle(screen, self.YELLOW, (x, y), radius)
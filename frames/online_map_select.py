@@ -1,6 +1,11 @@
+from functools import partial
+
 import pygame
+from core.animated_background import preload_background
 from core.assets import font_path
 from core.maps import discover_maps
+from core.prefetch import PREFETCHER
+from fighters.fighter import Fighter
 from network.protocol import MessageType, create_map_select_message
 
 
@@ -26,6 +31,7 @@ class OnlineMapSelectFrame:
         self.thumb_gap_y = 20
         self.grid_margin_x = 24
         self.grid_top = 120
+        self._prefetch()
 
     def _load_maps(self):
         maps = []
@@ -114,13 +120,21 @@ class OnlineMapSelectFrame:
 
         if dx != 0:
             self.selected_option = (self.selected_option + dx) % total
-            return
-
-        if dy != 0:
+        elif dy != 0:
             target_row = row + dy
             target_index = target_row * cols + col
             if 0 <= target_index < total:
                 self.selected_option = target_index
+        self._prefetch()
+
+    def _prefetch(self):
+        # Both fighters are known; the highlighted stage is the likely pick.
+        tasks = [partial(Fighter.preload, self.player1_character),
+                 partial(Fighter.preload, self.player2_character)]
+        if self.maps:
+            tasks.append(partial(preload_background, self.maps[self.selected_option]["path"],
+                                 self.screen_width, self.screen_height))
+        PREFETCHER.want(*tasks)
 
     def _draw_map_cards(self, screen):
         total = len(self.maps)
@@ -0,0 +1,147 @@
+import pygame
+
+from core.config import FPS, PROJECT_ROOT
+from core.replay import KEYFRAME_INTERVAL, load_replay
+from frames.game import GameFrame
+
+SPEEDS = {pygame.K_1: 1, pygame.K_2: 4, pygame.K_3: 16}
+SEEK_STEP = 5 * FPS
+
+
+class ReplayFrame(GameFrame):
+    """Play back a recorded match at 1x/4x/16x with seeking.
+
+    Seeking restores the nearest keyframe at or before the target and
+    re-simulates the remaining frames (at most KEYFRAME_INTERVAL) without
+    drawing. Replays saved without keyframes get them rebuilt in one
+    headless pass when opened.
+    """
+
+    def __init__(self, width, height, path):
+        self.playback = load_replay(path)
+        meta = self.playback.meta
+        characters = meta["characters"]
+        map_path = meta.get("map")
+        if map_path:
+            map_path = str(PROJECT_ROOT / map_path)
+        super().__init__(width, height, characters[0], characters[1], map_path=map_path,
+                         difficulty=meta.get("difficulty", "normal"), seed=meta.get("seed"))
+        self.ai_enabled = False
+        self.speed = 1
+        self.paused = False
+        self.muted = False
+        self.show_overlay = True
+        # Outline as an image so the overlay only needs blit/fill (texture canvases).
+        self.bar_outline = pygame.Surface(self._progress_bar().size, pygame.SRCALPHA)
+        pygame.draw.rect(self.bar_outline, self.WHITE, self.bar_outline.get_rect(), 1)
+        self.sounds = [
+            (fighter.attack_sound, fighter.punch_sound, fighter.hit_sound)
+            for fighter in (self.fighter1, self.fighter2)
+        ]
+
+        if not self.playback.keyframes:
+            self._build_keyframes()
+        self.load_state(self.playback.keyframe_before(0)[1])
+
+    def _build_keyframes(self):
+        self._mute(True)
+        while self.frame_count < self.playback.frames:
+            if self.frame_count % KEYFRAME_INTERVAL == 0:
+                self.playback.add_keyframe(self.frame_count, self.save_state())
+            self._advance()
+        if not self.playback.keyframes:
+            self.playback.add_keyframe(self.frame_count, self.save_state())
+        self._mute(False)
+
+    def _advance(self):
+        frame = self.frame_count
+        self.step(self.playback.inputs1[frame], self.playback.inputs2[frame])
+
+    def _mute(self, muted):
+        if muted == self.muted:
+            return
+        self.muted = muted
+        for fighter, sounds in zip((self.fighter1, self.fighter2), self.sounds):
+            fighter.attack_sound, fighter.punch_sound, fighter.hit_sound = (
+                (None, None, None) if muted else sounds)
+
+    def seek(self, frame):
+        frame = max(0, min(frame, self.playback.frames))
+        keyframe, state = self.playback.keyframe_before(frame)
+        # Moving forward within the current keyframe span needs no restore.
+        if frame < self.frame_count or keyframe > self.frame_count:
+            self.load_state(state)
+
+        was_muted = self.muted
+        self._mute(True)
+        while self.frame_count < frame:
+            self._advance()
+        self._mute(was_muted)
+
+    def handle_events(self, events):
+        for event in events:
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key == pygame.K_ESCAPE:
+                return {"next": "menu"}
+            if event.key in SPEEDS:
+                self.speed = SPEEDS[event.key]
+            elif event.key == pygame.K_SPACE:
+                self.paused = not self.paused
+            elif event.key == pygame.K_LEFT:
+                self.seek(self.frame_count - SEEK_STEP)
+            elif event.key == pygame.K_RIGHT:
+                self.seek(self.frame_count + SEEK_STEP)
+            elif event.key == pygame.K_HOME:
+                self.seek(0)
+        return None
+
+    def set_render_alpha(self, alpha):
+        # Paused or at the end there is no next tick to interpolate toward.
+        if self.paused or self.frame_count >= self.playback.frames:
+            alpha = 1.0
+        super().set_render_alpha(alpha)
+
+    def update(self):
+        self.background.update()
+        if self.paused:
+            return
+        self._mute(self.speed > 1)
+        for _ in range(min(self.speed, self.playback.frames - self.frame_count)):
+            self._advance()
+
+    def draw_foreground(self, screen):
+        super().draw_foreground(screen)
+        if not self.show_overlay:
+            return
+
+        total = max(1, self.playback.frames)
+        bar = self._progress_bar()
+        screen.blit(self.bar_outline, bar)
+        screen.fill(self.YELLOW, (bar.x, bar.y, bar.width * self.frame_count // total, bar.height))
+
+        if self.frame_count >= self.playback.frames:
+            status = "END"
+        elif self.paused:
+            status = "PAUSED"
+        else:
+            status = f"x{self.speed}"
+        label = f"{_clock(self.frame_count)} / {_clock(self.playback.frames)}  {status}"
+        txt = self.score_font.render(label, True, self.WHITE)
+        screen.blit(txt, (bar.x, bar.y - txt.get_height() - 4))
+
+    def _progress_bar(self):
+        return pygame.Rect(20, self.height - 30, self.width - 40, 8)
+
+    def dirty_regions(self):
+        regions = super().dirty_regions()
+        if self.show_overlay:
+            bar = self._progress_bar()
+            text_height = self.score_font.get_linesize() + 4
+            regions.append(pygame.Rect(bar.x, bar.y - text_height, bar.width, bar.height + text_height))
+        return regions
+
+
+def _clock(frames):
+    seconds = frames // FPS
+    return f"{seconds // 60}:{seconds % 60:02d}"
@@ -0,0 +1,61 @@
+import weakref
+from collections import OrderedDict
+
+# Memory the inactive frames kept for reuse may hold (measured by their ``nbytes``).
+INACTIVE_FRAME_BYTES = 64 * 1024 * 1024
+
+
+class FrameRouter:
+    """Builds the frame a ``handle_events`` result asks for, reusing inactive ones.
+
+    ``routes`` maps each result's ``"next"`` name to a factory taking the
+    result. Frames with a ``reset(request)`` hook are kept when the player
+    leaves them (``release``) and handed back by ``open`` for the same
+    route after ``reset``, so going back to a menu loads nothing. At most
+    one frame per route is kept, least recently used dropped first once
+    their ``nbytes`` exceed ``max_bytes``. Frames that are dropped or not
+    reusable are closed.
+    """
+
+    def __init__(self, routes, max_bytes=INACTIVE_FRAME_BYTES):
+        self.routes = routes
+        self.max_bytes = max_bytes
+        self.inactive = OrderedDict()
+        self.opened = weakref.WeakKeyDictionary()
+
+    def open(self, request):
+        name = request["next"]
+        frame = self.inactive.pop(name, None)
+        if frame is not None:
+            frame.reset(request)
+        else:
+            route = self.routes.get(name)
+            if route is None:
+                raise ValueError(f"Unknown frame {name!r}")
+            frame = route(request)
+        self.opened[frame] = name
+        return frame
+
+    def release(self, frame):
+        """Keep ``frame`` for reuse if it has a ``reset`` hook, else close it."""
+        name = self.opened.pop(frame, None)
+        if name is None or not hasattr(frame, "reset"):
+            _close(frame)
+            return
+        previous = self.inactive.pop(name, None)
+        if previous is not None:
+            _close(previous)
+        self.inactive[name] = frame
+        while self.inactive and sum(getattr(kept, "nbytes", 0) for kept in self.inactive.values()) > self.max_bytes:
+            _close(self.inactive.popitem(last=False)[1])
+
+    def close(self):
+        """Close the inactive frames (on exit)."""
+        while self.inactive:
+            _close(self.inactive.popitem()[1])
+
+
+def _close(frame):
+    close = getattr(frame, "close", None)
+    if close:
+        close()
@@ -0,0 +1,269 @@
+import random
+
+import pygame
+
+from characters.characters import CHARACTERS
+from core.hud import HUD, YELLOW
+from core.input import controls_to_bits, sample_players
+from fighters.collision import SweepAndPrune
+from fighters.entities import EntitySystem
+from fighters.fighter import Fighter
+from frames.game import GameFrame
+
+# mode -> (team of each fighter, spawn x of each fighter)
+MODES = {
+    "tag": ((1, 1, 2, 2), (200, 200, 700, 700)),
+    "ffa": ((1, 2, 3, 4), (150, 850, 380, 620)),
+}
+
+TEAM_COLORS = {
+    1: (255, 255, 0),
+    2: (80, 180, 255),
+    3: (120, 255, 120),
+    4: (255, 140, 60),
+}
+
+
+class TeamGameFrame(GameFrame):
+    """Multi-fighter match: 2v2 tag ("tag") or 4-player free-for-all ("ffa").
+
+    Player 1 controls the first fighter; everyone else is AI. Melee hits and
+    projectiles for all fighters go through one sweep-and-prune broadphase.
+    """
+
+    def __init__(self, width, height, player1_character=None, map_path=None, mode="ffa", seed=None,
+                 difficulty="normal"):
+        if mode not in MODES:
+            raise ValueError(f"Unknown match mode '{mode}'")
+        self.mode = mode
+        self.rng = random.Random(seed)
+        self.world = SweepAndPrune()
+        super().__init__(width, height, player1_character=player1_character,
+                         map_path=map_path, difficulty=difficulty, seed=seed)
+
+    def _create_fighters(self):
+        teams, spawn_x = MODES[self.mode]
+        names = list(CHARACTERS.keys())
+        characters = [self.player1_character] + [
+            self.rng.choice(names) for _ in range(len(teams) - 1)]
+
+        self.entities = EntitySystem(self.width, self.height)
+        self.fighters = []
+        for index, (team, character) in enumerate(zip(teams, characters)):
+            fighter = Fighter(
+                player=index + 1,
+                x=spawn_x[index],
+                y=self.ground_y,
+                flip=spawn_x[index] > self.width // 2,
+                character_name=character,
+                sound=self._get_character_sound(character),
+                clock=self.game_time,
+                # Repeated characters get alternate colours.
+                palette=characters[:index].count(character),
+            )
+            fighter.team = team
+            fighter.entities = self.entities
+            self.fighters.append(fighter)
+
+        self.fighter1 = self.fighters[0]
+        self.fighter2 = self.fighters[1]
+        self.score = [0] * len(set(teams))
+        # Tag mode: index into self.fighters of each team's fighter on point.
+        self.on_point = {team: teams.index(team) for team in set(teams)}
+        self.ai_controllers = [
+            self._create_ai(random.Random(self.rng.random())) for _ in self.fighters]
+
+    def handle_events(self, events):
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    return {"next": "menu"}
+                if event.key == pygame.K_q and self.mode == "tag" and self.intro_count <= 0:
+                    self._tag(self.fighters[0].team)
+        return None
+
+    def _active_fighters(self):
+        if self.mode == "tag":
+            return [self.fighters[index] for index in self.on_point.values()]
+        return [fighter for fighter in self.fighters if fighter.alive or fighter.action == 6]
+
+    def _human_fighter(self):
+        if self.mode == "tag":
+            return self.fighters[self.on_point[self.fighters[0].team]]
+        return self.fighters[0]
+
+    def _partner(self, team):
+        point = self.on_point[team]
+        for index, fighter in enumerate(self.fighters):
+            if fighter.team == team and index != point:
+                return index
+        return None
+
+    def _tag(self, team):
+        partner_index = self._partner(team)
+        if partner_index is None:
+            return
+        outgoing = self.fighters[self.on_point[team]]
+        incoming = self.fighters[partner_index]
+        if not incoming.alive:
+            return
+        if outgoing.alive and (outgoing.attacking or outgoing.hit):
+            return
+        incoming.rect.midbottom = outgoing.rect.midbottom
+        incoming.remember_position()
+        incoming.flip = outgoing.flip
+        incoming.vel_y = 0
+        incoming.jump = False
+        self.on_point[team] = partner_index
+
+    def _nearest_opponent(self, fighter, fighters):
+        nearest = None
+        best = None
+        for other in fighters:
+            if other is fighter or other.team == fighter.team or not other.alive:
+                continue
+            distance = abs(other.rect.centerx - fighter.rect.centerx)
+            if best is None or distance < best:
+                nearest, best = other, distance
+        return nearest
+
+    def _ai_inputs(self, index, fighter, target):
+        controls = self.ai_controllers[index].get_controls(
+            fighter, target, self.game_time())
+        return controls_to_bits(controls)
+
+    def update(self):
+        self.background.update()
+        self.frame_count += 1
+        for fighter in self.fighters:
+            fighter.remember_position()
+        active = self._active_fighters()
+
+        if self.intro_count <= 0:
+            player_inputs = sample_players((1,))[0]
+            human = self._human_fighter()
+            for fighter in active:
+                target = self._nearest_opponent(fighter, active) or fighter
+                index = self.fighters.index(fighter)
+                if fighter is human:
+                    inputs = player_inputs
+                else:
+                    inputs = self._ai_inputs(index, fighter, target)
+                # Damage is resolved below through the broadphase.
+                fighter.move(self.width, self.height, None, target,
+                             self.round_over, apply_damage=False, inputs=inputs)
+        else:
+            if self.game_time() - self.last_count_update >= 1000:
+                self.intro_count -= 1
+                self.last_count_update = self.game_time()
+
+        for fighter in active:
+            fighter.update()
+
+        self.entities.advance()
+        self._resolve_hits(active)
+        self._update_tags()
+        self._update_round()
+        self._follow_camera()
+        self.hud.update(*self._hud_values())
+
+    def _resolve_hits(self, fighters):
+        world = self.world
+        world.clear()
+        for fighter in fighters:
+            if not fighter.alive:
+                continue
+            world.add_hurtbox(fighter.hurt_box_world(), fighter, fighter.team)
+            if not fighter.attack_landed:
+                hit_box = fighter.hit_box_world()
+                if hit_box is not None:
+                    world.add_hitbox(hit_box, fighter, fighter.team)
+        self.entities.add_to_broadphase(world)
+
+        for hit, hurt in world.pairs():
+            attacker, target, projectile = hit[6], hurt[6], hit[7]
+            if projectile is not None:
+                self.entities.land_projectile(projectile, target)
+            elif not attacker.attack_landed:
+                point = attacker.attack_hit_point(target)
+                if point is not None:
+                    attacker.land_hit(target, point)
+
+    def _update_tags(self):
+        if self.mode != "tag" or self.round_over:
+            return
+        for team, point in self.on_point.items():
+            fighter = self.fighters[point]
+            partner_index = self._partner(team)
+            if partner_index is None:
+                continue
+            partner = self.fighters[partner_index]
+            if not fighter.alive:
+                if fighter.frame_index == len(fighter.animation_list[6]) - 1:
+                    self._tag(team)
+            elif (
+                team != self.fighters[0].team
+                and fighter.health < 30
+                and partner.health > fighter.health
+            ):
+                self._tag(team)
+
+    def _surviving_teams(self):
+        return {fighter.team for fighter in self.fighters if fighter.alive}
+
+    def _update_round(self):
+        if not self.round_over:
+            surviving = self._surviving_teams()
+            if len(surviving) <= 1:
+                if surviving:
+                    self.score[sorted(set(MODES[self.mode][0])).index(surviving.pop())] += 1
+                self.round_over = True
+                self.round_over_time = self.game_time()
+        elif self.game_time() - self.round_over_time > 2000:
+            self._reset_round()
+
+    def _reset_round(self):
+        self.round_over = False
+        self.intro_count = 3
+        teams, spawn_x = MODES[self.mode]
+        for index, fighter in enumerate(self.fighters):
+            fighter.reset(spawn_x[index], self.ground_y, spawn_x[index] > self.width // 2)
+        self.on_point = {team: teams.index(team) for team in set(teams)}
+        for controller in self.ai_controllers:
+            controller.reset()
+        self.entities.clear()
+        self._follow_camera(snap=True)
+
+    def _drawn_fighters(self):
+        return self._active_fighters()
+
+    def _all_fighters(self):
+        return self.fighters
+
+    def _create_hud(self):
+        self.hud = TeamHUD(self.width, [fighter.character_name for fighter in self.fighters],
+                           MODES[self.mode][0])
+        self.hud.update(*self._hud_values())
+
+    def _hud_values(self):
+        return [fighter.health for fighter in self.fighters], self.score
+
+
+class TeamHUD(HUD):
+    """One bar per fighter in its team colour and win markers per team."""
+
+    def __init__(self, width, labels, teams):
+        super().__init__(width, labels, label_size=16)
+        self.teams = teams
+
+    def _render(self, surface):
+        bar_width = (self.width - 40) // len(self.teams) - 10
+        for index, team in enumerate(self.teams):
+            rect = pygame.Rect(20 + index * (bar_width + 10), 20, bar_width, 20)
+            self.draw_bar(surface, index, rect, TEAM_COLORS.get(team, YELLOW))
+
+        slots = sorted(set(self.teams))
+        slot_width = (self.width - 40) // len(slots)
+        for slot, team in enumerate(slots):
+            self.draw_wins(surface, self.score[slot], 30 + slot * slot_width, 60,
+                           TEAM_COLORS.get(team, YELLOW), radius=10, spacing=30)
@@ -1,104 +1,243 @@
+from functools import partial
+
 import pygame
 from frames.menu import MenuFrame
 from frames.game import GameFrame
+from frames.team_game import MODES as TEAM_MODES, TeamGameFrame
 from frames.character_select import CharacterSelectFrame
 from frames.map_select import MapSelectFrame
 from frames.online_menu import OnlineMenuFrame
 from frames.online_character_select import OnlineCharacterSelectFrame
 from frames.online_map_select import OnlineMapSelectFrame
 from frames.online_game import OnlineGameFrame
+from frames.replay_viewer import ReplayFrame
+from frames.loading import LoadingFrame
+from frames.router import FrameRouter
 from characters.characters import CHARACTERS
-from core.config import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, WINDOW_TITLE
-
-pygame.init()
-
-clock = pygame.time.Clock()
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption(WINDOW_TITLE)
-
-# CREATE MENU FRAME
-current_frame = MenuFrame(SCREEN_WIDTH, SCREEN_HEIGHT)
-
-# GAME LOOP
-run = True
-
-while run:
-
-    clock.tick(FPS)
-
-    events = pygame.event.get()
-    for event in events:
-        if event.type == pygame.QUIT:
-            run = False
-
-    next_frame = current_frame.handle_events(events)
-
-    if next_frame:
-        if next_frame["next"] == "menu":
-            current_frame = MenuFrame(SCREEN_WIDTH, SCREEN_HEIGHT)
-
-        elif next_frame["next"] == "character_select":
-            current_frame = CharacterSelectFrame(SCREEN_WIDTH, SCREEN_HEIGHT)
-
-        elif next_frame["next"] == "game":
-            default_character = next(iter(CHARACTERS.keys()), "Balrog")
-            character = next_frame.get("character", default_character)
-            map_path = next_frame.get("map_path")
-            current_frame = GameFrame(
-                SCREEN_WIDTH,
-                SCREEN_HEIGHT,
-                player1_character=character,
-                map_path=map_path,
-            )
-
-        elif next_frame["next"] == "map_select":
-            current_frame = MapSelectFrame(
-                SCREEN_WIDTH,
-                SCREEN_HEIGHT,
-                character=next_frame["character"],
-            )
-
-        # === ONLINE MULTIPLAYER ===
-
-        elif next_frame["next"] == "online_menu":
-            current_frame = OnlineMenuFrame(SCREEN_WIDTH, SCREEN_HEIGHT)
-
-        elif next_frame["next"] == "online_character_select":
-            current_frame = OnlineCharacterSelectFrame(
-                SCREEN_WIDTH,
-                SCREEN_HEIGHT,
-                client=next_frame["client"],
-                player_id=next_frame["player_id"],
-                is_host=next_frame["is_host"]
-            )
-
-        elif next_frame["next"] == "online_game":
-            current_frame = OnlineGameFrame(
-                SCREEN_WIDTH,
-                SCREEN_HEIGHT,
-                client=next_frame["client"],
-                player_id=next_frame["player_id"],
-                player1_character=next_frame["player1_character"],
-                player2_character=next_frame["player2_character"],
-                is_host=next_frame["is_host"],
-                map_path=next_frame.get("map_path"),
-            )
-
-        elif next_frame["next"] == "online_map_select":
-            current_frame = OnlineMapSelectFrame(
-                SCREEN_WIDTH,
-                SCREEN_HEIGHT,
-                client=next_frame["client"],
-                player_id=next_frame["player_id"],
-                player1_character=next_frame["player1_character"],
-                player2_character=next_frame["player2_character"],
-                is_host=next_frame["is_host"],
-            )
-
-    current_frame.update()
-    current_frame.draw(screen)
-
-    pygame.display.update()
-
-# EXIT PYGAME
-pygame.quit()
+from core.config import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, RENDER_FPS, WINDOW_TITLE, FULLSCREEN, RENDER_BACKEND, DIRTY_RECT_RENDERING
+from core.dirty_rects import DirtyRectRenderer
+from core.display import Display
+from core.prefetch import PREFETCHER
+from core.profiler import FrameProfiler
+from core.texture_display import TextureDisplay
+
+
+# Longest stretch of real time simulated in one render frame; beyond this the
+# game slows down instead of running ever more ticks to catch up.
+MAX_CATCH_UP_MS = 250
+
+
+def _menu(request):
+    return MenuFrame(SCREEN_WIDTH, SCREEN_HEIGHT)
+
+
+def _character_select(request):
+    return CharacterSelectFrame(
+        SCREEN_WIDTH,
+        SCREEN_HEIGHT,
+        mode=request.get("mode", "versus"),
+        difficulty=request.get("difficulty", "normal"),
+    )
+
+
+def _game(request):
+    default_character = next(iter(CHARACTERS.keys()), "Balrog")
+    character = request.get("character", default_character)
+    map_path = request.get("map_path")
+    mode = request.get("mode", "versus")
+    difficulty = request.get("difficulty", "normal")
+    if mode in TEAM_MODES:
+        return TeamGameFrame(
+            SCREEN_WIDTH,
+            SCREEN_HEIGHT,
+            player1_character=character,
+            map_path=map_path,
+            mode=mode,
+            difficulty=difficulty,
+        )
+    return GameFrame(
+        SCREEN_WIDTH,
+        SCREEN_HEIGHT,
+        player1_character=character,
+        player2_character=request.get("opponent"),
+        map_path=map_path,
+        difficulty=difficulty,
+        record_replay=True,
+    )
+
+
+def _replay(request):
+    return ReplayFrame(SCREEN_WIDTH, SCREEN_HEIGHT, request["path"])
+
+
+def _map_select(request):
+    return MapSelectFrame(
+        SCREEN_WIDTH,
+        SCREEN_HEIGHT,
+        character=request["character"],
+        mode=request.get("mode", "versus"),
+        difficulty=request.get("difficulty", "normal"),
+        opponent=request.get("opponent"),
+    )
+
+
+# === ONLINE MULTIPLAYER ===
+
+def _online_menu(request):
+    return OnlineMenuFrame(SCREEN_WIDTH, SCREEN_HEIGHT)
+
+
+def _online_character_select(request):
+    return OnlineCharacterSelectFrame(
+        SCREEN_WIDTH,
+        SCREEN_HEIGHT,
+        client=request["client"],
+        player_id=request["player_id"],
+        is_host=request["is_host"]
+    )
+
+
+def _online_game(request):
+    return OnlineGameFrame(
+        SCREEN_WIDTH,
+        SCREEN_HEIGHT,
+        client=request["client"],
+        player_id=request["player_id"],
+        player1_character=request["player1_character"],
+        player2_character=request["player2_character"],
+        is_host=request["is_host"],
+        map_path=request.get("map_path"),
+    )
+
+
+def _online_map_select(request):
+    return OnlineMapSelectFrame(
+        SCREEN_WIDTH,
+        SCREEN_HEIGHT,
+        client=request["client"],
+        player_id=request["player_id"],
+        player1_character=request["player1_character"],
+        player2_character=request["player2_character"],
+        is_host=request["is_host"],
+    )
+
+
+# Frame factories by the "next" name of a handle_events result (run on the loading thread).
+ROUTES = {
+    "menu": _menu,
+    "character_select": _character_select,
+    "game": _game,
+    "replay": _replay,
+    "map_select": _map_select,
+    "online_menu": _online_menu,
+    "online_character_select": _online_character_select,
+    "online_game": _online_game,
+    "online_map_select": _online_map_select,
+}
+
+
+def main():
+    pygame.init()
+
+    clock = pygame.time.Clock()
+    if RENDER_BACKEND == "texture":
+        display = TextureDisplay(SCREEN_WIDTH, SCREEN_HEIGHT, WINDOW_TITLE, FULLSCREEN)
+        renderer = None
+    else:
+        display = Display(SCREEN_WIDTH, SCREEN_HEIGHT, WINDOW_TITLE, FULLSCREEN)
+        renderer = DirtyRectRenderer(display) if DIRTY_RECT_RENDERING else None
+    profiler = FrameProfiler()
+
+    # CREATE MENU FRAME
+    router = FrameRouter(ROUTES)
+    current_frame = router.open({"next": "menu"})
+
+    # GAME LOOP
+    run = True
+    tick_ms = 1000 / FPS
+    accumulator = 0.0
+
+    while run:
+
+        # Simulate in fixed ticks; render as often as RENDER_FPS allows.
+        accumulator = min(accumulator + clock.tick(RENDER_FPS), MAX_CATCH_UP_MS)
+        profiling = profiler.enabled
+        if profiling:
+            profiler.start()
+
+        events = pygame.event.get()
+        for event in events:
+            if event.type == pygame.QUIT:
+                run = False
+            redraw = display.handle_event(event)
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
+                display.toggle_fullscreen()
+                redraw = True
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle()
+                redraw = True
+            if redraw and renderer is not None:
+                renderer.invalidate()
+
+        next_frame = current_frame.handle_events(events)
+
+        if next_frame and next_frame["next"] != "loaded":
+            # Menus are kept for reuse; other frames are closed.
+            router.release(current_frame)
+            # The new frame asks for its own prefetches.
+            PREFETCHER.cancel()
+            # Built on a worker thread so the window keeps responding while assets load.
+            current_frame = LoadingFrame(SCREEN_WIDTH, SCREEN_HEIGHT, partial(router.open, next_frame))
+            next_frame = current_frame.handle_events([])
+
+        if next_frame:
+            current_frame = next_frame["frame"]
+            activate = getattr(current_frame, "activate", None)
+            if activate:
+                activate()
+
+            # Time spent loading the new frame is not game time.
+            clock.tick()
+            accumulator = 0.0
+
+        if profiling:
+            profiler.mark("events")
+
+        while accumulator >= tick_ms:
+            current_frame.update()
+            accumulator -= tick_ms
+        if profiling:
+            profiler.mark("update")
+
+        set_render_alpha = getattr(current_frame, "set_render_alpha", None)
+        if set_render_alpha:
+            set_render_alpha(accumulator / tick_ms)
+        canvas = display.canvas_for(current_frame)
+        dirty = None
+        if renderer is not None:
+            dirty = renderer.draw(current_frame, (profiler.rect,) if profiling else ())
+        else:
+            current_frame.draw(canvas)
+        if profiling:
+            profiler.mark("draw")
+            profiler.draw(canvas)
+        display.present(dirty)
+        if profiling:
+            profiler.mark("present")
+            profiler.end_frame(current_frame)
+
+    close = getattr(current_frame, "close", None)
+    if close:
+        close()
+    router.close()
+    if renderer is not None:
+        print(renderer.report())
+    if profiler.samples:
+        print(profiler.report())
+
+    # EXIT PYGAME
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
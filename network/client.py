@@ -207,14 +207,15 @@ class GameClient:
         self.send_message(msg)
         print(f"🎭 Selecionou personagem: {character_name}")
 
-    def send_player_input(self, keys_pressed):
+    def send_player_input(self, inputs, last_frame):
         """
         Envia input do jogador ao servidor
 
         Args:
-            keys_pressed (dict): Dicionário com teclas pressionadas
+            inputs (list): Bitmasks de input por frame (core.input)
+            last_frame (int): Frame do último bitmask da lista
         """
-        msg = create_player_input_message(keys_pressed)
+        msg = create_player_input_message(inputs, last_frame)
         self.send_message(msg)
 
     def send_player_state(self, state):
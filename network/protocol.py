@@ -107,8 +107,9 @@ def create_map_selected_message(map_id):
     return Message(MessageType.MAP_SELECTED, {"map_id": map_id})
 
 
-def create_player_input_message(keys_pressed):
-    return Message(MessageType.PLAYER_INPUT, {"keys_pressed": keys_pressed})
+def create_player_input_message(inputs, last_frame):
+    # inputs: per-frame bitmasks (core.input) ending at last_frame.
+    return Message(MessageType.PLAYER_INPUT, {"inputs": list(inputs), "frame": last_frame})
 
 
 def create_player_state_update_message(player_id, state):
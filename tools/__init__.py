@@ -0,0 +1,18 @@
+"""Headless command-line tools (run from the project root with ``python -m``)."""
+
+import os
+
+
+def init_headless(width=1, height=1):
+    """Initialise pygame without a real window or audio device."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    # Keep default SIGINT/SIGTERM handling so Ctrl+C and pool shutdown work.
+    os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+
+    import pygame
+
+    pygame.init()
+    if not pygame.display.get_surface():
+        pygame.display.set_mode((width, height))
+    return pygame
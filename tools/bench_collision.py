@@ -0,0 +1,97 @@
+"""Benchmark the sweep-and-prune broadphase against brute-force pairing.
+
+Usage: python -m tools.bench_collision [--frames N] [--max-fighters N]
+
+Fighters and projectiles are random boxes moving across a stage; every
+fighter brings four projectiles. For each population size the script prints
+the mean broadphase time per frame and the time per box, which should stay
+roughly flat if scaling is near-linear.
+"""
+
+import argparse
+import random
+import time
+
+from tools import init_headless
+
+
+def _populate(rng, fighters, width, height):
+    boxes = []
+    for i in range(fighters):
+        x = rng.uniform(0, width)
+        boxes.append([x, rng.uniform(-3, 3), height - 290, 80, 180, False, i])
+        for _ in range(4):
+            px = rng.uniform(0, width)
+            boxes.append([px, rng.uniform(-9, 9), rng.uniform(height - 300, height - 150),
+                          60, 40, True, i])
+    return boxes
+
+
+def _step(boxes, width):
+    for box in boxes:
+        box[0] += box[1]
+        if box[0] < 0 or box[0] > width:
+            box[1] = -box[1]
+
+
+def run(sizes, frames, seed=1):
+    import pygame
+
+    from fighters.collision import SweepAndPrune, brute_force_pairs
+
+    rng = random.Random(seed)
+    results = []
+    for fighters in sizes:
+        # Wider stages for more fighters keep the density constant.
+        width = 250 * fighters
+        boxes = _populate(rng, fighters, width, 600)
+        world = SweepAndPrune()
+        sweep_s = 0.0
+        brute_s = 0.0
+        pairs = 0
+
+        for _ in range(frames):
+            _step(boxes, width)
+            world.clear()
+            for x, _, y, w, h, is_hit, team in boxes:
+                rect = pygame.Rect(int(x), int(y), w, h)
+                if is_hit:
+                    world.add_hitbox(rect, team, team)
+                else:
+                    world.add_hurtbox(rect, team, team)
+
+            start = time.perf_counter()
+            pairs += sum(1 for _ in world.pairs())
+            sweep_s += time.perf_counter() - start
+
+            items = list(world.items)
+            start = time.perf_counter()
+            for _ in brute_force_pairs(items):
+                pass
+            brute_s += time.perf_counter() - start
+
+        results.append((fighters, len(boxes), sweep_s / frames, brute_s / frames, pairs / frames))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--max-fighters", type=int, default=256)
+    args = parser.parse_args()
+
+    init_headless()
+    sizes = []
+    size = 2
+    while size <= args.max_fighters:
+        sizes.append(size)
+        size *= 2
+
+    print(f"{'fighters':>8} {'boxes':>6} {'sweep ms':>9} {'us/box':>7} {'brute ms':>9} {'pairs':>7}")
+    for fighters, boxes, sweep, brute, pairs in run(sizes, args.frames):
+        print(f"{fighters:>8} {boxes:>6} {sweep * 1000:>9.3f} {sweep * 1e6 / boxes:>7.2f}"
+              f" {brute * 1000:>9.3f} {pairs:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
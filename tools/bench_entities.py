@@ -0,0 +1,63 @@
+"""Benchmark the projectile/effect pools under heavy spawning.
+
+Usage: python -m tools.bench_entities [--frames N] [--spawn-per-frame K]
+
+Reports the mean and worst per-frame cost of updating and drawing the entity
+system while K hit sparks and a projectile are spawned every frame.
+"""
+
+import argparse
+import time
+
+from tools import init_headless
+
+
+def run(frames, spawn_per_frame, character):
+    import pygame
+
+    from core.config import SCREEN_HEIGHT, SCREEN_WIDTH
+    from fighters.entities import EntitySystem, ProjectileSpec
+    from fighters.fighter import Fighter
+
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    ground_y = SCREEN_HEIGHT - 110
+    fighter1 = Fighter(1, 200, ground_y, False, character, None)
+    fighter2 = Fighter(2, 700, ground_y, True, character, None)
+    fighters = (fighter1, fighter2)
+
+    entities = EntitySystem(SCREEN_WIDTH, SCREEN_HEIGHT)
+    spec = next(iter(fighter1.projectiles.values()), None)
+    if spec is None:
+        spec = ProjectileSpec(entities.spark_frames, speed=12)
+
+    samples = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        for i in range(spawn_per_frame):
+            entities.spawn_hit_spark((frame * 37 + i * 53) % SCREEN_WIDTH, 200 + i % 200)
+        entities.spawn_projectile(fighter1, spec, 300, 300, 10)
+        entities.update(fighters)
+        entities.draw(screen)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return samples, entities
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--spawn-per-frame", type=int, default=32)
+    parser.add_argument("--character", default="Dhalsim")
+    args = parser.parse_args()
+
+    init_headless()
+    samples, entities = run(args.frames, args.spawn_per_frame, args.character)
+    samples.sort()
+    mean = sum(samples) / len(samples)
+    print(f"frames: {len(samples)}  spawn/frame: {args.spawn_per_frame}")
+    print(f"live: {entities.projectiles.count} projectiles, {entities.effects.count} effects")
+    print(f"mean {mean:.3f} ms  p99 {samples[int(len(samples) * 0.99)]:.3f} ms  max {samples[-1]:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
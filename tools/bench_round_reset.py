@@ -0,0 +1,71 @@
+"""Benchmark round transitions: rebuilding fighters vs resetting them in place.
+
+Usage: python -m tools.bench_round_reset [--rounds N] [CHARACTER ...]
+
+For each character, a mirror GameFrame times ``_reset_round`` (the real
+round transition) against ``_create_fighters`` with the in-memory sprite
+and sound caches cleared, which is what a round used to cost. The packed
+atlas disk cache still applies to the rebuild.
+
+Exits with status 1 if a round reset takes longer than one frame at the
+configured FPS.
+"""
+
+import argparse
+import sys
+import time
+
+from tools import init_headless
+
+
+def _time_call(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def run(character_names, rounds):
+    from characters.characters import CHARACTERS
+    from core.assets import SOUNDS
+    from core.config import FPS, SCREEN_HEIGHT, SCREEN_WIDTH
+    from fighters.animation_store import ANIMATIONS
+    from frames.game import GameFrame
+
+    frame_budget_ms = 1000 / FPS
+    names = character_names or list(CHARACTERS.keys())
+    results = []
+
+    for name in names:
+        frame = GameFrame(SCREEN_WIDTH, SCREEN_HEIGHT, name, name, seed=0)
+        reset_ms = _time_call(frame._reset_round, rounds)
+
+        ANIMATIONS.clear()
+        SOUNDS.clear()
+        rebuild_ms = _time_call(frame._create_fighters, 1)
+        frame.close()
+        results.append((name, rebuild_ms, reset_ms))
+
+    return results, frame_budget_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("characters", nargs="*")
+    parser.add_argument("--rounds", type=int, default=1000)
+    args = parser.parse_args()
+
+    init_headless()
+    results, budget_ms = run(args.characters, args.rounds)
+
+    print(f"frame budget: {budget_ms:.2f} ms")
+    over_budget = False
+    for name, rebuild_ms, reset_ms in results:
+        print(f"{name:<10} rebuild {rebuild_ms:9.2f} ms   reset {reset_ms * 1000:8.2f} us")
+        over_budget = over_budget or reset_ms > budget_ms
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Print frame data and frame advantage for every character's moves.
+
+Usage: python -m tools.frame_data [--json] [CHARACTER ...]
+"""
+
+import argparse
+import json
+
+from tools import init_headless
+
+
+def build_report(character_names=None):
+    from characters.characters import CHARACTERS
+    from fighters.fighter import Fighter
+    from fighters.frame_data import advantage_table
+
+    report = {}
+    for name in character_names or CHARACTERS.keys():
+        fighter = Fighter(1, 200, 490, False, name, None)
+        hitstun = len(fighter.animation_list[5])
+        advantage = advantage_table(fighter.frame_data, hitstun)
+        report[name] = {
+            move_key: dict(move.to_dict(), **advantage[move_key])
+            for move_key, move in fighter.frame_data.items()
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("characters", nargs="*")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    init_headless()
+    report = build_report(args.characters)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    for name, moves in report.items():
+        print(name)
+        for move_key, data in moves.items():
+            print(
+                f"  {move_key:<9} startup {data['startup']:>2}  active {data['active']:>2}"
+                f"  recovery {data['recovery']:>2}  dmg {data['damage']:>2}"
+                f"  hit {data['on_hit']:+4}  block {data['on_block']:+4}"
+            )
+
+
+if __name__ == "__main__":
+    main()
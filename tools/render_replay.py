@@ -0,0 +1,114 @@
+"""Render a replay to a PNG sequence without running the game in real time.
+
+Usage: python -m tools.render_replay REPLAY [--out DIR] [--workers N]
+       [--start SECONDS] [--end SECONDS] [--gif FILE]
+
+The replay is split into segments at its keyframes and each segment is
+rendered by a pool worker onto an offscreen surface, using the game's own
+drawing code. Frames are written as DIR/000000.png, 000001.png, ... in
+match order, ready for e.g. ``ffmpeg -framerate 60 -i DIR/%06d.png out.mp4``.
+--gif also stitches them into an animated GIF (needs Pillow).
+"""
+
+import argparse
+import multiprocessing
+import time
+from pathlib import Path
+
+from tools import init_headless
+
+# Set in each pool worker by _init_worker.
+_viewer = None
+_surface = None
+_out = None
+_first_frame = 0
+
+
+def _init_worker(path, out, first_frame):
+    global _viewer, _surface, _out, _first_frame
+    from core.config import SCREEN_HEIGHT, SCREEN_WIDTH
+
+    pygame = init_headless(SCREEN_WIDTH, SCREEN_HEIGHT)
+    from frames.replay_viewer import ReplayFrame
+
+    _viewer = ReplayFrame(SCREEN_WIDTH, SCREEN_HEIGHT, path)
+    _viewer.show_overlay = False
+    _surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    _out = Path(out)
+    _first_frame = first_frame
+
+
+def _render_segment(segment):
+    import pygame
+
+    first, last = segment
+    viewer = _viewer
+    viewer.seek(first)
+    for frame in range(first, last):
+        viewer.background.show_time(viewer.game_time())
+        viewer.draw(_surface)
+        pygame.image.save(_surface, str(_out / f"{frame - _first_frame:06d}.png"))
+        viewer.seek(frame + 1)
+    return last - first
+
+
+def segments(keyframes, first, last):
+    """Split ``[first, last)`` at keyframe boundaries."""
+    bounds = sorted({first, last} | {frame for frame in keyframes if first < frame < last})
+    return list(zip(bounds, bounds[1:]))
+
+
+def stitch_gif(out, count, path, fps):
+    from PIL import Image
+
+    frames = (Image.open(out / f"{index:06d}.png") for index in range(count))
+    first = next(frames)
+    first.save(path, save_all=True, append_images=frames, duration=round(1000 / fps), loop=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("replay")
+    parser.add_argument("--out", default="replay_frames")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--start", type=float, default=0.0, help="seconds into the match")
+    parser.add_argument("--end", type=float, help="seconds into the match (default: the end)")
+    parser.add_argument("--gif", metavar="FILE")
+    args = parser.parse_args()
+
+    from core.replay import KEYFRAME_INTERVAL, load_replay
+
+    replay = load_replay(args.replay)
+    fps = replay.meta.get("fps", 60)
+    first = max(0, int(args.start * fps))
+    last = replay.frames if args.end is None else min(replay.frames, int(args.end * fps))
+    if first >= last:
+        raise SystemExit("Nothing to render")
+
+    # Replays without a keyframe index get theirs rebuilt in every worker
+    # at the same interval, so split there.
+    keyframes = [frame for frame, _ in replay.keyframes] or range(0, last, KEYFRAME_INTERVAL)
+    tasks = segments(keyframes, first, last)
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    done = 0
+    with multiprocessing.Pool(args.workers, _init_worker, (args.replay, out, first)) as pool:
+        for index, count in enumerate(pool.imap_unordered(_render_segment, tasks), 1):
+            done += count
+            print(f"{index}/{len(tasks)} segments, {done} frames, "
+                  f"{time.perf_counter() - start:.0f}s", flush=True)
+        pool.close()
+        pool.join()
+
+    elapsed = time.perf_counter() - start
+    print(f"{done} frames in {elapsed:.1f}s ({done / elapsed:.0f} fps) with "
+          f"{args.workers} workers -> {out}")
+    if args.gif:
+        stitch_gif(out, done, args.gif, fps)
+        print(f"wrote {args.gif}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""Round-robin AI vs AI tournament over every character pairing.
+
+Usage: python -m tools.tournament [--matches N] [--workers N] [--difficulty D]
+       [--characters NAME ...] [--damage MOVE=N ...] [--reach NAME=X ...]
+       [--combo-bonus N] [--out FILE]
+       python -m tools.tournament --report FILE
+
+Matches run headlessly in fighters.simulation across a multiprocessing
+pool. Every result is streamed to a compact binary file as it arrives,
+and a win-rate matrix (row character's win rate against each column) is
+printed at the end. --report prints the matrix of an existing file.
+
+--reach NAME=X stretches the character's simulated hitboxes horizontally
+by X. Hits connect through those hitboxes, so this is how far the
+character really reaches; the AI still decides when it is in range from
+the character's "attack_range". To change reach in the game itself,
+override the move's "hitbox" under the character's "frame_data".
+"""
+
+import argparse
+import json
+import multiprocessing
+import struct
+import time
+
+from tools import init_headless
+
+RESULTS_MAGIC = b"SFTR"
+RESULTS_VERSION = 1
+_HEADER = struct.Struct("<4sBI")
+# (character a, character b, winner 0=a 1=b 2=draw, ticks, health a, health b)
+RECORD = struct.Struct("<BBBHBB")
+
+# Set in each pool worker by _init_worker.
+_profiles = None
+_policy = None
+
+
+def _init_worker(names, difficulty, settings):
+    global _profiles, _policy
+    init_headless()
+    from fighters.ai_policy import load_policy
+    from fighters.fighter import Fighter
+    from fighters.simulation import SimProfile
+
+    # main() has checked the table exists.
+    _policy = load_policy(difficulty)
+
+    _profiles = []
+    for name in names:
+        profile = SimProfile(Fighter(1, 200, 490, False, name, None))
+        for move_key, damage in settings["damage"].items():
+            profile.moves[move_key].damage = damage
+        if name in settings["reach"]:
+            profile.scale_reach(settings["reach"][name])
+        if settings["combo_bonus"] is not None:
+            profile.combo_bonus_damage = settings["combo_bonus"]
+        _profiles.append(profile)
+
+
+def _run_chunk(task):
+    from core.config import SCREEN_HEIGHT, SCREEN_WIDTH
+    from fighters.ai_policy import play_match
+
+    a, b, first, count, seed = task
+    records = bytearray()
+    for match in range(first, first + count):
+        # Alternate sides so neither character always starts on the left.
+        swap = match % 2 == 1
+        left, right = (b, a) if swap else (a, b)
+        winner, ticks, healths = play_match(
+            (_policy, _policy),
+            (_profiles[left], _profiles[right]),
+            SCREEN_WIDTH,
+            SCREEN_HEIGHT,
+            seed=seed * 1_000_003 + match,
+        )
+        health_a, health_b = (healths[1], healths[0]) if swap else healths
+        if winner is None:
+            result = 2
+        else:
+            result = winner ^ swap
+        records += RECORD.pack(a, b, result, min(ticks, 0xFFFF),
+                               max(0, health_a), max(0, health_b))
+    return bytes(records)
+
+
+class WinMatrix:
+    def __init__(self, names):
+        self.names = names
+        size = len(names)
+        self.wins = [[0] * size for _ in range(size)]
+        self.games = [[0] * size for _ in range(size)]
+        self.matches = 0
+        self.ticks = 0
+
+    def add_records(self, data):
+        for a, b, result, ticks, _, _ in RECORD.iter_unpack(data):
+            self.matches += 1
+            self.ticks += ticks
+            if a == b:
+                # A mirror match is always half a win for the character.
+                self.games[a][a] += 1
+                self.wins[a][a] += 0.5
+                continue
+            self.games[a][b] += 1
+            self.games[b][a] += 1
+            if result == 0:
+                self.wins[a][b] += 1
+            elif result == 1:
+                self.wins[b][a] += 1
+            else:
+                self.wins[a][b] += 0.5
+                self.wins[b][a] += 0.5
+
+    def format(self):
+        labels = [name[:8] for name in self.names]
+        lines = ["".ljust(9) + "".join(label.rjust(9) for label in labels) + "  overall"]
+        for i, label in enumerate(labels):
+            cells = []
+            for j in range(len(labels)):
+                games = self.games[i][j]
+                cells.append(f"{self.wins[i][j] / games:9.2f}" if games else "        -")
+            total = sum(self.games[i][j] for j in range(len(labels)) if j != i)
+            won = sum(self.wins[i][j] for j in range(len(labels)) if j != i)
+            overall = f"{won / total:9.2f}" if total else "        -"
+            lines.append(label.ljust(9) + "".join(cells) + overall)
+        return "\n".join(lines)
+
+
+def write_header(f, names, settings):
+    meta = json.dumps({"characters": names, "settings": settings}).encode()
+    f.write(_HEADER.pack(RESULTS_MAGIC, RESULTS_VERSION, len(meta)))
+    f.write(meta)
+
+
+def read_results(path):
+    with open(path, "rb") as f:
+        magic, version, meta_size = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != RESULTS_MAGIC or version != RESULTS_VERSION:
+            raise ValueError(f"{path} is not a version {RESULTS_VERSION} results file")
+        meta = json.loads(f.read(meta_size))
+        data = f.read()
+    usable = len(data) - len(data) % RECORD.size
+    return meta, data[:usable]
+
+
+def _parse_pairs(items, cast):
+    parsed = {}
+    for item in items:
+        key, _, value = item.rpartition("=")
+        if not key:
+            raise SystemExit(f"Expected KEY=VALUE, got '{item}'")
+        parsed[key] = cast(value)
+    return parsed
+
+
+def main():
+    from fighters.ai import DIFFICULTIES
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--matches", type=int, default=1000, help="matches per pairing")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--chunk", type=int, default=50, help="matches per pool task")
+    parser.add_argument("--difficulty", default="normal", choices=DIFFICULTIES)
+    parser.add_argument("--characters", nargs="*")
+    parser.add_argument("--damage", nargs="*", default=[], metavar="MOVE=N")
+    parser.add_argument("--reach", nargs="*", default=[], metavar="NAME=X",
+                        help="scale a character's hitboxes horizontally")
+    parser.add_argument("--combo-bonus", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="tournament_results.bin")
+    parser.add_argument("--report", metavar="FILE")
+    args = parser.parse_args()
+
+    if args.report:
+        meta, data = read_results(args.report)
+        matrix = WinMatrix(meta["characters"])
+        matrix.add_records(data)
+        print(f"{matrix.matches} matches, settings {meta['settings']}")
+        print(matrix.format())
+        return
+
+    from characters.characters import CHARACTERS
+    from fighters.ai_policy import load_policy
+    from fighters.frame_data import MOVE_DEFAULTS
+
+    if load_policy(args.difficulty) is None:
+        raise SystemExit(f"No AI policy table for difficulty '{args.difficulty}'")
+
+    names = args.characters or list(CHARACTERS.keys())
+    settings = {
+        "difficulty": args.difficulty,
+        "damage": _parse_pairs(args.damage, int),
+        "reach": _parse_pairs(args.reach, float),
+        "combo_bonus": args.combo_bonus,
+        "seed": args.seed,
+    }
+    for move_key in settings["damage"]:
+        if move_key not in MOVE_DEFAULTS:
+            raise SystemExit(f"Unknown move '{move_key}'")
+    for name in settings["reach"]:
+        if name not in CHARACTERS:
+            raise SystemExit(f"Unknown character '{name}'")
+
+    tasks = []
+    pair_index = 0
+    for a in range(len(names)):
+        for b in range(a, len(names)):
+            for first in range(0, args.matches, args.chunk):
+                count = min(args.chunk, args.matches - first)
+                tasks.append((a, b, first, count, args.seed * 10_000 + pair_index))
+            pair_index += 1
+
+    matrix = WinMatrix(names)
+    start = time.perf_counter()
+    with open(args.out, "wb") as out, multiprocessing.Pool(
+        args.workers, _init_worker, (names, args.difficulty, settings)
+    ) as pool:
+        write_header(out, names, settings)
+        for done, records in enumerate(pool.imap_unordered(_run_chunk, tasks), 1):
+            out.write(records)
+            matrix.add_records(records)
+            if done % max(1, len(tasks) // 20) == 0:
+                out.flush()
+                print(f"{done}/{len(tasks)} tasks, {matrix.matches} matches, "
+                      f"{time.perf_counter() - start:.0f}s", flush=True)
+        pool.close()
+        pool.join()
+
+    elapsed = time.perf_counter() - start
+    print(f"{matrix.matches} matches in {elapsed:.1f}s with {args.workers} workers "
+          f"-> {args.out}")
+    print(matrix.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compile and train an AI policy table for one difficulty level.
+
+Usage: python -m tools.train_policy DIFFICULTY [--from-heuristic] [--hesitation N]
+       [--rounds N] [--matches N] [--characters NAME ...] [--out PATH]
+
+Starts from the shipped table (or the heuristic AI with --from-heuristic),
+then runs rounds of self-play in the headless simulation, each one
+shifting the table toward the actions that paid off.
+"""
+
+import argparse
+import random
+import time
+
+from tools import init_headless
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("difficulty")
+    parser.add_argument("--from-heuristic", action="store_true")
+    parser.add_argument("--hesitation", type=float, default=0.0,
+                        help="share of the compiled heuristic's decisions replaced by idling")
+    parser.add_argument("--rounds", type=int, default=0)
+    parser.add_argument("--matches", type=int, default=200, help="self-play matches per round")
+    parser.add_argument("--characters", nargs="*")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out")
+    args = parser.parse_args()
+
+    init_headless()
+    from characters.characters import CHARACTERS
+    from core.assets import ai_policy_path
+    from core.config import SCREEN_HEIGHT, SCREEN_WIDTH
+    from fighters.ai import decide
+    from fighters.ai_policy import Policy, compile_policy, self_play
+    from fighters.fighter import Fighter
+    from fighters.simulation import SimProfile
+
+    out = args.out or ai_policy_path(args.difficulty)
+    if args.from_heuristic:
+        policy = compile_policy(decide, hesitation=args.hesitation, seed=args.seed)
+    else:
+        policy = Policy.load(ai_policy_path(args.difficulty))
+
+    rng = random.Random(args.seed)
+    names = args.characters or list(CHARACTERS.keys())
+    profiles = {}
+    if args.rounds:
+        for name in names:
+            profiles[name] = SimProfile(Fighter(1, 200, 490, False, name, None))
+
+    for round_index in range(args.rounds):
+        start = time.perf_counter()
+        stats = None
+        for match in range(args.matches):
+            pair = (profiles[rng.choice(names)], profiles[rng.choice(names)])
+            stats = self_play(policy, pair, SCREEN_WIDTH, SCREEN_HEIGHT, matches=1,
+                              seed=rng.random(), stats=stats)
+        policy = stats.improve(policy)
+        visited = sum(1 for counts in stats.count if any(counts))
+        print(f"round {round_index + 1}: {visited} states visited "
+              f"({time.perf_counter() - start:.1f}s)")
+
+    policy.save(out)
+    print(f"wrote {out}")
+
+
+if __name__ == "__main__":
+    main()